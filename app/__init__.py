@@ -228,11 +228,17 @@ reminder_mail_q = Queue(QueueName.REMINDER_MAIL, connection=r)
 delete_accounts_mail_q = Queue(QueueName.DELETE_ACCOUNT, connection=r)
 check_subscription_expiry_q = Queue(
     QueueName.CHECK_SUBSCRIPTION_EXPIRY, connection=r)
+ai_contract_q = Queue(QueueName.AI_CONTRACT_GENERATION, connection=r)
+client_import_q = Queue(QueueName.CLIENT_IMPORT, connection=r)
+contract_pdf_q = Queue(QueueName.CONTRACT_PDF, connection=r)
 reminder_scheduler = Scheduler(queue=reminder_mail_q, connection=r)
 delete_accounts_scheduler = Scheduler(
     queue=delete_accounts_mail_q, connection=r)
 check_subscription_expiry_scheduler = Scheduler(
     queue=check_subscription_expiry_q, connection=r)
+audit_log_maintenance_q = Queue(QueueName.AUDIT_LOG_MAINTENANCE, connection=r)
+audit_log_maintenance_scheduler = Scheduler(
+    queue=audit_log_maintenance_q, connection=r)
 
 
 def clear_scheduler():
@@ -287,11 +293,27 @@ def check_subscription_expiry(check_subscription_expiry_scheduler):
         logger.error('\n%s' % exception_error)
 
 
+def maintain_audit_log_partitions(audit_log_maintenance_scheduler):
+    """
+        Scheduler for creating upcoming monthly audit_log partitions and dropping expired ones.
+        This scheduler runs every day at 12:30 AM UTC.
+    """
+    from app.models.audit_log import AuditLog
+    try:
+        audit_log_maintenance_scheduler.cron(cron_string='30 0 * * *',
+                                             func=AuditLog.maintain_partitions, args=[],
+                                             repeat=None)
+        logger.info('SCHEDULED JOB: audit_log_maintenance_scheduler')
+    except Exception as exception_error:
+        logger.error('\n%s' % exception_error)
+
+
 clear_scheduler()
 
 send_reminder_mail_scheduler(reminder_scheduler)
 delete_accounts(delete_accounts_scheduler)
 check_subscription_expiry(check_subscription_expiry_scheduler)
+maintain_audit_log_partitions(audit_log_maintenance_scheduler)
 
 
 limiter = Limiter(app=app, key_func=None, strategy=config_data.get('STRATEGY'),  # Creating instance of Flask-Limiter for rate limiting.
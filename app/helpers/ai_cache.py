@@ -0,0 +1,101 @@
+"""
+    Content addressed cache of OpenAI chat completions used for AI contract generation.
+    Completions are keyed by sha256 of the model and the normalized prompt messages, so repeated drafts with the same
+    purpose, brief, jurisdiction and terms are served from redis instead of calling OpenAI again.
+"""
+import hashlib
+import json
+import time
+from typing import Union
+
+from app import config_data
+from app import logger
+from app import r
+
+AI_CACHE_KEY = 'ai_cache:{}'
+AI_CACHE_INDEX_KEY = 'ai_cache:index'
+AI_CACHE_HITS_KEY = 'ai_cache:hits'
+AI_CACHE_MISSES_KEY = 'ai_cache:misses'
+DEFAULT_AI_CACHE_TTL = 604800  # seconds (7 days)
+DEFAULT_AI_CACHE_MAX_ENTRIES = 10000
+
+
+def get_ai_cache_config() -> dict:
+    """Return AI_CACHE settings from config.yml. Cache is disabled while testing unless enabled explicitly."""
+    cache_config = config_data.get('AI_CACHE') or {}
+    return {
+        'ENABLED': cache_config.get('ENABLED', not config_data.get('TESTING')),
+        'TTL': int(cache_config.get('TTL', DEFAULT_AI_CACHE_TTL)),
+        'MAX_ENTRIES': int(cache_config.get('MAX_ENTRIES', DEFAULT_AI_CACHE_MAX_ENTRIES)),
+    }
+
+
+def normalize_text(text: str) -> str:
+    """
+        Collapse whitespace, so prompts differing only in formatting share a cache entry. Case is kept, as names and
+        terms of the prompt end up in the generated contract.
+    """
+    return ' '.join(text.split())
+
+
+def get_cache_hash(model: str, messages: list) -> str:
+    """Return content hash for model and prompt messages."""
+    normalized = [model] + [[message['role'], normalize_text(message['content'])] for message in messages]
+    return hashlib.sha256(json.dumps(normalized).encode('utf-8')).hexdigest()
+
+
+def get_completion(model: str, messages: list) -> Union[str, None]:
+    """Return cached completion and count hit/miss. Entry is marked as recently used on hit."""
+    cache_hash = get_cache_hash(model=model, messages=messages)
+    try:
+        completion = r.get(AI_CACHE_KEY.format(cache_hash))
+        pipeline = r.pipeline()
+        if completion is None:
+            pipeline.incr(AI_CACHE_MISSES_KEY)
+        else:
+            pipeline.incr(AI_CACHE_HITS_KEY)
+            pipeline.zadd(AI_CACHE_INDEX_KEY, {cache_hash: time.time()})
+        pipeline.execute()
+    except Exception as exception_error:
+        logger.error(f'AI cache read failed: {exception_error}')
+        return None
+    return completion.decode('utf-8') if completion is not None else None
+
+
+def set_completion(model: str, messages: list, completion: str) -> None:
+    """
+        Store completion for AI_CACHE.TTL seconds. Index sorted set (hash -> last used time) keeps the cache
+        within AI_CACHE.MAX_ENTRIES by evicting least recently used entries.
+    """
+    cache_config = get_ai_cache_config()
+    cache_hash = get_cache_hash(model=model, messages=messages)
+    now = time.time()
+    try:
+        pipeline = r.pipeline()
+        pipeline.set(AI_CACHE_KEY.format(cache_hash), completion, ex=cache_config['TTL'])
+        pipeline.zadd(AI_CACHE_INDEX_KEY, {cache_hash: now})
+        pipeline.zremrangebyscore(AI_CACHE_INDEX_KEY, '-inf', now - cache_config['TTL'])
+        pipeline.zcard(AI_CACHE_INDEX_KEY)
+        entries = pipeline.execute()[-1]
+        if entries > cache_config['MAX_ENTRIES']:
+            evicted = r.zpopmin(AI_CACHE_INDEX_KEY, entries - cache_config['MAX_ENTRIES'])
+            r.delete(*[AI_CACHE_KEY.format(member.decode('utf-8')) for member, _ in evicted])
+    except Exception as exception_error:
+        logger.error(f'AI cache write failed: {exception_error}')
+
+
+def get_ai_cache_stats() -> dict:
+    """Return hit/miss counters and number of cached completions."""
+    pipeline = r.pipeline()
+    pipeline.get(AI_CACHE_HITS_KEY)
+    pipeline.get(AI_CACHE_MISSES_KEY)
+    pipeline.zcard(AI_CACHE_INDEX_KEY)
+    hits, misses, entries = pipeline.execute()
+    hits = int(hits or 0)
+    misses = int(misses or 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+        'entries': entries,
+    }
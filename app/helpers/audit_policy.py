@@ -0,0 +1,54 @@
+"""
+    What audit logs of a model store (AuditableEvent reads `audit_policy` of the model, AuditPolicy() by default):
+        - fields: columns stored in state_before/state_after, all columns when None
+        - exclude_fields: columns never stored
+        - max_text_length: longer strings (in states, request body and args) are stored as {'sha256', 'length'}
+        - headers: request headers stored, case-insensitive, anything else (Authorization, Cookie, ...) is dropped
+"""
+from datetime import datetime
+import hashlib
+from typing import Any, Union
+
+AUDIT_DATETIME_FORMAT = '%Y/%m/%d %H:%M:%S'
+DEFAULT_AUDIT_MAX_TEXT_LENGTH = 1024
+DEFAULT_AUDIT_HEADERS = ('Content-Type', 'User-Agent', 'Origin', 'Referer', 'X-Forwarded-For')
+
+
+class AuditPolicy:
+    """Field allow/deny lists, text truncation and header allowlist of audit logs of one model."""
+
+    def __init__(self, fields: Union[tuple, None] = None, exclude_fields: tuple = (),
+                 max_text_length: int = DEFAULT_AUDIT_MAX_TEXT_LENGTH, headers: tuple = DEFAULT_AUDIT_HEADERS):
+        self.fields = fields
+        self.exclude_fields = set(exclude_fields)
+        self.max_text_length = max_text_length
+        self.headers = {header.lower() for header in headers}
+        self._column_keys = {}
+
+    def column_keys(self, mapper: Any) -> list:
+        """Audited column keys of mapper, computed once per model."""
+        if mapper not in self._column_keys:
+            self._column_keys[mapper] = [attr.key for attr in mapper.column_attrs
+                                         if (self.fields is None or attr.key in self.fields)
+                                         and attr.key not in self.exclude_fields]
+        return self._column_keys[mapper]
+
+    def compact(self, value: Any) -> Any:
+        """Json safe value: datetimes formatted, long strings replaced by hash and length, containers recursively."""
+        if isinstance(value, datetime):
+            return value.strftime(AUDIT_DATETIME_FORMAT)
+        if isinstance(value, str) and len(value) > self.max_text_length:
+            return {'sha256': hashlib.sha256(value.encode('utf-8')).hexdigest(), 'length': len(value)}
+        if isinstance(value, dict):
+            return {key: self.compact(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.compact(item) for item in value]
+        return value
+
+    def request_state(self, request_state: dict) -> dict:
+        """Request fields of AuditLog.get_request_state with headers filtered and body and args compacted."""
+        return dict(request_state,
+                    headers={key: value for key, value in request_state['headers'].items()
+                             if key.lower() in self.headers},
+                    body=self.compact(request_state['body']),
+                    args=self.compact(request_state['args']))
@@ -0,0 +1,285 @@
+"""
+    Client bulk import pipeline used by ClientImportWorker.
+    Uploaded files (xlsx, xls, csv) are read as chunks of CLIENT_IMPORT.CHUNK_SIZE rows, xlsx with openpyxl read-only
+    mode and csv with csv reader, so memory does not grow with the number of rows (xls has no streaming reader and is
+    loaded at once). Every chunk is validated column by column (type, required, email format), checked against the
+    existing legal name slugs of the account (fetched with one query) and earlier rows of the file, and valid rows are
+    inserted with one Client.bulk_insert. Rejected rows are appended to a write-only error workbook on disk chunk by
+    chunk, so they are not kept in memory either.
+"""
+import csv
+from datetime import datetime
+from itertools import islice
+import math
+import os
+import re
+from typing import Callable, Iterable, Iterator, Tuple, Union
+import uuid
+
+import numpy as np
+from openpyxl import load_workbook
+from openpyxl import Workbook
+import pandas as pd
+from slugify import slugify
+
+from app import config_data
+from app.helpers.constants import ResponseMessageKeys
+from app.helpers.constants import ValidationMessages
+from app.helpers.utility import TYPE_NAMES
+from app.models.client import Client
+from workers.s3_worker import upload_file_and_get_object_details
+
+CLIENT_IMPORT_FIELD_TYPES = {'legal_name': str, 'display_name': str, 'email': str, 'phone': int, 'street_name': str,
+                             'postal_code': int, 'city': str, 'state': str, 'country': str}
+CLIENT_IMPORT_REQUIRED_FIELDS = ['legal_name', 'display_name', 'email', 'phone', 'street_name', 'postal_code', 'city',
+                                 'state', 'country']
+EMAIL_PATTERN = r'^[^@]+@[^@]+\.[^@]+$'
+INTEGER_PATTERN = re.compile(r'[+-]?\d+')
+DEFAULT_CLIENT_IMPORT_CHUNK_SIZE = 1000
+ERROR_WORKBOOK_COLUMNS = list(CLIENT_IMPORT_FIELD_TYPES) + ['error']
+
+
+def get_client_import_config() -> dict:
+    """Return CLIENT_IMPORT settings from config.yml."""
+    import_config = config_data.get('CLIENT_IMPORT') or {}
+    return {
+        'CHUNK_SIZE': int(import_config.get('CHUNK_SIZE', DEFAULT_CLIENT_IMPORT_CHUNK_SIZE)),
+    }
+
+
+def get_type_error_message(field: str) -> str:
+    """Same message as field_type_validator for given field."""
+    type_name = TYPE_NAMES.get(CLIENT_IMPORT_FIELD_TYPES[field])
+    return f'{field.replace("_", " ").title()} should be {type_name} value.'
+
+
+def get_required_message(field: str) -> str:
+    """Same message as required_validator for given field."""
+    try:
+        return ValidationMessages[field.upper() + '_REQUIRED'].value
+    except KeyError:
+        return f'{field.replace("_", " ").title()} is required.'
+
+
+def to_integer_text(value) -> Union[str, None]:
+    """
+        Value to store for integer field (phone, postal code), None if int(value) of field_type_validator would fail.
+        Text cells are kept as typed (stripped), so leading zeros and '+' stay, numeric cells must be finite and
+        integral and are stored as str(int(value)).
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        return value if INTEGER_PATTERN.fullmatch(value) else None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number) or not number.is_integer():
+        return None
+    return str(int(value))
+
+
+def collect_errors(messages: pd.DataFrame) -> pd.Series:
+    """Turn frame of per field messages (None = valid) into {field: message} dicts of rows having any message."""
+    messages = messages[messages.notna().any(axis=1)]
+    return pd.Series([{field: message for field, message in row.items() if message is not None}
+                      for row in messages.to_dict(orient='records')], index=messages.index, dtype=object)
+
+
+def validate_client_frame(df: pd.DataFrame, existing_slugs: set) -> Tuple[list, list]:
+    """
+        Validate client rows of DataFrame. Returns (valid rows ready for insert without uuid/account, error rows with
+        'error'). Slugs of valid rows are added to existing_slugs so that later chunks of the same file see them.
+        Error rows keep the order of the file and the checks run in the same order as the single client API:
+        types, required fields, email format, existing client.
+    """
+    df = df.reindex(columns=list(CLIENT_IMPORT_FIELD_TYPES)).astype(object)
+    df = df.where(df.notna(), None)
+    errors = pd.Series(None, index=df.index, dtype=object)
+
+    type_messages = pd.DataFrame(index=df.index)
+    integer_columns = {}
+    for field, field_type in CLIENT_IMPORT_FIELD_TYPES.items():
+        column = df[field]
+        if field_type == int:
+            integer_columns[field] = column.map(to_integer_text, na_action='ignore')
+            is_invalid = column.notna() & integer_columns[field].isna()
+        else:
+            is_invalid = column.notna() & ~column.map(lambda value: isinstance(value, str))
+        type_messages[field] = np.where(is_invalid, get_type_error_message(field), None)
+    type_errors = collect_errors(type_messages)
+    errors.loc[type_errors.index] = type_errors
+
+    remaining = errors.isna()
+    required_messages = pd.DataFrame(index=df.index[remaining])
+    for field in CLIENT_IMPORT_REQUIRED_FIELDS:
+        column = df.loc[remaining, field]
+        required_messages[field] = np.where(column.isna() | column.eq(''), get_required_message(field), None)
+    required_errors = collect_errors(required_messages)
+    errors.loc[required_errors.index] = required_errors
+
+    remaining = errors.isna()
+    is_invalid_email = ~df.loc[remaining, 'email'].str.match(EMAIL_PATTERN)
+    errors.loc[is_invalid_email[is_invalid_email].index] = ResponseMessageKeys.INVALID_EMAIL_FORMAT.value
+
+    remaining = errors.isna()
+    slugs = df.loc[remaining, 'legal_name'].map(slugify)
+    is_existing = slugs.isin(existing_slugs) | slugs.duplicated(keep='first')
+    existing_index = is_existing[is_existing].index
+    errors.loc[existing_index] = df.loc[existing_index, 'legal_name'].map(
+        ResponseMessageKeys.CLIENT_ALREADY_EXISTS.value.format)
+
+    valid_index = errors.index[errors.isna()]
+    valid = df.loc[valid_index].copy()
+    valid['email'] = valid['email'].str.lower()
+    for field, integer_column in integer_columns.items():
+        valid[field] = integer_column.loc[valid_index]
+    valid['legal_name_slug'] = slugs.loc[valid_index]
+    existing_slugs.update(valid['legal_name_slug'])
+
+    error_index = errors.index[errors.notna()]
+    invalid = df.loc[error_index].copy()
+    invalid['email'] = invalid['email'].map(lambda email: email.lower() if isinstance(email, str) else email)
+    for field in integer_columns:
+        invalid[field] = invalid[field].map(lambda value: value if value is None else str(value))
+    invalid['error'] = errors.loc[error_index]
+    return valid.to_dict(orient='records'), invalid.to_dict(orient='records')
+
+
+def insert_clients(clients: list, account_uuid: str, user_uuid: str) -> None:
+    """Insert validated clients with one bulk insert per CLIENT_IMPORT.CHUNK_SIZE rows."""
+    chunk_size = get_client_import_config()['CHUNK_SIZE']
+    for start in range(0, len(clients), chunk_size):
+        Client.bulk_insert([dict(client, uuid=Client.create_uuid(), account_uuid=account_uuid, created_by=user_uuid)
+                            for client in clients[start:start + chunk_size]])
+
+
+def iter_xlsx_rows(path: str) -> Iterator[dict]:
+    """Yield rows of first sheet of xlsx file as dicts keyed by header row, in openpyxl read-only mode."""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        for row in rows:
+            if any(value is not None for value in row):
+                yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def iter_csv_rows(path: str) -> Iterator[dict]:
+    """Yield rows of csv file as dicts keyed by header row, empty cells are None."""
+    with open(path, newline='', encoding='utf-8-sig') as csv_file:
+        for row in csv.DictReader(csv_file):
+            if any(row.values()):
+                yield {field: value if value != '' else None for field, value in row.items()}
+
+
+def is_csv_file(path: str) -> bool:
+    """Check file type by extension."""
+    return os.path.splitext(path)[1].lower() == '.csv'
+
+
+def is_xls_file(path: str) -> bool:
+    """Check if file is legacy xls (not a zip based xlsx) workbook."""
+    with open(path, 'rb') as workbook:
+        return workbook.read(4) != b'PK\x03\x04'
+
+
+def read_client_chunks(path: str, chunk_size: Union[int, None] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most chunk_size (default CLIENT_IMPORT.CHUNK_SIZE) rows of csv, xlsx or xls file."""
+    chunk_size = chunk_size or get_client_import_config()['CHUNK_SIZE']
+    if is_csv_file(path):
+        rows = iter_csv_rows(path)
+    elif is_xls_file(path):
+        df = pd.read_excel(path)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+        return
+    else:
+        rows = iter_xlsx_rows(path)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield pd.DataFrame.from_records(chunk)
+
+
+def count_client_rows(path: str) -> int:
+    """Return number of data rows of the file without loading it (xlsx uses sheet dimension)."""
+    if is_csv_file(path):
+        with open(path, newline='', encoding='utf-8-sig') as csv_file:
+            return max(sum(1 for _ in csv.reader(csv_file)) - 1, 0)
+    if is_xls_file(path):
+        return len(pd.read_excel(path))
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return max((workbook.worksheets[0].max_row or 1) - 1, 0)
+    finally:
+        workbook.close()
+
+
+class ErrorWorkbookWriter:
+    """
+        Write-only xlsx of rejected rows in UPLOAD_FOLDER (columns of the import file and 'error'). openpyxl streams
+        appended rows to disk, so memory does not grow with the number of rejected rows. The workbook is created with
+        the first rejected row.
+    """
+
+    def __init__(self) -> None:
+        time_stamp = str(int(datetime.now().timestamp()))
+        self.file_name = 'error_client_data_{}_{}.xlsx'.format(time_stamp, uuid.uuid4().hex[:8])
+        self.local_path = os.path.join(config_data['UPLOAD_FOLDER'], self.file_name)  # type: ignore  # noqa: FKA100
+        self.workbook = None
+        self.sheet = None
+        self.rows_written = 0
+
+    def write_rows(self, error_data_list: list) -> None:
+        """Append error rows of a chunk. Error dicts are written as text, as DataFrame.to_excel did."""
+        if not error_data_list:
+            return
+        if self.workbook is None:
+            self.workbook = Workbook(write_only=True)
+            self.sheet = self.workbook.create_sheet()
+            self.sheet.append(ERROR_WORKBOOK_COLUMNS)
+        for row in error_data_list:
+            self.sheet.append([str(value) if isinstance(value, (dict, list)) else value
+                               for value in (row.get(column) for column in ERROR_WORKBOOK_COLUMNS)])
+        self.rows_written += len(error_data_list)
+
+    def save(self) -> Union[str, None]:
+        """Save workbook and return its local path, None if no row was rejected."""
+        if self.workbook is None:
+            return None
+        self.workbook.save(self.local_path)
+        self.workbook = None
+        return self.local_path
+
+    def upload(self, account_uuid: str, user_uuid: str) -> Union[str, None]:
+        """Save workbook, upload it to S3 and return S3 path, None if no row was rejected."""
+        if self.save() is None:
+            return None
+        s3_folder_path = f'media/{account_uuid}/{user_uuid}/'.lower()
+        return upload_file_and_get_object_details(file_path=self.local_path, file_name=self.file_name,
+                                                  s3_folder_path=s3_folder_path)
+
+
+def import_clients(chunks: Iterable[pd.DataFrame], account_uuid: str, user_uuid: str,
+                   on_progress: Union[Callable, None] = None,
+                   error_writer: Union[ErrorWorkbookWriter, None] = None) -> int:
+    """
+        Validate and insert clients chunk by chunk for account, returns number of rejected rows. Rejected rows of every
+        chunk are passed to error_writer (dropped without one).
+        on_progress(rows_processed, rows_failed) is called after every chunk with the counts of that chunk.
+    """
+    existing_slugs = Client.get_legal_name_slugs(account_uuid=account_uuid)
+    rows_failed = 0
+    for chunk in chunks:
+        clients, chunk_errors = validate_client_frame(df=chunk, existing_slugs=existing_slugs)
+        insert_clients(clients=clients, account_uuid=account_uuid, user_uuid=user_uuid)
+        if error_writer is not None:
+            error_writer.write_rows(chunk_errors)
+        rows_failed += len(chunk_errors)
+        if on_progress is not None:
+            on_progress(len(chunk), len(chunk_errors))
+    return rows_failed
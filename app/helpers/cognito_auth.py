@@ -0,0 +1,129 @@
+"""Cognito access token verification with a local, bounded cache in front of COGNITO_CLIENT.get_user."""
+import hashlib
+import threading
+import time
+from typing import Any, Union
+
+from app import COGNITO_CLIENT
+from app import config_data
+from app import logger
+from cachetools import TTLCache
+import jwt
+
+DEFAULT_TOKEN_CACHE_MAX_SIZE = 4096
+DEFAULT_TOKEN_CACHE_TTL = 300  # seconds
+DEFAULT_JWKS_LIFESPAN = 3600  # seconds
+DEFAULT_JWKS_FAILURE_TTL = 30  # seconds
+
+
+def get_token_cache_config() -> dict:
+    """Return token cache settings from config.yml (COGNITO_TOKEN_CACHE) with defaults applied."""
+    cache_config = config_data.get('COGNITO_TOKEN_CACHE') or {}
+    return {
+        'ENABLED': cache_config.get('ENABLED', True),
+        'MAX_SIZE': int(cache_config.get('MAX_SIZE', DEFAULT_TOKEN_CACHE_MAX_SIZE)),
+        'TTL': int(cache_config.get('TTL', DEFAULT_TOKEN_CACHE_TTL)),
+        'JWKS_LIFESPAN': int(cache_config.get('JWKS_LIFESPAN', DEFAULT_JWKS_LIFESPAN)),
+        'JWKS_FAILURE_TTL': int(cache_config.get('JWKS_FAILURE_TTL', DEFAULT_JWKS_FAILURE_TTL)),
+    }
+
+
+_cache_config = get_token_cache_config()
+_token_cache = TTLCache(maxsize=_cache_config['MAX_SIZE'], ttl=_cache_config['TTL'])
+_token_cache_lock = threading.Lock()
+jwks_client = None
+jwks_unavailable_until = 0.0  # time.monotonic() until which a failed JWKS fetch is not retried
+
+
+def get_issuer() -> str:
+    """Return Cognito user pool issuer url, used to validate `iss` claim and locate the JWKS."""
+    return 'https://cognito-idp.{}.amazonaws.com/{}'.format(config_data.get('COGNITO_REGION'),
+                                                            config_data.get('COGNITO_USER_POOL_ID'))
+
+
+def get_jwks_client() -> Any:
+    """Return process wide JWKS client. Signing keys are fetched once and kept for JWKS_LIFESPAN seconds."""
+    global jwks_client
+    if jwks_client is None:
+        jwks_client = jwt.PyJWKClient(get_issuer() + '/.well-known/jwks.json', cache_keys=True,
+                                      lifespan=_cache_config['JWKS_LIFESPAN'])
+    return jwks_client
+
+
+def hash_token(access_token: str) -> str:
+    """Cache key for an access token, raw tokens are never kept in memory longer than the request."""
+    return hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+
+
+def verify_access_token(access_token: str) -> Union[dict, None]:
+    """
+        Validate Cognito access token locally (signature against cached JWKS, expiry, issuer, token_use and client_id).
+        Returns the token claims if valid else None. A failed JWKS fetch is not retried for JWKS_FAILURE_TTL seconds,
+        tokens are not verified locally meanwhile.
+    """
+    global jwks_unavailable_until
+    if time.monotonic() < jwks_unavailable_until:
+        return None
+    try:
+        signing_key = get_jwks_client().get_signing_key_from_jwt(access_token)
+        claims = jwt.decode(jwt=access_token, key=signing_key.key, algorithms=['RS256'], issuer=get_issuer(),
+                            options={'require': ['exp', 'iss', 'client_id', 'token_use']})
+    except jwt.PyJWKClientConnectionError as exception_error:
+        logger.error(f'JWKS fetch failed, not retried for {_cache_config["JWKS_FAILURE_TTL"]} seconds: '
+                     f'{exception_error}')
+        jwks_unavailable_until = time.monotonic() + _cache_config['JWKS_FAILURE_TTL']
+        return None
+    except Exception as exception_error:
+        logger.info(f'Local access token verification failed: {exception_error}')
+        return None
+
+    if claims.get('token_use') != 'access' or claims.get('client_id') != config_data.get('COGNITO_APP_CLIENT_ID'):
+        return None
+    return claims
+
+
+def get_email_from_cognito(access_token: str) -> str:
+    """Resolve user email with a network round trip to Cognito (raises if token is invalid or revoked)."""
+    user_info = COGNITO_CLIENT.get_user(AccessToken=access_token)
+    return [data.get('Value') for data in user_info.get(
+        'UserAttributes') if data.get('Name') == 'email'][0]
+
+
+def get_email_by_access_token(access_token: str) -> str:
+    """
+        Return email of the user who owns given access token.
+        1. If cache is disabled, always calls COGNITO_CLIENT.get_user (previous behaviour).
+        2. Verifies token locally; verified tokens found in cache are resolved without calling Cognito.
+        3. On cache miss or failed local verification falls back to COGNITO_CLIENT.get_user, and caches the
+           result only when the token was verified locally so that cache entries never outlive token expiry.
+        NOTE: Tokens revoked in Cognito (global sign out, disabled user) stay valid until cache TTL expires.
+    """
+    if not _cache_config['ENABLED']:
+        return get_email_from_cognito(access_token)
+
+    claims = verify_access_token(access_token)
+    token_hash = hash_token(access_token)
+    if claims is not None:
+        with _token_cache_lock:
+            cached = _token_cache.get(token_hash)
+        if cached is not None:
+            return cached
+
+    user_email = get_email_from_cognito(access_token)
+
+    if claims is not None and claims.get('exp') > time.time():
+        with _token_cache_lock:
+            _token_cache[token_hash] = user_email
+    return user_email
+
+
+def evict_access_token(access_token: str) -> None:
+    """Remove access token from the cache e.g. when Cognito user is deleted or email is changed."""
+    with _token_cache_lock:
+        _token_cache.pop(hash_token(access_token), None)
+
+
+def clear_token_cache() -> None:
+    """Remove all cached access tokens."""
+    with _token_cache_lock:
+        _token_cache.clear()
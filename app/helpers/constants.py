@@ -101,6 +101,10 @@ class ResponseMessageKeys(enum.Enum):
     CLIENT_DATA_UPDATED_SUCCESSFULLY = 'Client data updated successfully.'
     CLIENT_NOT_FOUND = 'Client not found.'
     CLIENT_ALREADY_EXISTS = 'Client {0} already exists.'
+    CLIENT_IMPORT_STARTED = 'Client import started.'
+    CLIENT_IMPORT_JOB_NOT_FOUND = 'Client import job not found.'
+    INVALID_CURSOR = 'Invalid cursor.'
+    INVALID_COUNT_STRATEGY = 'Count should be one of exact, cached or estimated.'
     SIGNEES_CREATED_SUCCESSFULLY = 'Signees created successfully.'
     SIGNEE_NOT_FOUND = 'Signee not found.'
     SIGNEE_DATA_UPDATED_SUCCESSFULLY = 'Signee(s) data updated successfully.'
@@ -144,6 +148,11 @@ class ResponseMessageKeys(enum.Enum):
     EMAIL_TEMPLATE_NOT_FOUND = 'Email template not found.'
     USER_INVITE_DELETED_SUCCESSFULLY = 'User Invite deleted successfully.'
     DOWNLOAD_AS_PDF_SUCCESSFUL = 'Download as pdf successful.'
+    CONTRACT_PDF_GENERATION_STARTED = 'Contract pdf generation started.'
+    CONTRACT_PDF_JOB_NOT_FOUND = 'Contract pdf generation job not found.'
+    AI_GENERATION_STARTED = 'AI contract generation started.'
+    AI_GENERATION_JOB_NOT_FOUND = 'AI contract generation job not found.'
+    AI_GENERATION_LIMIT_REACHED = 'AI contract generation is already in progress, please try again once it is completed.'
 
 
 class DataLevel(EnumBase):
@@ -189,6 +198,10 @@ class QueueName:
     REMINDER_MAIL = 'REMINDER_MAIL'
     DELETE_ACCOUNT = 'DELETE_ACCOUNT'
     CHECK_SUBSCRIPTION_EXPIRY = 'CHECK_SUBSCRIPTION_EXPIRY'
+    AI_CONTRACT_GENERATION = 'AI_CONTRACT_GENERATION'
+    CLIENT_IMPORT = 'CLIENT_IMPORT'
+    AUDIT_LOG_MAINTENANCE = 'AUDIT_LOG_MAINTENANCE'
+    CONTRACT_PDF = 'CONTRACT_PDF'
 
 
 class SortingOrder(EnumBase):
@@ -197,6 +210,13 @@ class SortingOrder(EnumBase):
     DESC = 'desc'
 
 
+class CountStrategy(EnumBase):
+    """How total_items of paginated lists is computed (count query param)."""
+    EXACT = 'exact'
+    CACHED = 'cached'
+    ESTIMATED = 'estimated'
+
+
 class SortingParams(EnumBase):
     """Enum for storing transactions."""
     AMOUNT = 'AMOUNT'
@@ -256,6 +276,11 @@ SupportedExcelTypes = {  # Contains all the supported Excel types.
     'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 }
 
+SupportedCsvTypes = {  # Contains content types detected for .csv files.
+    'csv': 'text/csv',
+    'txt': 'text/plain'
+}
+
 
 class SubscriptionDays(enum.Enum):
 
@@ -332,6 +357,30 @@ class ContractStatus(enum.Enum):
     CANCELLED = 'cancelled'
 
 
+class AIGenerationStatus(enum.Enum):
+    """Enum for storing status of AI contract generation job"""
+    QUEUED = 'queued'
+    IN_PROGRESS = 'in_progress'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+class ClientImportStatus(enum.Enum):
+    """Enum for storing status of client bulk import job"""
+    QUEUED = 'queued'
+    IN_PROGRESS = 'in_progress'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+class ContractPdfStatus(enum.Enum):
+    """Enum for storing status of contract pdf generation job"""
+    QUEUED = 'queued'
+    IN_PROGRESS = 'in_progress'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
 class ContractMailStatus(enum.Enum):
     """Enum for listing status of mail to signee for contract"""
     NOT_SENT = 'not_sent'
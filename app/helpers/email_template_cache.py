@@ -0,0 +1,159 @@
+"""
+    Read through cache of EmailTemplate lookups by (account_uuid, email_type) and pre-compiled email bodies.
+        - local: in process LRU, entries live LOCAL_TTL seconds so edits made through another process show up soon
+        - redis: json of template columns shared by web and worker processes, deleted when the template is updated
+        - db: EmailTemplate.get_email_template_by_email_type fills both layers on a miss
+    Email bodies are split into literal text and field names once, so rendering a body for every recipient
+    joins strings instead of parsing the whole HTML body with str.format again.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+import json
+from string import Formatter
+import threading
+import time
+from typing import Union
+
+from app import config_data
+from app import logger
+from app import r
+
+EMAIL_TEMPLATE_CACHE_KEY = 'email_template:{}:{}'
+EMAIL_TEMPLATE_CACHE_HITS_KEY = 'email_template_cache:hits'
+EMAIL_TEMPLATE_CACHE_MISSES_KEY = 'email_template_cache:misses'
+DEFAULT_EMAIL_TEMPLATE_CACHE_TTL = 86400  # seconds (1 day)
+DEFAULT_EMAIL_TEMPLATE_CACHE_LOCAL_TTL = 30  # seconds
+DEFAULT_EMAIL_TEMPLATE_CACHE_LOCAL_MAX_ENTRIES = 1024
+COMPILED_EMAIL_BODIES = 256
+
+local_templates = OrderedDict()  # key -> (expires_at, fields)
+local_stats = {'hits': 0}
+local_lock = threading.Lock()
+
+
+def get_email_template_cache_config() -> dict:
+    """Return EMAIL_TEMPLATE_CACHE settings from config.yml. Cache is disabled while testing unless enabled explicitly."""
+    cache_config = config_data.get('EMAIL_TEMPLATE_CACHE') or {}
+    return {
+        'ENABLED': cache_config.get('ENABLED', not config_data.get('TESTING')),
+        'TTL': int(cache_config.get('TTL', DEFAULT_EMAIL_TEMPLATE_CACHE_TTL)),
+        'LOCAL_TTL': int(cache_config.get('LOCAL_TTL', DEFAULT_EMAIL_TEMPLATE_CACHE_LOCAL_TTL)),
+        'LOCAL_MAX_ENTRIES': int(cache_config.get('LOCAL_MAX_ENTRIES', DEFAULT_EMAIL_TEMPLATE_CACHE_LOCAL_MAX_ENTRIES)),
+    }
+
+
+def get_local_template(key: str) -> Union[dict, None]:
+    """Return fields cached in this process and mark them as recently used. Expired entries are dropped."""
+    with local_lock:
+        entry = local_templates.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del local_templates[key]
+            return None
+        local_templates.move_to_end(key)
+        local_stats['hits'] += 1
+        return entry[1]
+
+
+def set_local_template(key: str, fields: dict, cache_config: dict) -> None:
+    """Cache fields in this process, evicting least recently used entries above LOCAL_MAX_ENTRIES."""
+    with local_lock:
+        local_templates[key] = (time.monotonic() + cache_config['LOCAL_TTL'], fields)
+        local_templates.move_to_end(key)
+        while len(local_templates) > cache_config['LOCAL_MAX_ENTRIES']:
+            local_templates.popitem(last=False)
+
+
+def get_email_template_fields(account_uuid: str, email_type: str) -> Union[dict, None]:
+    """Return cached template columns from the local or redis layer and count hit/miss, None on a miss."""
+    cache_config = get_email_template_cache_config()
+    if not cache_config['ENABLED']:
+        return None
+    key = EMAIL_TEMPLATE_CACHE_KEY.format(account_uuid, email_type)
+    fields = get_local_template(key)
+    if fields is not None:
+        return fields
+
+    try:
+        cached = r.get(key)
+        r.incr(EMAIL_TEMPLATE_CACHE_MISSES_KEY if cached is None else EMAIL_TEMPLATE_CACHE_HITS_KEY)
+    except Exception as exception_error:
+        logger.error(f'Email template cache read failed: {exception_error}')
+        return None
+    if cached is None:
+        return None
+    fields = json.loads(cached)
+    set_local_template(key=key, fields=fields, cache_config=cache_config)
+    return fields
+
+
+def set_email_template_fields(account_uuid: str, email_type: str, fields: dict) -> None:
+    """Store template columns in both layers for EMAIL_TEMPLATE_CACHE.TTL seconds."""
+    cache_config = get_email_template_cache_config()
+    if not cache_config['ENABLED']:
+        return
+    key = EMAIL_TEMPLATE_CACHE_KEY.format(account_uuid, email_type)
+    set_local_template(key=key, fields=fields, cache_config=cache_config)
+    try:
+        r.set(key, json.dumps(fields), ex=cache_config['TTL'])
+    except Exception as exception_error:
+        logger.error(f'Email template cache write failed: {exception_error}')
+
+
+def invalidate_email_template(account_uuid: str, email_type: str) -> None:
+    """
+        Drop cached template after it is updated. Other processes keep their local copy for at most
+        EMAIL_TEMPLATE_CACHE.LOCAL_TTL seconds.
+    """
+    key = EMAIL_TEMPLATE_CACHE_KEY.format(account_uuid, email_type)
+    with local_lock:
+        local_templates.pop(key, None)
+    try:
+        r.delete(key)
+    except Exception as exception_error:
+        logger.error(f'Email template cache invalidation failed: {exception_error}')
+
+
+def get_email_template_cache_stats() -> dict:
+    """Return hit/miss counters. local_hits are hits of this process, redis hits and misses are shared."""
+    pipeline = r.pipeline()
+    pipeline.get(EMAIL_TEMPLATE_CACHE_HITS_KEY)
+    pipeline.get(EMAIL_TEMPLATE_CACHE_MISSES_KEY)
+    redis_hits, misses = pipeline.execute()
+    redis_hits = int(redis_hits or 0)
+    misses = int(misses or 0)
+    with local_lock:
+        local_hits = local_stats['hits']
+        local_entries = len(local_templates)
+    lookups = local_hits + redis_hits + misses
+    return {
+        'local_hits': local_hits,
+        'redis_hits': redis_hits,
+        'misses': misses,
+        'hit_ratio': round((local_hits + redis_hits) / lookups, 4) if lookups else None,
+        'local_entries': local_entries,
+    }
+
+
+@lru_cache(maxsize=COMPILED_EMAIL_BODIES)
+def compile_email_body(email_body: str) -> Union[tuple, None]:
+    """
+        Split email body into (literal text, field name) parts. None for bodies using format specs, conversions,
+        positional or attribute/index fields, which are rendered with str.format.
+    """
+    parts = []
+    for literal_text, field_name, format_spec, conversion in Formatter().parse(email_body):
+        if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+            return None
+        parts.append((literal_text, field_name))
+    return tuple(parts)
+
+
+def render_email_body(email_body: str, **fields) -> str:
+    """Same result as email_body.format(**fields), KeyError for a missing field, with the body parsed only once."""
+    parts = compile_email_body(email_body)
+    if parts is None:
+        return email_body.format(**fields)
+    return ''.join([literal_text if field_name is None else literal_text + str(fields[field_name])
+                    for literal_text, field_name in parts])
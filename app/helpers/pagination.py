@@ -0,0 +1,237 @@
+"""
+    Pagination shared by list queries.
+    Offset mode (page, size) runs query.count() and skips (page - 1) * size rows, so deep pages get slower with the
+    number of skipped rows. Cursor mode (cursor query param, empty for the first page) seeks past the last row of the
+    previous page on (created_at, id) and does not count, so every page costs the same. Both modes return next_cursor.
+    Offset mode counts with the strategy of count query param (CountStrategy):
+        - exact: query.count()
+        - cached: count kept in redis hash count:<table>:<account_uuid> keyed by hash of the filtered query for
+          PAGINATION_COUNT.CACHE_TTL seconds, the hash is dropped when Base.add or Base.bulk_insert adds a row for the
+          account and when a delete of its rows is committed
+        - estimated: planner row estimate (EXPLAIN) when it is at least PAGINATION_COUNT.ESTIMATE_MIN_ROWS, exact count
+          below that because estimates of small results are too rough
+"""
+import base64
+from datetime import datetime
+import hashlib
+import json
+import time
+from typing import Any, Union
+
+from app import config_data
+from app import db
+from app import logger
+from app import r
+from app.helpers.constants import CountStrategy
+from app.helpers.constants import SortingOrder
+from sqlalchemy import asc
+from sqlalchemy import desc
+from sqlalchemy import event
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+COUNT_CACHE_KEY = 'count:{}:{}'
+PENDING_COUNT_INVALIDATION_KEY = 'count_invalidation_targets'
+DEFAULT_COUNT_CACHE_TTL = 30  # seconds
+DEFAULT_COUNT_ESTIMATE_MIN_ROWS = 10000
+CURSOR_CREATED_AT_KEY = 'cursor_created_at'
+CURSOR_ID_KEY = 'cursor_id'
+
+
+class InvalidCursorError(ValueError):
+    """Cursor query param could not be decoded."""
+
+
+class InvalidCountStrategyError(ValueError):
+    """Count query param is not a CountStrategy value."""
+
+
+def get_pagination_count_config() -> dict:
+    """Return PAGINATION_COUNT settings from config.yml."""
+    count_config = config_data.get('PAGINATION_COUNT') or {}
+    return {
+        'CACHE_TTL': int(count_config.get('CACHE_TTL', DEFAULT_COUNT_CACHE_TTL)),
+        'ESTIMATE_MIN_ROWS': int(count_config.get('ESTIMATE_MIN_ROWS', DEFAULT_COUNT_ESTIMATE_MIN_ROWS)),
+    }
+
+
+def get_count_strategy(count: Union[str, None]) -> str:
+    """Validate count query param, exact when missing."""
+    if not count:
+        return CountStrategy.EXACT.value
+    if CountStrategy.get_name(count) is None:
+        raise InvalidCountStrategyError(count)
+    return count
+
+
+def compile_query(query: Any) -> Any:
+    """Compile SQL statement of query for the database dialect."""
+    return query.statement.compile(dialect=db.engine.dialect)
+
+
+def count_cache_key(table: str, scope: Union[str, None]) -> str:
+    """Redis hash holding cached counts of table for account (scope), '' for lists across accounts."""
+    return COUNT_CACHE_KEY.format(table, scope or '')
+
+
+def get_cached_count(query: Any, table: str, scope: Union[str, None]) -> int:
+    """Return cached count of query, count and cache it when missing or older than PAGINATION_COUNT.CACHE_TTL."""
+    ttl = get_pagination_count_config()['CACHE_TTL']
+    compiled = compile_query(query)
+    field = hashlib.sha1((str(compiled) + json.dumps(compiled.params, default=str, sort_keys=True)).encode(
+        'utf-8')).hexdigest()
+    key = count_cache_key(table=table, scope=scope)
+    try:
+        cached = r.hget(key, field)
+        if cached is not None:
+            cached = json.loads(cached)
+            if time.time() - cached['at'] < ttl:
+                return cached['count']
+    except Exception as exception_error:
+        logger.error(f'Count cache read failed: {exception_error}')
+
+    count = query.count()
+    try:
+        pipeline = r.pipeline()
+        pipeline.hset(key, field, json.dumps({'count': count, 'at': time.time()}))
+        pipeline.expire(key, ttl)
+        pipeline.execute()
+    except Exception as exception_error:
+        logger.error(f'Count cache write failed: {exception_error}')
+    return count
+
+
+def get_estimated_count(query: Any) -> int:
+    """Rows the planner expects query to return (EXPLAIN, query is not executed)."""
+    compiled = compile_query(query)
+    plan = db.session.connection().exec_driver_sql('EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(query: Any, count_strategy: Union[str, None], table: str, scope: Union[str, None] = None) -> tuple:
+    """Return (total rows of query, strategy used), see module docstring."""
+    count_strategy = get_count_strategy(count_strategy)
+    if count_strategy == CountStrategy.CACHED.value:
+        return get_cached_count(query=query, table=table, scope=scope), count_strategy
+    if count_strategy == CountStrategy.ESTIMATED.value:
+        estimate = get_estimated_count(query)
+        if estimate >= get_pagination_count_config()['ESTIMATE_MIN_ROWS']:
+            return estimate, count_strategy
+    return query.count(), CountStrategy.EXACT.value
+
+
+def invalidate_counts(table: str, account_uuids: set) -> None:
+    """Drop cached counts of table for given accounts and for lists across accounts."""
+    try:
+        r.delete(count_cache_key(table=table, scope=None),
+                 *[count_cache_key(table=table, scope=account_uuid) for account_uuid in account_uuids if account_uuid])
+    except Exception as exception_error:
+        logger.error(f'Count cache invalidation failed: {exception_error}')
+
+
+def invalidate_counts_after_commit(table: str, account_uuids: set, session: Any = None) -> None:
+    """invalidate_counts when the transaction of session (db.session) commits, for deletes committed by the caller."""
+    session = session if session is not None else db.session
+    session.info.setdefault(PENDING_COUNT_INVALIDATION_KEY, {}).setdefault(table, set()).update(account_uuids)
+
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_committed_counts(session):
+    """Drop cached counts collected by invalidate_counts_after_commit."""
+    for table, account_uuids in session.info.pop(PENDING_COUNT_INVALIDATION_KEY, {}).items():
+        invalidate_counts(table=table, account_uuids=account_uuids)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def discard_pending_count_invalidations(session, previous_transaction):
+    """Rolled back deletes keep cached counts valid."""
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(PENDING_COUNT_INVALIDATION_KEY, None)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Return opaque cursor pointing after row with given created_at and id."""
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{row_id}'.encode('utf-8')).decode('utf-8')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Return (created_at, id) of cursor, raises InvalidCursorError."""
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def cursor_columns(created_at_column: Any, id_column: Any) -> tuple:
+    """(created_at, id) labelled for column queries, so that the cursor key is not part of the serialized row."""
+    return created_at_column.label(CURSOR_CREATED_AT_KEY), id_column.label(CURSOR_ID_KEY)
+
+
+def row_to_dict(row: Any) -> dict:
+    """_asdict() of a column query row without the columns of cursor_columns."""
+    data = row._asdict()
+    data.pop(CURSOR_CREATED_AT_KEY, None)
+    data.pop(CURSOR_ID_KEY, None)
+    return data
+
+
+def get_next_cursor(rows: list, created_at_key: str = 'created_at', id_key: str = 'id') -> Union[str, None]:
+    """
+        Cursor after last row of page, rows are objects or named rows having created_at and id, or the columns of
+        cursor_columns.
+    """
+    if not rows:
+        return None
+    if hasattr(rows[-1], CURSOR_ID_KEY):
+        created_at_key, id_key = CURSOR_CREATED_AT_KEY, CURSOR_ID_KEY
+    return encode_cursor(getattr(rows[-1], created_at_key), getattr(rows[-1], id_key))
+
+
+def order_by_key(query: Any, created_at_column: Any, id_column: Any, sort: Any = None) -> Any:
+    """Order query by (created_at, id), descending unless sort is asc."""
+    direction = asc if sort == SortingOrder.ASC.value else desc
+    return query.order_by(direction(created_at_column), direction(id_column))
+
+
+def seek(query: Any, created_at_column: Any, id_column: Any, cursor: str, sort: Any = None) -> Any:
+    """Filter query to rows after cursor in (created_at, id) order of sort. Empty cursor is the first page."""
+    if not cursor:
+        return query
+    key = tuple_(created_at_column, id_column)
+    if sort == SortingOrder.ASC.value:
+        return query.filter(key > tuple_(*decode_cursor(cursor)))
+    return query.filter(key < tuple_(*decode_cursor(cursor)))
+
+
+def paginate(query: Any, created_at_column: Any, id_column: Any, sort: Any = None, page: Any = None, size: Any = None,
+             cursor: Union[str, None] = None, count_strategy: Union[str, None] = None,
+             count_scope: Union[str, None] = None) -> tuple:
+    """
+        Order query by (created_at, id) and return (rows, total_items, next_cursor, count strategy used).
+        cursor None keeps offset mode (count + page/size, all rows if page or size is missing). Otherwise cursor mode
+        returns size rows after cursor, total_items and count strategy are None; next_cursor is None on the last page in
+        both modes. count_scope is the account_uuid the query is filtered on, used by cached counts.
+        Column queries must select cursor_columns(created_at_column, id_column) and serialize rows with row_to_dict.
+    """
+    ordered_query = order_by_key(query=query, created_at_column=created_at_column, id_column=id_column, sort=sort)
+    if cursor is not None and size:
+        rows = seek(query=ordered_query, created_at_column=created_at_column, id_column=id_column, cursor=cursor,
+                    sort=sort).limit(int(size) + 1).all()
+        has_next_page = len(rows) > int(size)
+        rows = rows[:int(size)]
+        return rows, None, get_next_cursor(rows) if has_next_page else None, None
+
+    query_count, count_strategy = count_rows(query=query, count_strategy=count_strategy,
+                                             table=created_at_column.class_.__tablename__, scope=count_scope)
+    if not (page and size):
+        return ordered_query.all(), query_count, None, count_strategy
+
+    offset = (int(page) - 1) * int(size)
+    rows = ordered_query.limit(int(size)).offset(offset).all()
+    has_next_page = len(rows) == int(size) if count_strategy == CountStrategy.ESTIMATED.value else \
+        offset + len(rows) < query_count
+    return rows, query_count, get_next_cursor(rows) if has_next_page else None, count_strategy
@@ -0,0 +1,201 @@
+"""
+    Principal snapshot (user, account, active subscription and flags) used by `before_blueprint`.
+    Snapshot is loaded with one joined query and cached in redis for a short time, keyed by user email.
+    Snapshots are dropped after the change is committed: dropped before, a concurrent request could cache the old row
+    again until the TTL expires.
+"""
+from datetime import datetime
+import json
+from typing import Any, Union
+
+from app import config_data
+from app import db
+from app import logger
+from app import r
+from sqlalchemy import event
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm import Session
+
+PRINCIPAL_KEY = 'principal:{}'
+PRINCIPAL_ACCOUNT_KEY = 'principal:account:{}'
+DEFAULT_PRINCIPAL_CACHE_TTL = 60  # seconds
+PENDING_INVALIDATION_KEY = 'principal_invalidation_targets'
+
+
+def get_principal_cache_config() -> dict:
+    """Return PRINCIPAL_CACHE settings from config.yml. Cache is disabled while testing unless enabled explicitly."""
+    cache_config = config_data.get('PRINCIPAL_CACHE') or {}
+    return {
+        'ENABLED': cache_config.get('ENABLED', not config_data.get('TESTING')),
+        'TTL': int(cache_config.get('TTL', DEFAULT_PRINCIPAL_CACHE_TTL)),
+    }
+
+
+def serialize_columns(obj: Any) -> dict:
+    """Return json safe dict of all column values of given model object."""
+    data = {}
+    for column in obj.__table__.columns:
+        value = getattr(obj, column.key)
+        data[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def deserialize_columns(model: Any, data: dict) -> dict:
+    """Convert dict created by serialize_columns back to column values of given model."""
+    values = {}
+    for column in model.__table__.columns:
+        value = data.get(column.key)
+        if value is not None and isinstance(column.type, db.DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.key] = value
+    return values
+
+
+def load_principal_snapshot(email: str) -> Union[dict, None]:
+    """Build principal snapshot from database with a single joined query."""
+    from app.models.user import User
+
+    row = User.get_principal_by_email(email)
+    if row is None:
+        return None
+    user, legal_name, display_name, subscription_uuid = row
+    return {
+        'user': serialize_columns(user),
+        'account': {'uuid': user.account_uuid, 'legal_name': legal_name, 'display_name': display_name},
+        'subscription_uuid': subscription_uuid,
+    }
+
+
+def attach_user(snapshot: dict) -> Any:
+    """Return persistent User object for snapshot without querying database (session.merge with load=False)."""
+    from app.models.user import User
+
+    user = User(**deserialize_columns(model=User, data=snapshot['user']))
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def get_principal(email: str) -> Union[dict, None]:
+    """
+        Return principal snapshot for given email:
+            {'user': User, 'account': {...}, 'subscription_uuid': str|None,
+             'has_active_subscription': bool, 'is_account_setup': bool}
+        Redis errors never fail the request, snapshot is loaded from database instead.
+    """
+    cache_config = get_principal_cache_config()
+    snapshot = None
+    if cache_config['ENABLED']:
+        try:
+            cached = r.get(PRINCIPAL_KEY.format(email))
+            if cached is not None:
+                snapshot = json.loads(cached)
+        except Exception as exception_error:
+            logger.error(f'Principal cache read failed: {exception_error}')
+
+    if snapshot is None:
+        snapshot = load_principal_snapshot(email)
+        if snapshot is None:
+            return None
+        if cache_config['ENABLED']:
+            try:
+                account_key = PRINCIPAL_ACCOUNT_KEY.format(snapshot['account']['uuid'])
+                pipeline = r.pipeline()
+                pipeline.set(PRINCIPAL_KEY.format(email), json.dumps(snapshot), ex=cache_config['TTL'])
+                pipeline.sadd(account_key, email)
+                pipeline.expire(account_key, cache_config['TTL'])
+                pipeline.execute()
+            except Exception as exception_error:
+                logger.error(f'Principal cache write failed: {exception_error}')
+
+    account = snapshot['account']
+    return {
+        'user': attach_user(snapshot),
+        'account': account,
+        'subscription_uuid': snapshot['subscription_uuid'],
+        'has_active_subscription': snapshot['subscription_uuid'] is not None,
+        'is_account_setup': not (account['legal_name'] == '' and account['display_name'] == ''),
+    }
+
+
+def get_invalidation_targets(objects: Any) -> dict:
+    """
+        Collect cache keys affected by given model objects. Must be called before commit, so that old
+        values of changed email/account_uuid are still available in attribute history.
+    """
+    from app.models.account import Account
+    from app.models.subscription import Subscription
+    from app.models.user import User
+
+    targets = {'emails': set(), 'account_uuids': set()}
+    for obj in objects:
+        if isinstance(obj, User):
+            targets['emails'].add(obj.email)
+            history = inspect(obj).attrs.email.history
+            targets['emails'].update(value for value in history.deleted if value)
+        elif isinstance(obj, Account):
+            targets['account_uuids'].add(obj.uuid)
+        elif isinstance(obj, Subscription):
+            targets['account_uuids'].add(obj.account_uuid)
+            history = inspect(obj).attrs.account_uuid.history
+            targets['account_uuids'].update(value for value in history.deleted if value)
+    return targets
+
+
+def get_query_invalidation_targets(query: Any) -> dict:
+    """
+        Collect cache keys affected by rows of query that is about to be bulk updated or deleted (bypassing the
+        session). Rows are loaded only for User, Account and Subscription queries.
+    """
+    from app.models.account import Account
+    from app.models.subscription import Subscription
+    from app.models.user import User
+
+    if query.column_descriptions[0]['entity'] not in (User, Account, Subscription):
+        return {'emails': set(), 'account_uuids': set()}
+    return get_invalidation_targets(query.all())
+
+
+def get_session_invalidation_targets() -> dict:
+    """Collect cache keys affected by pending changes of current session."""
+    return get_invalidation_targets(list(db.session.new) + list(db.session.dirty) + list(db.session.deleted))
+
+
+def invalidate_principals(targets: dict) -> None:
+    """Delete cached snapshots for given emails and for every cached user of given accounts."""
+    if not targets['emails'] and not targets['account_uuids']:
+        return
+    try:
+        keys = [PRINCIPAL_KEY.format(email) for email in targets['emails'] if email]
+        for account_uuid in targets['account_uuids']:
+            account_key = PRINCIPAL_ACCOUNT_KEY.format(account_uuid)
+            keys.extend(PRINCIPAL_KEY.format(email.decode('utf-8')) for email in r.smembers(account_key))
+            keys.append(account_key)
+        if keys:
+            r.delete(*keys)
+    except Exception as exception_error:
+        logger.error(f'Principal cache invalidation failed: {exception_error}')
+
+
+def invalidate_principals_after_commit(targets: dict, session: Any = None) -> None:
+    """Drop cached snapshots for given targets when the transaction of session (db.session) commits, not on rollback."""
+    session = session if session is not None else db.session
+    pending = session.info.setdefault(PENDING_INVALIDATION_KEY, {'emails': set(), 'account_uuids': set()})
+    pending['emails'].update(targets['emails'])
+    pending['account_uuids'].update(targets['account_uuids'])
+
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_committed_principals(session):
+    """Drop cached snapshots collected by invalidate_principals_after_commit."""
+    targets = session.info.pop(PENDING_INVALIDATION_KEY, None)
+    if targets is not None:
+        invalidate_principals(targets)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def discard_pending_invalidations(session, previous_transaction):
+    """Rolled back changes keep cached snapshots valid."""
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(PENDING_INVALIDATION_KEY, None)
@@ -0,0 +1,51 @@
+"""
+    Search (q) filter shared by list queries.
+    Columns of a table are searched as one document, `coalesce(col1, '') || chr(31) || coalesce(col2, '') ...` (a
+    single column is searched as is), with ILIKE '%q%'. Columns are joined with the unit separator, which cannot be
+    typed in a search box, so q matches within one column and never across the boundary
+    of two columns. Migrations 0047 and 0050 create pg_trgm GIN indexes on exactly these expressions for the
+    *_SEARCH_COLUMNS below, so searches use the index instead of scanning every row of the account; keep both in sync
+    when columns change.
+"""
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy import literal_column
+from sqlalchemy import or_
+
+CONTRACT_SEARCH_COLUMNS = ('purpose', 'brief')
+CLIENT_SEARCH_COLUMNS = ('legal_name', 'display_name', 'email', 'phone', 'street_name', 'postal_code', 'city', 'state',
+                         'country')
+FOLDER_SEARCH_COLUMNS = ('folder_name',)
+ACCOUNT_SEARCH_COLUMNS = ('legal_name', 'display_name', 'postal_code', 'address', 'city', 'state', 'country')
+USER_SEARCH_COLUMNS = ('first_name', 'last_name', 'email', 'mobile_number', 'user_type')
+USER_INVITE_SEARCH_COLUMNS = ('first_name', 'last_name', 'email', 'status')
+EMAIL_TEMPLATE_SEARCH_COLUMNS = ('email_type',)
+SEARCH_DOCUMENT_SEPARATOR = 'chr(31)'  # SQL expression of the unit separator
+
+
+def escape_like(q: str) -> str:
+    """Escape LIKE wildcards so that q is matched literally."""
+    return q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_document(columns: list) -> Any:
+    """Expression searched for given columns of one table."""
+    if len(columns) == 1:
+        return columns[0]
+    document = func.coalesce(columns[0], literal_column("''"))
+    for column in columns[1:]:
+        document = document.op('||')(literal_column(SEARCH_DOCUMENT_SEPARATOR)).op('||')(
+            func.coalesce(column, literal_column("''")))
+    return document
+
+
+def model_columns(model: Any, column_names: tuple) -> list:
+    """Columns of model with given names."""
+    return [getattr(model, column_name) for column_name in column_names]
+
+
+def search_filter(q: str, *column_groups: list) -> Any:
+    """Filter matching q anywhere in any group of columns, every group being columns of one table."""
+    pattern = '%{}%'.format(escape_like(q))  # type: ignore  # noqa: FKA100
+    return or_(*[search_document(columns).ilike(pattern) for columns in column_groups])
@@ -10,6 +10,7 @@ import string
 from typing import Any
 from app import logger
 from app import config_data
+from app.helpers.constants import CountStrategy
 from app.helpers.constants import ValidationMessages
 from flask import jsonify
 from hashids import Hashids
@@ -73,6 +74,13 @@ def generate_email_token(id: int) -> bytes:
     return token
 
 
+def generate_email_tokens(ids: list) -> list:
+    """Generates email tokens (see generate_email_token) for many ids, secret and expiry are resolved once."""
+    secret = config_data.get('SECRET_KEY')
+    utc_timestamp = (datetime.now(timezone.utc) + timedelta(hours=48)).timestamp()
+    return [jwt.encode(payload={'timestamp': utc_timestamp, 'id': id}, key=secret) for id in ids]
+
+
 def random_with_n_digits(num: int) -> int:
     """Generates a random number of length num"""
     range_start = 10 ** (num - 1)
@@ -214,12 +222,22 @@ def generate_temporary_password():
     return password
 
 
-def get_pagination_meta(current_page: int, page_size: int, total_items: int) -> dict:
+def get_pagination_meta(current_page: int, page_size: int, total_items: Any, next_cursor: Any = None,
+                        count_strategy: Any = CountStrategy.EXACT.value) -> dict:
     """
         This method generates pagination metadata.
+        total_items is None in cursor mode (app.helpers.pagination), then only next_cursor tells if there is a next page.
+        count_strategy tells how total_items was computed (CountStrategy).
     """
 
-    if page_size:
+    if total_items is None:
+        count_strategy = None
+        total_pages = None
+        has_next_page = next_cursor is not None
+        has_previous_page = None
+        next_page = None
+        previous_page = None
+    elif page_size:
         total_pages = math.ceil(total_items / page_size)
         has_next_page = current_page < total_pages
         has_previous_page = current_page > 1
@@ -241,7 +259,9 @@ def get_pagination_meta(current_page: int, page_size: int, total_items: int) ->
         'has_next_page': has_next_page,
         'has_previous_page': has_previous_page,
         'next_page': next_page,
-        'previous_page': previous_page
+        'previous_page': previous_page,
+        'next_cursor': next_cursor,
+        'count_strategy': count_strategy
     }
 
 
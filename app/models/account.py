@@ -1,11 +1,14 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Union
 from app import db
-from app.helpers.constants import SortingOrder, UserType
+from app.helpers.constants import UserType
+from app.helpers.pagination import cursor_columns
+from app.helpers.pagination import paginate
+from app.helpers.search import ACCOUNT_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
 from app.models.base import Base
-from sqlalchemy import asc
-from sqlalchemy import desc
-from sqlalchemy import or_, and_
+from sqlalchemy import and_
 from app import app
 from bombaysoftwares_pysupp import str_to_bool
 
@@ -52,8 +55,12 @@ class Account(Base):
             ).all()
 
     @classmethod
-    def get_account_list(cls, q: Any = None, sort: Any = None, page: Any = None, size: Any = None, download: str = 'False') -> tuple:
-        """Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter)."""
+    def get_account_list(cls, q: Any = None, sort: Any = None, page: Any = None, size: Any = None, download: str = 'False',
+                         cursor: Union[str, None] = None, count_strategy: Union[str, None] = None) -> tuple:
+        """
+            Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter).
+            Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
+        """
         from app.models.user import User
         if download and str_to_bool(download):
             return db.session.query(cls.legal_name, cls.display_name, cls.postal_code, cls.address, cls.city, cls.state,
@@ -61,36 +68,16 @@ class Account(Base):
                 User.user_type == UserType.PRIMARY_USER.value).all()
 
         query = db.session.query(cls.id, cls.uuid, cls.legal_name, cls.display_name, cls.postal_code, cls.address, cls.city, cls.state,
-                                 cls.country, User.first_name, User.last_name, User.uuid.label('user_uuid')).join(User, cls.uuid == User.account_uuid).filter(
+                                 cls.country, User.first_name, User.last_name, User.uuid.label('user_uuid'),
+                                 *cursor_columns(cls.created_at, cls.id)).join(User, cls.uuid == User.account_uuid).filter(
             User.user_type == UserType.PRIMARY_USER.value)
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(
-                or_(cls.legal_name.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    cls.display_name.ilike('%{}%'.format(q)),
-                    cls.postal_code.ilike('%{}%'.format(q)),
-                    cls.address.ilike('%{}%'.format(q)),
-                    cls.city.ilike('%{}%'.format(q)),
-                    cls.state.ilike('%{}%'.format(q)),
-                    cls.country.ilike('%{}%'.format(q)),
-                    User.first_name.ilike('%{}%'.format(q)),
-                    User.last_name.ilike('%{}%'.format(q))
-                    )
-            )
-
-        query_count = query.count()
-
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
+            query = query.filter(search_filter(q, model_columns(cls, ACCOUNT_SEARCH_COLUMNS),
+                                               [User.first_name, User.last_name]))
 
-        return query.all(), query_count
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy)
 
     @classmethod
     def serialize(cls, details: Any) -> list:
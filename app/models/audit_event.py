@@ -1,27 +1,62 @@
-from datetime import datetime
-
+"""
+    Audit logs of auditable models are buffered in session.info while the transaction runs and written with one
+    multi-row INSERT just before it commits, instead of one INSERT per flushed row. Request fields (headers, body,
+    args, ...) are read once per transaction and audit policy. Buffered logs are dropped when the transaction rolls
+    back.
+"""
+from app.helpers.audit_policy import AuditPolicy
 from app.helpers.constants import DatabaseAction
 from app.models.audit_log import AuditLog
 from sqlalchemy import event
 from sqlalchemy import inspect
-from sqlalchemy.orm import class_mapper
-from sqlalchemy.orm.attributes import get_history
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm import Session
+
+AUDIT_RECORDS_KEY = 'audit_records'
+AUDIT_REQUEST_STATE_KEY = 'audit_request_state'
+
+
+@event.listens_for(Session, 'before_commit')
+def write_audit_records(session):
+    """Flush pending changes so that their audit logs are buffered, then insert buffered audit logs."""
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    records = session.info.pop(AUDIT_RECORDS_KEY, None)
+    session.info.pop(AUDIT_REQUEST_STATE_KEY, None)
+    if records:
+        AuditLog.insert_records(connection=session.connection(), records=records)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def discard_audit_records(session, previous_transaction):
+    """Drop audit logs of rolled back changes when the outermost transaction rolls back."""
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(AUDIT_RECORDS_KEY, None)
+    session.info.pop(AUDIT_REQUEST_STATE_KEY, None)
 
 
 class AuditableEvent:
-    """ Allow a model to be automatically audited """
+    """ Allow a model to be automatically audited, audit_policy (app.helpers.audit_policy) decides what is stored """
+    audit_policy = AuditPolicy()
 
     @staticmethod
-    def create_audit(connection, object_type, object_id, action, state_before=None, state_after=None):
-        """ Method to create audit log """
-        audit = AuditLog(
-            table_name=object_type,
-            object_id=object_id,
-            action=action,
-            state_before=state_before,
-            state_after=state_after
-        )
-        audit.save(connection)
+    def create_audit(connection, object_type, object_id, action, state_before=None, state_after=None, session=None,
+                     policy=None):
+        """ Method to create audit log, buffered until commit of session (written at once without session) """
+        policy = policy or AuditableEvent.audit_policy
+        if session is None:
+            AuditLog.insert_records(connection=connection, records=[AuditLog.build_record(
+                table_name=object_type, object_id=object_id, action=action, state_before=state_before,
+                state_after=state_after, request_state=policy.request_state(AuditLog.get_request_state()))])
+            return
+
+        request_states = session.info.setdefault(AUDIT_REQUEST_STATE_KEY, {})
+        if id(policy) not in request_states:
+            request_states[id(policy)] = policy.request_state(AuditLog.get_request_state())
+        session.info.setdefault(AUDIT_RECORDS_KEY, []).append(AuditLog.build_record(
+            table_name=object_type, object_id=object_id, action=action, state_before=state_before,
+            state_after=state_after, request_state=request_states[id(policy)]))
 
     @classmethod
     def __declare_last__(cls):
@@ -31,65 +66,55 @@ class AuditableEvent:
         event.listen(cls, 'after_update', cls.audit_update)  # noqa: FKA100
 
     @staticmethod
-    def audit_insert(mapper, connection, target):  # noqa: F841
-        """Listen for the `after_insert` event and create an AuditLog entry"""
+    def get_object_id(target):
+        """ Id of audited object, uuid when it has no id """
+        return getattr(target, 'id', None) or target.uuid
+
+    @staticmethod
+    def get_insert_state(mapper, target) -> dict:
+        """ Audited column values of target """
+        policy = target.audit_policy
+        return {key: policy.compact(getattr(target, key)) for key in policy.column_keys(mapper)}
+
+    @staticmethod
+    def get_update_diff(mapper, target, policy=None) -> tuple:
+        """ (state_before, state_after) of changed audited columns, one pass over attribute history """
+        policy = policy or target.audit_policy
+        attribute_states = inspect(target).attrs
+        state_before = {}
         state_after = {}
-        attrs = class_mapper(target.__class__).column_attrs
-        for attr in attrs:
-            state_after[attr.key] = getattr(target, attr.key)
-        obj_as_dict = AuditableEvent.convert_obj_to_dict(target)
-        state_after = AuditableEvent.dict_remove_datetime(state_after)
+        for key in policy.column_keys(mapper):
+            history = attribute_states[key].history
+            if not history.has_changes():
+                continue
+            before = policy.compact(history.deleted[0] if history.deleted else None)
+            after = policy.compact(history.added[0] if history.added else getattr(target, key))
+            if before != after:
+                state_before[key] = before
+                state_after[key] = after
+        return state_before, state_after
 
+    @staticmethod
+    def audit_insert(mapper, connection, target):  # noqa: F841
+        """Listen for the `after_insert` event and create an AuditLog entry"""
         target.create_audit(connection=connection, object_type=target.__tablename__,
-                            object_id=target.id if obj_as_dict.get(
-                                'id') else target.uuid,
-                            action=DatabaseAction.CREATE.value, state_before={}, state_after=state_after)
+                            object_id=AuditableEvent.get_object_id(target), action=DatabaseAction.CREATE.value,
+                            state_before={}, state_after=AuditableEvent.get_insert_state(mapper, target),
+                            session=object_session(target), policy=target.audit_policy)
 
     @staticmethod
     def audit_delete(mapper, connection, target):  # noqa: F841
         """Listen for the `after_delete` event and create an AuditLog entry"""
-        obj_as_dict = AuditableEvent.convert_obj_to_dict(target)
         target.create_audit(connection=connection, object_type=target.__tablename__,
-                            object_id=target.id if obj_as_dict.get(
-                                'id') else target.uuid,
-                            action=DatabaseAction.DELETE.value)
-
-    @staticmethod
-    def dict_remove_datetime(data):
-        """
-            This method checks for datetime objecy in dictionary and converts it to string.
-        """
-        return {key: value.strftime('%Y/%m/%d %H:%M:%S') if isinstance(value, datetime) else value for (key, value)
-                in data.items()}
-
-    @staticmethod
-    def convert_obj_to_dict(obj):
-        """
-            This method converts given model object to dictionary.
-        """
-        return {c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs}
+                            object_id=AuditableEvent.get_object_id(target), action=DatabaseAction.DELETE.value,
+                            session=object_session(target), policy=target.audit_policy)
 
     @staticmethod
     def audit_update(mapper, connection, target):  # noqa: F841
         """ Listen for the `after_update` event and create an AuditLog entry with before and after state changes"""
-        state_before = {}
-        state_after = {}
-        inspr = inspect(target)
-        attrs = class_mapper(target.__class__).column_attrs
-        for attr in attrs:
-            hist = getattr(inspr.attrs, attr.key).history
-            if hist.has_changes():
-                try:
-                    state_before[attr.key] = get_history(target, attr.key)[2].pop()  # noqa: FKA100
-                except Exception:
-                    state_before[attr.key] = get_history(target, attr.key)[2]  # noqa: FKA100
-                state_after[attr.key] = getattr(target, attr.key)
-        state_before = AuditableEvent.dict_remove_datetime(state_before)
-        state_after = AuditableEvent.dict_remove_datetime(state_after)
-        obj_as_dict = AuditableEvent.convert_obj_to_dict(target)
-        if state_after != state_before:
+        state_before, state_after = AuditableEvent.get_update_diff(mapper, target)
+        if state_after:
             target.create_audit(connection=connection, object_type=target.__tablename__,
-                                object_id=target.id if obj_as_dict.get(
-                                    'id') else target.uuid,
-                                action=DatabaseAction.UPDATE.value,
-                                state_before=state_before, state_after=state_after)
+                                object_id=AuditableEvent.get_object_id(target), action=DatabaseAction.UPDATE.value,
+                                state_before=state_before, state_after=state_after,
+                                session=object_session(target), policy=target.audit_policy)
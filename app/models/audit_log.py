@@ -2,20 +2,60 @@
     Database model for storing audit logs in database is written in this File along with its methods.
 """
 from datetime import datetime
-from typing import Any
+from datetime import timezone
+from typing import Any, Union
 
+from app import app
+from app import config_data
 from app import db
 from app import logger
 from app.helpers.constants import DataLevel
 from app.helpers.constants import SortingOrder
+from app.helpers.pagination import order_by_key
+from app.helpers.pagination import seek
 from dateutil import tz
+from sqlalchemy import event
+from sqlalchemy import text
+
+AUDIT_LOG_PARTITION = 'audit_log_{:%Y_%m}'
+AUDIT_LOG_DEFAULT_PARTITION = 'audit_log_default'
+DEFAULT_AUDIT_LOG_RETENTION_MONTHS = 12
+DEFAULT_AUDIT_LOG_PREMAKE_MONTHS = 3
+AUDIT_LOG_INSERT_BATCH_SIZE = 1000  # rows per INSERT, keeps bind parameters below the postgres limit
+
+
+def get_audit_log_config() -> dict:
+    """Return AUDIT_LOG partition settings from config.yml."""
+    audit_log_config = config_data.get('AUDIT_LOG') or {}
+    return {
+        'RETENTION_MONTHS': int(audit_log_config.get('RETENTION_MONTHS', DEFAULT_AUDIT_LOG_RETENTION_MONTHS)),
+        'PREMAKE_MONTHS': int(audit_log_config.get('PREMAKE_MONTHS', DEFAULT_AUDIT_LOG_PREMAKE_MONTHS)),
+    }
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """First day (UTC midnight) of the month months after the month of given datetime."""
+    month_index = month.year * 12 + month.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
 
 
 class AuditLog(db.Model):
-    """ An audit log for other model's actions """
+    """
+        An audit log for other model's actions.
+        Table is partitioned by month of created_at (audit_log_YYYY_MM, rows outside every month land in
+        audit_log_default). AuditLog.maintain_partitions creates the partitions of the coming months and drops the ones
+        older than AUDIT_LOG.RETENTION_MONTHS, so expired logs go away with DROP TABLE instead of DELETE.
+    """
     __tablename__ = 'audit_log'
+    __table_args__ = (
+        db.Index('ix_audit_log_created_at', 'created_at'),
+        db.Index('ix_audit_log_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_audit_log_table_name_object_id', 'table_name', 'object_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    # partition key has to be part of the primary key
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     user_id = db.Column(db.BigInteger)
     table_name = db.Column(db.Text, nullable=False)
     object_id = db.Column(db.String)
@@ -28,10 +68,10 @@ class AuditLog(db.Model):
     body = db.Column(db.JSON)
     args = db.Column(db.JSON)
     ip = db.Column(db.String)
-    created_at = db.Column(db.DateTime(timezone=True),
-                           default=datetime.now(tz=tz.tzlocal()))
+    created_at = db.Column(db.DateTime(timezone=True), primary_key=True,
+                           default=lambda: datetime.now(tz=tz.tzlocal()))
     updated_at = db.Column(db.DateTime(timezone=True),
-                           default=datetime.now(tz=tz.tzlocal()))
+                           default=lambda: datetime.now(tz=tz.tzlocal()))
 
     @classmethod
     def get_request_info(cls):
@@ -82,8 +122,9 @@ class AuditLog(db.Model):
 
         return body
 
-    def __init__(self, table_name, object_id, action, state_before, state_after):
-        """ Initialize audit_log object """
+    @classmethod
+    def get_request_state(cls) -> dict:
+        """Request fields stored with every audit log: user, method, url, headers, body, args and ip."""
         request = AuditLog.get_request_info()
         try:
             if request.environ.get('HTTP_X_FORWARDED_FOR') is None:
@@ -94,18 +135,29 @@ class AuditLog(db.Model):
         except Exception as exception_error:
             logger.error(f'Failed to Get Client IP - > {exception_error}')
             client_ip = ''
-        self.user_id = AuditLog.get_user_id(request)
-        self.table_name = table_name
-        self.object_id = object_id
-        self.action = action
-        self.state_before = state_before
-        self.state_after = state_after
-        self.method = request.method
-        self.url = request.url
-        self.headers = dict(request.headers.items())
-        self.body = AuditLog.get_request_body(request)
-        self.args = request.args.to_dict(flat=False)
-        self.ip = client_ip  # pylint: disable=C0103
+        return {
+            'user_id': AuditLog.get_user_id(request),
+            'method': request.method,
+            'url': request.url,
+            'headers': dict(request.headers.items()),
+            'body': AuditLog.get_request_body(request),
+            'args': request.args.to_dict(flat=False),
+            'ip': client_ip,
+        }
+
+    @classmethod
+    def build_record(cls, table_name, object_id, action, state_before, state_after,
+                     request_state: Union[dict, None] = None) -> dict:
+        """Column values of one audit log, request_state (get_request_state) is shared by records of a transaction."""
+        now = datetime.now(tz=tz.tzlocal())
+        return dict(request_state or cls.get_request_state(), table_name=table_name, object_id=object_id,
+                    action=action, state_before=state_before, state_after=state_after, created_at=now, updated_at=now)
+
+    def __init__(self, table_name, object_id, action, state_before, state_after):
+        """ Initialize audit_log object """
+        for key, value in AuditLog.build_record(table_name=table_name, object_id=object_id, action=action,
+                                                state_before=state_before, state_after=state_after).items():
+            setattr(self, key, value)
 
     def __repr__(self):
         """
@@ -113,30 +165,22 @@ class AuditLog(db.Model):
         """
         return '<AuditLog {!r}: {!r} -> {!r}>'.format(self.user_id, self.table_name, self.action)
 
+    @classmethod
+    def insert_records(cls, connection: Any, records: list) -> None:
+        """Insert audit logs with one multi-row INSERT per AUDIT_LOG_INSERT_BATCH_SIZE records."""
+        for start in range(0, len(records), AUDIT_LOG_INSERT_BATCH_SIZE):
+            connection.execute(cls.__table__.insert().values(records[start:start + AUDIT_LOG_INSERT_BATCH_SIZE]))
+
     def save(self, connection):
         """ Insert data into table """
-
-        connection.execute(
-            self.__table__.insert(),
-            user_id=self.user_id,
-            table_name=self.table_name,
-            object_id=self.object_id,
-            action=self.action,
-            state_before=self.state_before,
-            state_after=self.state_after,
-            method=self.method,
-            url=self.url,
-            headers=self.headers,
-            body=self.body,
-            args=self.args,
-            ip=self.ip
-        )
+        AuditLog.insert_records(connection=connection, records=[
+            {column.key: getattr(self, column.key) for column in self.__table__.columns if column.key != 'id'}])
 
     @classmethod
     def get_logs(cls, action: Any = None, user_id: Any = None,
                  page: Any = None, pagination: Any = None, sort: Any = None,
-                 start_date: Any = None, end_date: Any = None):
-        """ Collect audit logs from table """
+                 start_date: Any = None, end_date: Any = None, cursor: Any = None):
+        """ Collect audit logs from table, cursor (with pagination) seeks on (created_at, id) instead of offset """
         query = db.session.query(cls)
 
         if action:
@@ -151,6 +195,11 @@ class AuditLog(db.Model):
         if end_date:
             query = query.filter(cls.created_at <= end_date)
 
+        if cursor is not None and pagination:
+            query = order_by_key(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort)
+            return seek(query=query, created_at_column=cls.created_at, id_column=cls.id, cursor=cursor,
+                        sort=sort).limit(int(pagination))
+
         if sort == SortingOrder.ASC.value:
             query = query.order_by(cls.id.asc())
         else:
@@ -163,6 +212,58 @@ class AuditLog(db.Model):
 
         return query
 
+    @classmethod
+    def get_partition_names(cls, connection: Any) -> list:
+        """Names of the partitions of audit_log."""
+        return connection.execute(text(
+            'SELECT child.relname FROM pg_inherits JOIN pg_class parent ON pg_inherits.inhparent = parent.oid '
+            'JOIN pg_class child ON pg_inherits.inhrelid = child.oid WHERE parent.relname = :table_name'),
+            {'table_name': cls.__tablename__}).scalars().all()
+
+    @classmethod
+    def create_partitions(cls, connection: Any, start: datetime, months: int) -> None:
+        """Create default partition and monthly partitions of months months from month of start, if missing."""
+        connection.execute(text(f'CREATE TABLE IF NOT EXISTS {AUDIT_LOG_DEFAULT_PARTITION} '
+                                f'PARTITION OF {cls.__tablename__} DEFAULT'))
+        for offset in range(months):
+            month = add_months(start, offset)
+            connection.execute(text(
+                f'CREATE TABLE IF NOT EXISTS {AUDIT_LOG_PARTITION.format(month)} PARTITION OF {cls.__tablename__} '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"))
+
+    @classmethod
+    def drop_expired_partitions(cls, connection: Any, retention_months: int,
+                                now: Union[datetime, None] = None) -> list:
+        """Drop monthly partitions ending before the last retention_months months, returns dropped names."""
+        oldest_kept = AUDIT_LOG_PARTITION.format(add_months(now or datetime.now(tz=timezone.utc), -retention_months))
+        dropped = []
+        for partition_name in sorted(cls.get_partition_names(connection)):
+            # audit_log_YYYY_MM names sort by month
+            if partition_name != AUDIT_LOG_DEFAULT_PARTITION and partition_name < oldest_kept:
+                connection.execute(text(f'DROP TABLE IF EXISTS {partition_name}'))
+                dropped.append(partition_name)
+        return dropped
+
+    @classmethod
+    def maintain_partitions(cls) -> None:
+        """
+            Scheduled job: create partitions of this month and the next AUDIT_LOG.PREMAKE_MONTHS months and drop
+            partitions older than AUDIT_LOG.RETENTION_MONTHS.
+        """
+        with app.app_context():
+            audit_log_config = get_audit_log_config()
+            try:
+                connection = db.session.connection()
+                cls.create_partitions(connection=connection, start=datetime.now(tz=timezone.utc),
+                                      months=audit_log_config['PREMAKE_MONTHS'] + 1)
+                dropped = cls.drop_expired_partitions(connection=connection,
+                                                      retention_months=audit_log_config['RETENTION_MONTHS'])
+                db.session.commit()
+                logger.info(f'Audit log partitions maintained, dropped: {dropped}')
+            except Exception as exception_error:
+                db.session.rollback()
+                logger.error(f'Audit log partition maintenance failed: {exception_error}')
+
     @classmethod
     def serialize(cls, audit_logs: list, data_level: str = DataLevel.INFO.value, user_dict: Any = None) -> list:
         """ Make a list of Audit Log objects."""
@@ -195,3 +296,10 @@ class AuditLog(db.Model):
                 }
             data.append(data_dict)
         return data
+
+
+@event.listens_for(AuditLog.__table__, 'after_create')
+def create_audit_log_partitions(target, connection, **kw):
+    """Partitions for tables created by db.create_all (tests, benchmarks), migrations create their own."""
+    AuditLog.create_partitions(connection=connection, start=datetime.now(tz=timezone.utc),
+                               months=get_audit_log_config()['PREMAKE_MONTHS'] + 1)
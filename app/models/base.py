@@ -1,13 +1,18 @@
 """Contains some basic definitions that can be extended by other models."""
-from uuid import uuid4
 from typing import Any, Union
 from app import db
 from app import logger
+from app.helpers.pagination import invalidate_counts
+from app.helpers.pagination import invalidate_counts_after_commit
+from app.helpers.uuid_generator import generate_uuid
 from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from app import app
 from app import config_data
 
+UUID_CONFLICT_RETRIES = 3
+
 
 class Base(db.Model):
     """Base modal for all other modal that contains some basic methods that can be extended by other modals."""
@@ -15,29 +20,22 @@ class Base(db.Model):
 
     @classmethod
     def create_uuid(cls) -> Any:
-        """creates a random uuid and checks if exists in the cls table:
-        if yes then it recursively calls itself if not the returns the uuid."""
-        if config_data.get('TESTING'):
-            uuid = str(uuid4())
-            exists = db.session.query(cls).filter(cls.uuid == uuid).first()
-            if exists:
-                cls.create_uuid()
-            else:
-                return uuid
-        else:
-            with app.app_context():
-                uuid = str(uuid4())
-                exists = db.session.query(cls).filter(cls.uuid == uuid).first()
-                if exists:
-                    cls.create_uuid()
-                else:
-                    return uuid
+        """Return new uuid (version from UUID.VERSION). Uniqueness is enforced by the unique constraint on uuid column,
+        Base.add retries with a new uuid on the (practically impossible) conflict instead of querying before insert."""
+        return generate_uuid()
+
+    @classmethod
+    def is_uuid_conflict(cls, error: IntegrityError) -> bool:
+        """Check if IntegrityError is a violation of unique constraint on uuid column of cls table."""
+        return getattr(getattr(error.orig, 'diag', None), 'constraint_name', None) == '{}_uuid_key'.format(
+            cls.__tablename__)
 
     @classmethod
     def bulk_insert(cls, data_list: list) -> None:
         stmt = insert(cls).values(data_list)
         db.session.execute(stmt)
         db.session.commit()
+        invalidate_counts(table=cls.__tablename__, account_uuids={data.get('account_uuid') for data in data_list})
 
     @classmethod
     def get_by_id(cls, obj_id: int) -> Any:
@@ -58,40 +56,79 @@ class Base(db.Model):
     def add(cls, data: dict) -> Any:
         """Method to add DB record."""
         if config_data.get('TESTING'):
+            return cls.add_with_uuid_retry(data)
+        else:
+            with app.app_context():
+                return cls.add_with_uuid_retry(data)
+
+    @classmethod
+    def add_with_uuid_retry(cls, data: dict) -> Any:
+        """Insert record, on uuid conflict data['uuid'] is replaced with a new uuid and insert is retried."""
+        for attempt in range(UUID_CONFLICT_RETRIES + 1):
             try:
                 obj = cls(**data)
                 db.session.add(obj)
                 db.session.commit()
+                cls.invalidate_cached_principals([obj])
+                invalidate_counts(table=cls.__tablename__, account_uuids={getattr(obj, 'account_uuid', None)})
                 return obj
+            except IntegrityError as error:
+                db.session.rollback()
+                if not cls.is_uuid_conflict(error) or attempt == UUID_CONFLICT_RETRIES:
+                    logger.error('error while creating record for {} table : {}'.format(
+                        cls.__name__, error))
+                    return None
+                logger.warning('uuid conflict while creating record for {} table, retrying'.format(cls.__name__))
+                data['uuid'] = cls.create_uuid()
             except Exception as error:
                 logger.error('error while creating record for {} table : {}'.format(
                     cls.__name__, error))
-        else:
-            with app.app_context():
-                try:
-                    obj = cls(**data)
-                    db.session.add(obj)
-                    db.session.commit()
-                    return obj
-                except Exception as error:
-                    logger.error('error while creating record for {} table : {}'.format(
-                        cls.__name__, error))
+                return None
 
     @classmethod
     def update(cls):
         """ Method to update DB record."""
+        from app.helpers.principal_cache import get_session_invalidation_targets
+        from app.helpers.principal_cache import invalidate_principals
+        targets = get_session_invalidation_targets()
+        for obj in db.session.deleted:
+            invalidate_counts_after_commit(table=obj.__tablename__, account_uuids={getattr(obj, 'account_uuid', None)})
         db.session.commit()
+        invalidate_principals(targets)
+
+    @staticmethod
+    def invalidate_cached_principals(objects: list) -> None:
+        """Drop cached principal snapshots (see app.helpers.principal_cache) affected by given objects."""
+        from app.helpers.principal_cache import get_invalidation_targets
+        from app.helpers.principal_cache import invalidate_principals
+        invalidate_principals(get_invalidation_targets(objects))
+
+    @staticmethod
+    def delete_with_invalidation(query: Any) -> None:
+        """
+            Bulk delete rows of query. Cached principal snapshots of deleted users, accounts and subscriptions and
+            cached list counts of the accounts of deleted rows are dropped when the caller commits.
+        """
+        from app.helpers.principal_cache import get_query_invalidation_targets
+        from app.helpers.principal_cache import invalidate_principals_after_commit
+        model = query.column_descriptions[0]['entity']
+        targets = get_query_invalidation_targets(query)
+        account_uuids = {row[0] for row in query.with_entities(model.account_uuid).distinct()} \
+            if hasattr(model, 'account_uuid') else set()
+        query.delete()
+        invalidate_principals_after_commit(targets, session=query.session)
+        invalidate_counts_after_commit(table=model.__tablename__, account_uuids=account_uuids, session=query.session)
 
     @classmethod
     def delete_by_id(cls, obj_id: int) -> Any:
         """Delink records by id ."""
-        db.session.query(cls).filter(cls.id == obj_id).delete()
+        cls.delete_with_invalidation(db.session.query(cls).filter(cls.id == obj_id))
 
     @classmethod
     def delete_by_uuid(cls, uuid: str) -> Any:
         """Delink records by uuid ."""
         with app.app_context():
-            db.session.query(cls).filter(cls.uuid == uuid).delete()
+            cls.delete_with_invalidation(db.session.query(cls).filter(cls.uuid == uuid))
 
             logger.info(f'Account with uuid: {uuid} is deleted from db')
 
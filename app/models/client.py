@@ -1,14 +1,14 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Union
 from app import db
-from app.helpers.constants import SortingOrder
 from app.models.account import Account
+from app.helpers.pagination import paginate
+from app.helpers.search import CLIENT_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
 from app.models.base import Base
 from app.models.user import User
-from sqlalchemy import asc
-from sqlalchemy import desc
 from sqlalchemy import ForeignKey
-from sqlalchemy import or_
 from sqlalchemy.orm import backref
 
 
@@ -39,43 +39,28 @@ class Client(Base):
     account = db.relationship(
         'Account', backref=backref('client', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_client_account_uuid_created_at_id', 'account_uuid', 'created_at', 'id'),
+    )
+
     @classmethod
     def get_all_by_account_uuid(cls, q: Any = None, sort: Any = None, page: Any = None, size: Any = None,
-                                account_uuid: str = account_uuid) -> tuple:
+                                account_uuid: str = account_uuid, cursor: Union[str, None] = None,
+                                count_strategy: Union[str, None] = None) -> tuple:
         """
         Get all records belong to given account_uuid. Then
         Filter records based on search(q) and sorts them based on page, size, sort(sorting parameter).
+        Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
         """
         query = db.session.query(cls).filter(
             cls.account_uuid == account_uuid).filter(cls.is_account_client == False)  # type: ignore  # noqa: E712
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(
-                or_(cls.legal_name.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    cls.display_name.ilike('%{}%'.format(q)),
-                    cls.email.ilike('%{}%'.format(q)),
-                    cls.phone.ilike('%{}%'.format(q)),
-                    cls.street_name.ilike('%{}%'.format(q)),
-                    cls.postal_code.ilike('%{}%'.format(q)),
-                    cls.city.ilike('%{}%'.format(q)),
-                    cls.state.ilike('%{}%'.format(q)),
-                    cls.country.ilike('%{}%'.format(q))
-                    )
-            )
-
-        query_count = query.count()
+            query = query.filter(search_filter(q, model_columns(cls, CLIENT_SEARCH_COLUMNS)))
 
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
-
-        return query.all(), query_count
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy, count_scope=account_uuid)
 
     @classmethod
     def serialize(cls, details: Any, single_object: bool = False) -> Any:
@@ -111,6 +96,12 @@ class Client(Base):
         else:
             return data
 
+    @classmethod
+    def get_legal_name_slugs(cls, account_uuid: str) -> set:
+        """Get legal name slugs of all clients of given account."""
+        return {legal_name_slug for legal_name_slug, in db.session.query(cls.legal_name_slug).filter(
+            cls.account_uuid == account_uuid).all()}
+
     @classmethod
     def check_if_client_exits(cls, account_uuid: str, legal_name_slug: str, client_uuid: str = ''):
         """
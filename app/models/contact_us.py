@@ -3,10 +3,10 @@ from typing import Any
 
 from app import db
 from app.helpers.constants import SortingOrder
+from app.helpers.search import search_filter
 from app.models.base import Base
 from sqlalchemy import asc
 from sqlalchemy import desc
-from sqlalchemy import or_
 
 
 class ContactUs(Base):
@@ -56,13 +56,8 @@ class ContactUs(Base):
             query = query.order_by(desc(cls.created_at))
 
         if q:
-            query = query.filter(
-                or_(cls.first_name.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    cls.last_name.ilike('%{}%'.format(q)),
-                    cls.email.ilike('%{}%'.format(q)),
-                    cls.company_name.ilike('%{}%'.format(q)),
-                    cls.message.ilike('%{}%'.format(q)))
-            )
+            query = query.filter(search_filter(q, [cls.first_name, cls.last_name, cls.email, cls.company_name,
+                                                   cls.message]))
 
         query_count = query.count()
 
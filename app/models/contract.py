@@ -4,16 +4,24 @@ from sqlalchemy import func, case
 from app import db
 from app.helpers.constants import SortingOrder, ContractStatus, ContractMailStatus, DurationType, PaymentFrequency
 from app.models.account import Account
+from app.helpers.pagination import paginate
+from app.helpers.search import CONTRACT_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
 from app.models.base import Base
 from app.models.client import Client
 from app.models.template import Template
 from app.models.user import User
-from sqlalchemy import ForeignKey, asc, desc, or_
-from app import app
+from sqlalchemy import ForeignKey, asc, desc
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm import defer
+from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import relationship
 from app.models.folder import Folder
 from sqlalchemy.orm import backref
 
+LIST_DEFERRED_COLUMNS = ('content', 'signed_content')
+
 
 class Contract(Base):
     __tablename__ = 'contract'
@@ -49,11 +57,31 @@ class Contract(Base):
     account = db.relationship('Account', backref=backref(
         'contract', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_contract_account_uuid_folder_uuid_created_at_id', 'account_uuid', 'folder_uuid', 'created_at',
+                 'id'),
+        db.Index('ix_contract_account_uuid_status', 'account_uuid', 'status'),
+    )
+
+    @classmethod
+    def list_deferred_columns(cls) -> list:
+        """Large text columns which list queries do not load."""
+        return [getattr(cls, column) for column in LIST_DEFERRED_COLUMNS]
+
     @classmethod
-    def serialize(cls, details: Any) -> list:
-        """ Make a list of dictionary from objects"""
+    def serialize(cls, details: Any, summary: bool = False) -> list:
+        """
+            Make a list of dictionary from objects.
+            Signed counts of all given contracts are fetched with one grouped query; load contracts with
+            get_contracts_list (or eager load created_by_uuid and created_for_client_uuid) to avoid a query per row.
+            summary=True leaves out content and signed_content (LIST_DEFERRED_COLUMNS), used for list responses.
+        """
         if not isinstance(details, list):
             details = [details]
+        from app.models.contract_signee import ContractSignee
+        signed_counts = ContractSignee.get_count_by_contract_uuids_and_status(
+            contract_uuids=[single_data.uuid for single_data in details], status=ContractMailStatus.SIGNED.value)
         data = []
         for single_data in details:
             created_by_uuid = User.serialize(
@@ -61,9 +89,7 @@ class Contract(Base):
             created_for_client_uuid = Client.serialize(
                 single_data.created_for_client_uuid, single_object=True)
 
-            from app.models.contract_signee import ContractSignee
-            signed_count = ContractSignee.get_count_by_contact_uuid_and_status(contract_uuid=single_data.uuid,
-                                                                               status=ContractMailStatus.SIGNED.value)
+            signed_count = signed_counts.get(single_data.uuid, 0)
             is_editable = False
             if signed_count == 0 and single_data.status in [ContractStatus.DRAFT.value,
                                                             ContractStatus.SENT_FOR_SIGNING.value]:
@@ -78,8 +104,6 @@ class Contract(Base):
                 'client_uuid': created_for_client_uuid,
                 'template_uuid': single_data.template_uuid,
                 'folder_uuid': single_data.folder_uuid,
-                'content': single_data.content,
-                'signed_content': single_data.signed_content,
                 'brief': single_data.brief,
                 'service_name': single_data.service_name,
                 'duration': single_data.duration,
@@ -93,14 +117,22 @@ class Contract(Base):
                 'created_at': single_data.created_at,
                 'updated_at': single_data.updated_at,
             }
+            if not summary:
+                single_data_obj['content'] = single_data.content
+                single_data_obj['signed_content'] = single_data.signed_content
 
             data.append(single_data_obj)
         return data
 
     @classmethod
     def get_contracts_list(cls, account_uuid: str, folder_uuid: Union[str, None] = None, q: Any = None, sort: Any = None, page: Any = None,
-                           size: Any = None) -> tuple:
-        """Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter)."""
+                           size: Any = None, cursor: Union[str, None] = None,
+                           count_strategy: Union[str, None] = None) -> tuple:
+        """
+            Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter).
+            Contract bodies (LIST_DEFERRED_COLUMNS) are not selected, serialize the result with summary=True.
+            Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
+        """
 
         query = db.session.query(cls).join(Client, cls.client_uuid == Client.uuid).filter(
             cls.account_uuid == account_uuid)
@@ -108,26 +140,15 @@ class Contract(Base):
         if folder_uuid is not None:
             query = query.filter(cls.folder_uuid == folder_uuid)
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(
-                or_(cls.purpose.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    cls.brief.ilike('%{}%'.format(q)),
-                    Client.legal_name.ilike('%{}%'.format(q)))
-            )
+            query = query.filter(search_filter(q, model_columns(cls, CONTRACT_SEARCH_COLUMNS), [Client.legal_name]))
 
-        query_count = query.count()
-
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
+        # client is already joined for search, creator is joined too so that serialize does not query per row
+        query = query.options(contains_eager(cls.created_for_client_uuid), joinedload(cls.created_by_uuid),
+                              *[defer(column) for column in cls.list_deferred_columns()])
 
-        return query.all(), query_count
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy, count_scope=account_uuid)
 
     @classmethod
     def get_contracts_status_details(cls, account_uuid: Union[str, None] = None, start_timestamp: Union[int, None] = None,
@@ -189,12 +210,7 @@ class Contract(Base):
             query = query.order_by(desc(Client.created_at))
 
         if q:
-            query = query.filter(
-                or_(Client.legal_name.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    Client.display_name.ilike('%{}%'.format(q)),
-                    Client.email.ilike('%{}%'.format(q))
-                    )
-            )
+            query = query.filter(search_filter(q, [Client.legal_name, Client.display_name, Client.email]))
 
         query_count = query.count()
 
@@ -210,12 +226,6 @@ class Contract(Base):
         """Get all contracts of all accounts with "sent for signing" status"""
         return db.session.query(cls).filter(cls.account_uuid == account_uuid).filter(cls.status == status).all()
 
-    @classmethod
-    def get_uuid_by_status(cls, status):
-        """Get all contracts of all accounts with "sent for signing" status"""
-        with app.app_context():
-            return db.session.query(cls.uuid).filter(cls.status == status).all()
-
     @classmethod
     def get_folder_contact_count(cls, account_uuid: str, folder_uuid: str):
         """Get Contract count by account's folder_uuid"""
@@ -22,6 +22,11 @@ class ContractLog(Base):
 
     account = db.relationship('Account', backref=backref('contract_log', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_contract_log_account_uuid_contract_uuid', 'account_uuid', 'contract_uuid'),
+    )
+
     @classmethod
     def get_by_account_and_contract(cls, account_uuid: str, contract_uuid: str):
         """Get all logs of that given contract"""
@@ -3,13 +3,13 @@ from typing import Any
 from sqlalchemy.orm import backref
 from app import db
 from app.helpers.constants import ContractMailStatus
+from app.helpers.pagination import invalidate_counts_after_commit
 from app.models.account import Account
 from app.models.base import Base
 from app.models.client import Client
 from app.models.contract import Contract
 from app.models.signee import Signee
-from sqlalchemy import ForeignKey, asc
-from app import app
+from sqlalchemy import ForeignKey, asc, func
 
 
 class ContractSignee(Base):
@@ -39,6 +39,13 @@ class ContractSignee(Base):
     account = db.relationship('Account', backref=backref(
         'contract_signee', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_contract_signee_account_uuid_contract_uuid_client_uuid', 'account_uuid', 'contract_uuid',
+                 'client_uuid'),
+        db.Index('ix_contract_signee_contract_uuid_status', 'contract_uuid', 'status'),
+    )
+
     @classmethod
     def get_by_account_and_contract(cls, account_uuid: str, contract_uuid: str) -> list:
         """Get objects by given contract_uuid"""
@@ -72,16 +79,27 @@ class ContractSignee(Base):
         return db.session.query(cls).filter(cls.contract_uuid == contract_uuid).filter(cls.status == status).count()
 
     @classmethod
-    def get_email_by_contact_uuids_and_status(cls, status: str, contract_uuids: list) -> list:
-        """Get email ids of given contract by its status"""
-        with app.app_context():
-            return db.session.query(cls.uuid, cls.signee_email, cls.signee_full_name, cls.account_uuid, cls.contract_uuid).filter(cls.contract_uuid.in_(contract_uuids)).filter(cls.status == status).all()
+    def get_count_by_contract_uuids_and_status(cls, contract_uuids: list, status: str) -> dict:
+        """Get count of signees with given status for every given contract in one query, keyed by contract uuid"""
+        if not contract_uuids:
+            return {}
+        return dict(db.session.query(cls.contract_uuid, func.count(cls.id)).filter(
+            cls.contract_uuid.in_(contract_uuids)).filter(cls.status == status).group_by(cls.contract_uuid).all())
+
+    @classmethod
+    def get_reminder_batch(cls, contract_status: str, status: str, after_id: int, limit: int) -> list:
+        """Get next signees (ordered by id, after given id) with given status on contracts with given contract status"""
+        return db.session.query(cls.id, cls.uuid, cls.signee_email, cls.signee_full_name, cls.account_uuid,
+                                cls.contract_uuid).join(Contract, Contract.uuid == cls.contract_uuid).filter(
+            Contract.status == contract_status).filter(cls.status == status).filter(cls.id > after_id).order_by(
+            asc(cls.id)).limit(limit).all()
 
     @classmethod
     def delete_by_contract(cls, account_uuid: str, contract_uuid: str, client_uuid: str) -> None:
         """Delete records by contract_uuid ."""
         db.session.query(cls).filter(cls.account_uuid == account_uuid).filter(cls.client_uuid == client_uuid).filter(
             cls.contract_uuid == contract_uuid).delete()
+        invalidate_counts_after_commit(table=cls.__tablename__, account_uuids={account_uuid})
 
     @classmethod
     def get_contract_signee_by_signee_uuid(cls, account_uuid: str, signee_uuid: str):
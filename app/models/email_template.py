@@ -8,6 +8,14 @@ from app.helpers.constants import SortingOrder
 from app import app
 from app import config_data
 from app.helpers.constants import EmailTypes
+from app.helpers.email_template_cache import get_email_template_fields
+from app.helpers.email_template_cache import set_email_template_fields
+from app.helpers.search import EMAIL_TEMPLATE_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
+
+# columns kept in the email template cache, cached lookups return EmailTemplate(**fields) outside the session
+CACHED_COLUMNS = ('id', 'uuid', 'account_uuid', 'email_type', 'email_subject', 'email_body')
 
 
 class EmailTemplate(Base):
@@ -23,13 +31,33 @@ class EmailTemplate(Base):
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, onupdate=datetime.now)
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_email_template_account_uuid_email_type', 'account_uuid', 'email_type'),
+    )
+
     @classmethod
     def get_email_template_by_email_type(cls, account_uuid: str, email_type: str):
+        """Get email template of account by email type, read through the email template cache."""
+        fields = get_email_template_fields(account_uuid=account_uuid, email_type=email_type)
+        if fields is not None:
+            return cls(**fields)
+
         if config_data.get('TESTING'):
-            return db.session.query(cls).filter(cls.account_uuid == account_uuid, cls.email_type == email_type).first()
+            email_template = db.session.query(cls).filter(cls.account_uuid == account_uuid, cls.email_type == email_type).first()
         else:
             with app.app_context():
-                return db.session.query(cls).filter(cls.account_uuid == account_uuid, cls.email_type == email_type).first()
+                email_template = db.session.query(cls).filter(cls.account_uuid == account_uuid, cls.email_type == email_type).first()
+        if email_template is not None:
+            set_email_template_fields(account_uuid=account_uuid, email_type=email_type,
+                                      fields={column: getattr(email_template, column) for column in CACHED_COLUMNS})
+        return email_template
+
+    @classmethod
+    def get_email_templates_by_account_uuids(cls, account_uuids: list, email_type: str) -> dict:
+        """Get templates of given email type for many accounts in one query, keyed by account uuid."""
+        templates = db.session.query(cls).filter(cls.account_uuid.in_(account_uuids), cls.email_type == email_type).all()
+        return {template.account_uuid: template for template in templates}
 
     @classmethod
     def get_email_template_list(cls, account_uuid: str = account_uuid, q: Any = None, page: Any = None, size: Any = None, sort: Any = None) -> tuple:
@@ -42,9 +70,7 @@ class EmailTemplate(Base):
             query = query.order_by(desc(cls.created_at))
 
         if q:
-            query = query.filter(
-                cls.email_type.ilike('%{}%'.format(q))  # type: ignore  # noqa: FKA100)
-            )
+            query = query.filter(search_filter(q, model_columns(cls, EMAIL_TEMPLATE_SEARCH_COLUMNS)))
 
         query_count = query.count()
 
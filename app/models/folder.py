@@ -1,13 +1,13 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Union
 from app import db
 from app.models.account import Account
+from app.helpers.pagination import paginate
+from app.helpers.search import FOLDER_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
 from app.models.base import Base
 from sqlalchemy import ForeignKey
-from app.helpers.constants import SortingOrder
-from sqlalchemy import asc
-from sqlalchemy import desc
-from sqlalchemy import or_
 from sqlalchemy.orm import backref
 
 
@@ -24,6 +24,11 @@ class Folder(Base):
 
     account = db.relationship('Account', backref=backref('folder', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_folder_account_uuid_created_at_id', 'account_uuid', 'created_at', 'id'),
+    )
+
     @classmethod
     def check_if_folder_exist(cls, account_uuid: str, folder_name_slug: str, folder_uuid: str = ''):
         """
@@ -39,28 +44,19 @@ class Folder(Base):
         return db.session.query(cls).filter(cls.account_uuid == account_uuid).filter(cls.folder_name_slug == folder_name_slug).first() is not None
 
     @classmethod
-    def get_folder_list(cls, account_uuid: str, q: Any = None, sort: Any = None, page: Any = None, size: Any = None) -> tuple:
-        """Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter)."""
+    def get_folder_list(cls, account_uuid: str, q: Any = None, sort: Any = None, page: Any = None, size: Any = None,
+                        cursor: Union[str, None] = None, count_strategy: Union[str, None] = None) -> tuple:
+        """
+            Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter).
+            Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
+        """
         query = db.session.query(cls).filter(cls.account_uuid == account_uuid)
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(
-                or_(cls.folder_name.ilike('%{}%'.format(q)))  # type: ignore  # noqa: FKA100
-            )
-
-        query_count = query.count()
-
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
+            query = query.filter(search_filter(q, model_columns(cls, FOLDER_SEARCH_COLUMNS)))
 
-        return query.all(), query_count
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy, count_scope=account_uuid)
 
     @classmethod
     def serialize(cls, details: Any) -> Any:
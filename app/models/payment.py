@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Union
 from app import db
-from app.helpers.constants import SortingOrder
 from app.models.account import Account
+from app.helpers.pagination import paginate
+from app.helpers.search import search_filter
 from app.models.base import Base
-from sqlalchemy import ForeignKey, asc, desc
+from sqlalchemy import ForeignKey
 from sqlalchemy.orm import backref
 
 
@@ -28,27 +29,20 @@ class Payment(Base):
 
     @classmethod
     def get_by_account(cls, account_uuid: str, q: Any = None, sort: Any = None, page: Any = None,
-                       size: Any = None) -> tuple:
-        """Filters records based on account, search(q) and sorts them based on page, size, sort(sorting parameter)."""
+                       size: Any = None, cursor: Union[str, None] = None,
+                       count_strategy: Union[str, None] = None) -> tuple:
+        """
+            Filters records based on account, search(q) and sorts them based on page, size, sort(sorting parameter).
+            Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
+        """
         query = db.session.query(cls).filter(
             cls.account_uuid == account_uuid)
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(cls.status.ilike('%{}%'.format(q)))  # type: ignore  # noqa: FKA100
-
-        query_count = query.count()
-
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
+            query = query.filter(search_filter(q, [cls.status]))
 
-        return query.all(), query_count
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy, count_scope=account_uuid)
 
     @classmethod
     def serialize(cls, details: Any, single_object: bool = False) -> Any:
@@ -27,6 +27,11 @@ class Signee(Base):
     account = db.relationship(
         'Account', backref=backref('signee', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_signee_account_uuid_client_uuid', 'account_uuid', 'client_uuid'),
+    )
+
     @classmethod
     def get_by_email(cls, email: str) -> Any:
         return db.session.query(cls).filter(cls.email == email).first()
@@ -33,6 +33,11 @@ class Subscription(Base):
     account = db.relationship('Account', backref=backref(
         'subscription', passive_deletes=True))
 
+    # composite indexes of hot filter paths, created by migration 0048
+    __table_args__ = (
+        db.Index('ix_subscription_account_uuid_status', 'account_uuid', 'status'),
+    )
+
     @staticmethod
     def get_active_subscription_by_account_uuid(account_uuid: str):
         """Return active subscription by account uuid."""
@@ -51,14 +56,20 @@ class Subscription(Base):
         """
             Update status of all expired subscriptions from active to expired.
         """
+        from app.helpers.principal_cache import get_query_invalidation_targets
+        from app.helpers.principal_cache import invalidate_principals
         with app.app_context():
             logger.info('Subscription status update Started.')
             today = datetime.now()
-            db.session.query(cls).filter(cls.status == SubscriptionStatus.ACTIVE.value, cls.end_date < today).update(
+            query = db.session.query(cls).filter(cls.status == SubscriptionStatus.ACTIVE.value, cls.end_date < today)
+            # bulk update bypasses Base.update, cached principals of the accounts are dropped explicitly
+            targets = get_query_invalidation_targets(query)
+            query.update(
                 {cls.status: SubscriptionStatus.EXPIRED.value},
                 synchronize_session=False  # Set to False for a bulk update
             )
             db.session.commit()
+            invalidate_principals(targets)
             logger.info('Subscription status update completed.')
 
     @classmethod
@@ -1,14 +1,16 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Union
 from app import db
 from app.helpers.constants import UserType
-from app.helpers.constants import SortingOrder
+from app.helpers.constants import SubscriptionStatus
 from app.models.account import Account
+from app.helpers.pagination import cursor_columns
+from app.helpers.pagination import paginate
+from app.helpers.search import USER_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
 from app.models.base import Base
 from sqlalchemy import and_
-from sqlalchemy import or_
-from sqlalchemy import asc
-from sqlalchemy import desc
 from sqlalchemy import ForeignKey
 from sqlalchemy.ext import hybrid
 from sqlalchemy.orm import backref
@@ -45,35 +47,22 @@ class User(Base):
         return self.first_name
 
     @classmethod
-    def get_users_with_account_legal_name(cls, q: Any = None, sort: Any = None, page: Any = None, size: Any = None) -> tuple:
-        """Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter)."""
+    def get_users_with_account_legal_name(cls, q: Any = None, sort: Any = None, page: Any = None, size: Any = None,
+                                          cursor: Union[str, None] = None,
+                                          count_strategy: Union[str, None] = None) -> tuple:
+        """
+            Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter).
+            Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
+        """
         query = db.session.query(cls.first_name, cls.last_name, cls.email, cls.mobile_number, cls.user_type,
-                                 Account.legal_name).join(Account, cls.account_uuid == Account.uuid).filter(
+                                 Account.legal_name, *cursor_columns(cls.created_at, cls.id)).join(
+            Account, cls.account_uuid == Account.uuid).filter(
             cls.user_type != UserType.SUPER_ADMIN.value)
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(
-                or_(cls.first_name.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    cls.last_name.ilike('%{}%'.format(q)),
-                    cls.email.ilike('%{}%'.format(q)),
-                    cls.mobile_number.ilike('%{}%'.format(q)),
-                    cls.user_type.ilike('%{}%'.format(q)),
-                    Account.legal_name
-                    )
-            )
-        query_count = query.count()
-
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
-
-        return query.all(), query_count
+            query = query.filter(search_filter(q, model_columns(cls, USER_SEARCH_COLUMNS), [Account.legal_name]))
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy)
 
     @classmethod
     def get_all_user_detail(cls) -> dict:
@@ -87,6 +76,16 @@ class User(Base):
         """Filter records by email."""
         return db.session.query(cls).filter(cls.email == email).first()
 
+    @classmethod
+    def get_principal_by_email(cls, email: str) -> Any:
+        """Return (user, account legal name, account display name, active subscription uuid) in one query."""
+        from app.models.subscription import Subscription
+        return db.session.query(cls, Account.legal_name, Account.display_name, Subscription.uuid).join(
+            Account, cls.account_uuid == Account.uuid).outerjoin(
+            Subscription, and_(Subscription.account_uuid == cls.account_uuid,
+                               Subscription.status == SubscriptionStatus.ACTIVE.value)).filter(
+            cls.email == email).first()
+
     @classmethod
     def is_user_with_account_id(cls, user_uuid: str, account_uuid: str) -> Any:
         """Check if the user exist with this account id."""
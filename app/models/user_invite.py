@@ -1,14 +1,15 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Union
 from app import db
 from app.helpers.constants import UserType
-from app.helpers.constants import SortingOrder
 from app.models.account import Account
+from app.helpers.pagination import paginate
+from app.helpers.search import USER_INVITE_SEARCH_COLUMNS
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
 from app.models.base import Base
 from app.models.user import User
 from sqlalchemy import ForeignKey
-from sqlalchemy import or_
-from sqlalchemy import asc, desc
 from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import backref
 
@@ -41,34 +42,20 @@ class UserInvite(Base):
 
     @classmethod
     def get_user_invite_list_by_account(cls, q: Any = None, sort: Any = None, page: Any = None, size: Any = None,
-                                        account_uuid: str = account_uuid) -> tuple:
+                                        account_uuid: str = account_uuid, cursor: Union[str, None] = None,
+                                        count_strategy: Union[str, None] = None) -> tuple:
         """
         Get all records belong to given account_uuid. Then
         Filters records based on search(q) and sorts them based on page, size, sort(sorting parameter).
+        Returns (rows, total_items, next_cursor, count strategy), see app.helpers.pagination.paginate.
         """
         query = db.session.query(cls).filter(cls.account_uuid == account_uuid)
 
-        if sort == SortingOrder.ASC.value:
-            query = query.order_by(asc(cls.created_at))
-        else:
-            query = query.order_by(desc(cls.created_at))
-
         if q:
-            query = query.filter(
-                or_(cls.first_name.ilike('%{}%'.format(q)),  # type: ignore  # noqa: FKA100
-                    cls.last_name.ilike('%{}%'.format(q)),
-                    cls.email.ilike('%{}%'.format(q)),
-                    cls.status.ilike('%{}%'.format(q)))
-            )
-
-        query_count = query.count()
-
-        if page and size:
-            offset = (int(page) - 1) * int(size)
-            query = query.limit(int(size))
-            query = query.offset(offset)
+            query = query.filter(search_filter(q, model_columns(cls, USER_INVITE_SEARCH_COLUMNS)))
 
-        return query.all(), query_count
+        return paginate(query=query, created_at_column=cls.created_at, id_column=cls.id, sort=sort, page=page,
+                        size=size, cursor=cursor, count_strategy=count_strategy, count_scope=account_uuid)
 
     @classmethod
     def get_invited_user_count_by_account(cls, account_uuid: str):
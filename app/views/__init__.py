@@ -1,14 +1,15 @@
 """Contain all the urls of apis"""
-from app import COGNITO_CLIENT  # noqa nosort
 from app import config_data  # noqa nosort
 from app import logger  # noqa nosort
 from app.helpers.constants import ErrorCode  # noqa nosort
 from app.helpers.constants import HttpStatusCode  # noqa nosort
 from app.helpers.constants import ResponseMessageKeys  # noqa nosort
 from app.helpers.constants import UserType  # noqa nosort
+from app.helpers.cognito_auth import get_email_by_access_token  # noqa nosort
+from app.helpers.pagination import InvalidCountStrategyError  # noqa nosort
+from app.helpers.pagination import InvalidCursorError  # noqa nosort
+from app.helpers.principal_cache import get_principal  # noqa nosort
 from app.helpers.utility import send_json_response  # noqa nosort
-from app.models.account import Account  # noqa nosort
-from app.models.subscription import Subscription  # noqa nosort
 from app.models.user import User  # noqa nosort
 from flask import Blueprint  # noqa nosort
 from flask import g  # noqa nosort
@@ -55,30 +56,22 @@ def before_blueprint():
 
             access_token = authorization_header.replace('Bearer ', '').strip()
             if access_token:
-                user_info = COGNITO_CLIENT.get_user(AccessToken=access_token)
+                user_email = get_email_by_access_token(access_token)
             else:
                 return send_json_response(http_status=401, response_status=False, message_key=ResponseMessageKeys.ACCESS_DENIED.value, data=None, error=None)
 
-            user_email = [data.get('Value') for data in user_info.get(
-                'UserAttributes') if data.get('Name') == 'email'][0]
-
-            user_object = User.get_by_email(user_email)
-            if user_object is None:
+            principal = get_principal(user_email)
+            if principal is None:
                 return send_json_response(http_status=HttpStatusCode.UNAUTHORIZED.value, response_status=False, message_key=ResponseMessageKeys.USER_DETAILS_NOT_FOUND.value, data=None, error=None)
+            user_object = principal['user']
 
             # Check if there are any active subscription for the user
-            existing_subscription = Subscription.get_active_subscription_by_account_uuid(
-                account_uuid=user_object.account_uuid)
-            user_data = User.serialize(user_object, single_object=True)
-
-            if not existing_subscription and user_object.user_type != UserType.SUPER_ADMIN.value:
+            if not principal['has_active_subscription'] and user_object.user_type != UserType.SUPER_ADMIN.value:
+                user_data = User.serialize(user_object, single_object=True)
                 return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True, message_key=ResponseMessageKeys.USER_DOES_NOT_HAVE_ACTIVE_PLAN.value, data=user_data, error=None, error_code=ErrorCode.SUBSCRIPTION_NOT_FOUND.value)
 
-            account_object = Account.get_by_uuid(user_object.account_uuid)
-            account_legal_name = account_object.legal_name
-            account_display_name = account_object.display_name
-
-            if account_legal_name == '' and account_display_name == '' and user_object.user_type != UserType.SUPER_ADMIN.value:
+            if not principal['is_account_setup'] and user_object.user_type != UserType.SUPER_ADMIN.value:
+                user_data = User.serialize(user_object, single_object=True)
                 return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True, message_key=ResponseMessageKeys.USER_ACCOUNT_NOT_SETUP.value, data=user_data, error=None, error_code=ErrorCode.ACCOUNT_NOT_SETUP.value)
 
             setattr(request, 'user', user_object)
@@ -103,6 +96,20 @@ def after_blueprint(response):
     return response
 
 
+@v1_blueprints.errorhandler(InvalidCursorError)
+def invalid_cursor_handler(error):
+    """Cursor of list API could not be decoded."""
+    return send_json_response(http_status=HttpStatusCode.BAD_REQUEST.value, response_status=False,
+                              message_key=ResponseMessageKeys.INVALID_CURSOR.value, data=None, error=None)
+
+
+@v1_blueprints.errorhandler(InvalidCountStrategyError)
+def invalid_count_strategy_handler(error):
+    """Count query param of list API is not a CountStrategy value."""
+    return send_json_response(http_status=HttpStatusCode.BAD_REQUEST.value, response_status=False,
+                              message_key=ResponseMessageKeys.INVALID_COUNT_STRATEGY.value, data=None, error=None)
+
+
 ##### Health Check URL #####
 v1_blueprints.add_url_rule(
     '/health-check', view_func=get_health_check, methods=['GET'])
@@ -200,6 +207,9 @@ v1_blueprints.add_url_rule(
 v1_blueprints.add_url_rule(
     '/contract/get-ai-generated-template', endpoint='get_ai_generated_template',
     view_func=ContractView.get_ai_generated_template, methods=['POST'])
+v1_blueprints.add_url_rule(
+    '/contract/get-ai-generated-template/<string:job_id>', endpoint='get_ai_generation_status',
+    view_func=ContractView.get_ai_generation_status, methods=['GET'])
 
 v1_blueprints.add_url_rule(
     '/contract/create-update', endpoint='contract_create_update', view_func=ContractView.create_update,
@@ -249,12 +259,18 @@ v1_blueprints.add_url_rule(
 v1_blueprints.add_url_rule(
     '/contract/download-as-pdf/<string:contract_uuid>', view_func=ContractView.download_as_pdf,
     methods=['GET'])
+v1_blueprints.add_url_rule(
+    '/contract/download-as-pdf/job/<string:job_id>', endpoint='contract_pdf_status',
+    view_func=ContractView.get_pdf_status, methods=['GET'])
 
 # Client APIs:
 v1_blueprints.add_url_rule(
     '/client/create-update', endpoint='client_create_update', view_func=ClientView.create_update, methods=['POST'])
 v1_blueprints.add_url_rule(
     '/client/bulk-upload', endpoint='client_bulk_upload', view_func=ClientView.bulk_upload, methods=['POST'])
+v1_blueprints.add_url_rule(
+    '/client/bulk-upload/<string:job_id>', endpoint='client_bulk_upload_status',
+    view_func=ClientView.get_bulk_upload_status, methods=['GET'])
 v1_blueprints.add_url_rule(
     '/client/list', endpoint='client_list', view_func=ClientView.list, methods=['GET'])
 v1_blueprints.add_url_rule(
@@ -266,6 +282,8 @@ v1_blueprints.add_url_rule(
     'admin/client/list', endpoint='client_admin_list', view_func=DashboardView.client_list, methods=['GET'])
 v1_blueprints.add_url_rule(
     'admin/get-dashboard-details', endpoint='client_dashboard_list', view_func=DashboardView.get_dashboard_details, methods=['GET'])
+v1_blueprints.add_url_rule(
+    'admin/cache-stats', endpoint='admin_cache_stats', view_func=DashboardView.get_cache_stats, methods=['GET'])
 
 # Signee APIs:
 v1_blueprints.add_url_rule(
@@ -3,6 +3,7 @@ from slugify import slugify
 
 from app.helpers.constants import HttpStatusCode, UserType, CurrencyCode
 from app.helpers.constants import ResponseMessageKeys
+from app.helpers.pagination import row_to_dict
 from app.helpers.utility import field_type_validator
 from app.helpers.utility import get_pagination_meta
 from app.helpers.utility import required_validator
@@ -45,10 +46,12 @@ class AccountView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
-        accounts_objs, objects_count = Account.get_account_list(
-            q=q, sort=sort, page=page, size=size)
-        accounts_list = [row._asdict() for row in accounts_objs]
+        accounts_objs, objects_count, next_cursor, count_strategy = Account.get_account_list(
+            q=q, sort=sort, page=page, size=size, cursor=cursor, count_strategy=count_strategy)
+        accounts_list = [row_to_dict(row) for row in accounts_objs]
 
         if download and str_to_bool(download):
             accounts_objs = Account.get_account_list(
@@ -82,7 +85,8 @@ class AccountView(BaseView):
 
         data = {'result': accounts_list,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                           page_size=int(size), total_items=objects_count)}
+                                                           page_size=int(size), total_items=objects_count,
+                                                           next_cursor=next_cursor, count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
@@ -240,7 +244,7 @@ class AccountView(BaseView):
             }
         }
 
-        EmailWorker.send(email_data)
+        EmailWorker.dispatch(email_data)
 
         user_objs = User.get_all_user_by_account_uuid(account_uuid)
         usernames = []
@@ -321,4 +325,4 @@ class AccountView(BaseView):
                 }
             }
 
-            EmailWorker.send(email_data)
+            EmailWorker.dispatch(email_data)
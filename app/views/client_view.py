@@ -1,12 +1,12 @@
 """Contains Client related API definitions."""
 import os
-from datetime import datetime
 
 from app import config_data
 from app.helpers.constants import EmailSubject, CurrencyCode
 from app.helpers.constants import EmailTypes
 from app.helpers.constants import HttpStatusCode
 from app.helpers.constants import ResponseMessageKeys
+from app.helpers.constants import SupportedCsvTypes
 from app.helpers.constants import SupportedExcelTypes
 from app.helpers.utility import field_type_validator
 from app.helpers.utility import get_pagination_meta
@@ -19,10 +19,10 @@ from app.models.user import User
 from app.views.base_view import BaseView
 from flask import request
 from magic import Magic
-import pandas as pd
 from slugify import slugify
+from workers.client_import_worker import ClientImportWorker
 from workers.email_worker import EmailWorker
-from workers.s3_worker import upload_file_and_get_object_details, get_presigned_url
+from workers.s3_worker import get_presigned_url
 
 
 class ClientView(BaseView):
@@ -95,7 +95,7 @@ class ClientView(BaseView):
                     'client_name': data.get('legal_name')
                 }
             }
-            EmailWorker.send(data)
+            EmailWorker.dispatch(data)
 
             data = {'client': Client.serialize(client)}
             return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
@@ -137,7 +137,7 @@ class ClientView(BaseView):
 
     @classmethod
     def bulk_upload(cls):
-        """Bulk insert clients from Excel file"""
+        """Start background import of clients from Excel or csv file, progress is fetched with get_bulk_upload_status"""
         user_obj = ClientView.get_logged_in_user(request=request)
         user_uuid = user_obj.uuid
         account_uuid = user_obj.account_uuid
@@ -156,87 +156,37 @@ class ClientView(BaseView):
         clients_data.save(temp_path)
         content_type = Magic(mime=True).from_file(temp_path)
 
-        if content_type not in SupportedExcelTypes.values():
+        is_csv = os.path.splitext(temp_path)[1].lower() == '.csv' and content_type in SupportedCsvTypes.values()
+        if content_type not in SupportedExcelTypes.values() and not is_csv:
             os.remove(temp_path)
             return send_json_response(http_status=HttpStatusCode.BAD_REQUEST.value, response_status=False,
                                       message_key=ResponseMessageKeys.INVALID_FILE_TYPE.value, data=None)
 
-        df = pd.read_excel(temp_path)
-        clients_data = df.to_dict(orient='records')
-
-        field_types = {'legal_name': str, 'display_name': str, 'email': str, 'phone': int, 'street_name': str,
-                       'postal_code': int, 'city': str, 'state': str, 'country': str}
-        required_fields = ['legal_name', 'display_name', 'email', 'phone', 'street_name', 'postal_code', 'city',
-                           'state', 'country']
-
-        error_data_list = []
-        for data in clients_data:
-            client_data = {
-                'legal_name': data.get('legal_name'),
-                'display_name': data.get('display_name'),
-                'email': data.get('email').lower(),
-                'phone': str(data.get('phone')),
-                'street_name': data.get('street_name'),
-                'postal_code': str(data.get('postal_code')),
-                'city': data.get('city'),
-                'state': data.get('state'),
-                'country': data.get('country')
-            }
-            post_data = field_type_validator(
-                request_data=data, field_types=field_types)
-            if post_data['is_error']:
-                client_data['error'] = post_data['data']
-                error_data_list.append(client_data)
-                continue
-
-            is_valid = required_validator(
-                request_data=data, required_fields=required_fields)
-            if is_valid['is_error']:
-                client_data['error'] = is_valid['data']
-                error_data_list.append(client_data)
-                continue
-
-            if not validate_email(data.get('email')):
-                client_data['error'] = ResponseMessageKeys.INVALID_EMAIL_FORMAT.value
-                error_data_list.append(client_data)
-                continue
-
-            legal_name_slug = slugify(data.get('legal_name'))
-            if Client.check_if_client_exits(account_uuid=account_uuid, legal_name_slug=legal_name_slug):
-                client_data['error'] = ResponseMessageKeys.CLIENT_ALREADY_EXISTS.value.format(
-                    data.get('legal_name'))
-                error_data_list.append(client_data)
-                continue
-
-            client_data['uuid'] = Client.create_uuid()
-            client_data['account_uuid'] = account_uuid
-            client_data['created_by'] = user_uuid
-            client_data['legal_name_slug'] = legal_name_slug
-            Client.add(client_data)
-
-        os.remove(temp_path)
-
-        if not error_data_list:
-            return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
-                                      message_key=ResponseMessageKeys.CLIENT_CREATED_SUCCESSFULLY.value,
-                                      data=None, error=None)
-
-        df = pd.DataFrame.from_dict(error_data_list)
-
-        time_stamp = str(int(datetime.now().timestamp()))
-        file_name = 'error_client_data_{}.xlsx'.format(time_stamp)
-        error_file_local_path = os.path.join(config_data['UPLOAD_FOLDER'], file_name)  # type: ignore  # noqa: FKA100
-        df.to_excel(error_file_local_path, index=False)
+        job_id = ClientImportWorker.create_job(account_uuid=account_uuid, user_uuid=user_uuid, temp_path=temp_path)
+        return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
+                                  message_key=ResponseMessageKeys.CLIENT_IMPORT_STARTED.value,
+                                  data={'job_id': job_id}, error=None)
 
-        s3_folder_path = f'media/{account_uuid}/{user_uuid}/'.lower()
-        s3_file_path = upload_file_and_get_object_details(file_path=error_file_local_path,
-                                                          file_name=file_name,
-                                                          s3_folder_path=s3_folder_path)
-        s3_bucket_link = get_presigned_url(path=s3_file_path)
+    @classmethod
+    def get_bulk_upload_status(cls, job_id: str):
+        """Return progress of client import job with link to the error file of rejected rows"""
+        user_obj = ClientView.get_logged_in_user(request=request)
+        job = ClientImportWorker.get_job(job_id=job_id, account_uuid=user_obj.account_uuid)
+        if job is None:
+            return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
+                                      message_key=ResponseMessageKeys.CLIENT_IMPORT_JOB_NOT_FOUND.value, data=None,
+                                      error=None)
 
-        return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
-                                  message_key=ResponseMessageKeys.FAILED.value,
-                                  data=None, error={'error_file': s3_bucket_link})
+        data = {
+            'job_id': job_id,
+            'status': job['status'],
+            'rows_total': job['rows_total'],
+            'rows_processed': job['rows_processed'],
+            'rows_failed': job['rows_failed'],
+            'error_file': get_presigned_url(path=job['error_file']) if job['error_file'] else None
+        }
+        return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
+                                  message_key=ResponseMessageKeys.SUCCESS.value, data=data, error=None)
 
     @classmethod
     def list(cls):
@@ -251,16 +201,20 @@ class ClientView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
-        client_objs, objects_count = Client.get_all_by_account_uuid(q=q, sort=sort, page=page, size=size,
-                                                                    account_uuid=account_uuid)
+        client_objs, objects_count, next_cursor, count_strategy = Client.get_all_by_account_uuid(
+            q=q, sort=sort, page=page, size=size, account_uuid=account_uuid, cursor=cursor,
+            count_strategy=count_strategy)
         client_list = Client.serialize(client_objs)
 
         data = {'result': client_list,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
                                                            page_size=objects_count if size is None else int(
                                                                size),
-                                                           total_items=objects_count)}
+                                                           total_items=objects_count, next_cursor=next_cursor,
+                                                           count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
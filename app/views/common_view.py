@@ -7,6 +7,8 @@ from app.helpers.constants import HttpStatusCode
 from app.helpers.constants import ResponseMessageKeys
 from app.helpers.decorators import api_time_logger
 from app.helpers.decorators import token_required
+from app.helpers.pagination import count_rows
+from app.helpers.pagination import get_next_cursor
 from app.helpers.utility import send_json_response
 from app.models.audit_log import AuditLog
 from app.models.user import User
@@ -29,6 +31,8 @@ def list_audit_log(logged_in_user: User) -> tuple:
     page = request.args.get(key='page', default=None)
     pagination = request.args.get(key='pagination', default=None)
     sort = request.args.get(key='sort', default=None)
+    cursor = request.args.get(key='cursor', default=None)
+    count_strategy = request.args.get(key='count', default=None)
     user_id = request.args.get(key='user_id', default=None)
     action = request.args.get(key='action', default=None)
     start_date = request.args.get(key='start_date', default=None)
@@ -88,18 +92,27 @@ def list_audit_log(logged_in_user: User) -> tuple:
                                           'end_date': 'Please enter valid end_date.'
                                       })
     audit_logs = AuditLog.get_logs(sort=sort, page=page, pagination=pagination, action=action,
-                                   user_id=user_ids, start_date=start_date, end_date=end_date)
+                                   user_id=user_ids, start_date=start_date, end_date=end_date, cursor=cursor)
 
-    current_page_count = audit_logs.count()
     audit_logs = audit_logs.all()
+    current_page_count = len(audit_logs)
     user_dict = User.get_all_user_detail()
     audit_log_list = AuditLog.serialize(audit_logs=audit_logs)
 
-    total_count = AuditLog.get_logs(
-        action=action, user_id=user_id, start_date=start_date, end_date=end_date).count()
+    if cursor is not None and pagination:
+        # cursor mode does not count the table, next_cursor is given while pages are full
+        total_count = None
+        count_strategy = None
+        next_cursor = get_next_cursor(audit_logs) if current_page_count == int(pagination) else None
+    else:
+        total_count, count_strategy = count_rows(
+            query=AuditLog.get_logs(action=action, user_id=user_id, start_date=start_date, end_date=end_date),
+            count_strategy=count_strategy, table=AuditLog.__tablename__)
+        next_cursor = None
     data = {'result': audit_log_list, 'objects': {'user': user_dict}, 'current_page_count': current_page_count,
             'current_page': 1 if page is None else int(page),
-            'next_page': '' if page is None else int(page) + 1, 'total_count': total_count} if current_page_count > 0 else None
+            'next_page': '' if page is None else int(page) + 1, 'total_count': total_count,
+            'next_cursor': next_cursor, 'count_strategy': count_strategy} if current_page_count > 0 else None
 
     return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True, message_key=ResponseMessageKeys.SUCCESS.value, data=data, error=None)
 
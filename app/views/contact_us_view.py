@@ -88,7 +88,7 @@ class ContactUsView(BaseView):
                 }
             }
 
-            EmailWorker.send(email_data)
+            EmailWorker.dispatch(email_data)
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.MESSAGE_RECEIVED_SUCCESSFULLY.value, data=None,
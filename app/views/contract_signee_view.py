@@ -19,6 +19,7 @@ from app.models.signee import Signee
 from workers.email_worker import EmailWorker
 from app.helpers.constants import EmailSubject
 from app.helpers.constants import EmailTypes
+from app.helpers.email_template_cache import render_email_body
 from app.helpers.utility import generate_email_token
 from app import config_data, logger
 from workers.s3_worker import upload_file_and_get_object_details, get_presigned_url
@@ -179,8 +180,8 @@ class ContractSigneeView(BaseView):
         email_template_body = email_template_obj.email_body
         email_template_subject = email_template_obj.email_subject
 
-        email_template_body = email_template_body.format(
-            name=signee_obj.full_name)
+        email_template_body = render_email_body(
+            email_template_body, name=signee_obj.full_name)
 
         email_data = {
             'email_to': signee_obj.email,
@@ -191,7 +192,7 @@ class ContractSigneeView(BaseView):
                 'email_body': email_template_body
             }
         }
-        EmailWorker.send(email_data)
+        EmailWorker.dispatch(email_data)
 
         client_uuid = contract_obj.client_uuid
         client_obj = Client.get_by_uuid(uuid=client_uuid)
@@ -211,8 +212,8 @@ class ContractSigneeView(BaseView):
                     account_uuid=contract_obj.account_uuid, email_type=EmailTypes.SEND_CONTRACT_TO_SIGNEE.value)
                 email_template_subject = email_template_obj.email_subject
                 email_template_body = email_template_obj.email_body
-                email_template_body = email_template_body.format(
-                    signee_name=next_signee_obj.signee_full_name, contract_link=contract_link, contact_information=account_owner.email)
+                email_template_body = render_email_body(
+                    email_template_body, signee_name=next_signee_obj.signee_full_name, contract_link=contract_link, contact_information=account_owner.email)
                 email_data = {
                     'email_to': next_signee_obj.signee_email,
                     'subject': email_template_subject,
@@ -222,7 +223,7 @@ class ContractSigneeView(BaseView):
                         'email_body': email_template_body
                     }
                 }
-                EmailWorker.send(email_data)
+                EmailWorker.dispatch(email_data)
                 next_signee_obj.status = ContractMailStatus.PENDING.value
                 ContractSignee.update()
 
@@ -240,6 +241,7 @@ class ContractSigneeView(BaseView):
 
             contract_link = config_data.get(
                 'APP_URL') + '/contract/view/' + contract_obj.uuid
+            email_data_list = []
             for recipient in recipients_list:
                 email_data = {
                     'email_to': recipient.get('email'),
@@ -251,7 +253,8 @@ class ContractSigneeView(BaseView):
                         'contract_link': contract_link
                     }
                 }
-                EmailWorker.send(data=email_data)
+                email_data_list.append(email_data)
+            EmailWorker.dispatch_many(email_data_list)
 
             contract_obj.status = ContractStatus.SIGNED.value
             Contract.update()
@@ -1,11 +1,11 @@
-import os
-import threading
+import json
+import time
 
-import httpx
 from flask import request
-from openai import OpenAI, RateLimitError, APITimeoutError, InternalServerError
-from app.helpers.constants import ContractStatus, ContractMailStatus, ValidationMessages, DEFAULT_SECTION_DICT, \
-    DEFAULT_SECTIONS
+from flask import Response
+from flask import stream_with_context
+from app.helpers.constants import ContractStatus, ContractMailStatus, ValidationMessages
+from app.helpers.constants import ContractPdfStatus
 from app.helpers.constants import HttpStatusCode
 from app.helpers.constants import ResponseMessageKeys
 from app.helpers.constants import UserType
@@ -21,25 +21,40 @@ from app.models.contract_signee import ContractSignee
 from app.views.base_view import BaseView
 from app.models.account import Account
 from app.models.signee import Signee
+from workers.contract_ai_worker import ContractAIWorker
 from workers.email_worker import EmailWorker
 from app.helpers.constants import EmailTypes
+from app.helpers.email_template_cache import render_email_body
 from app.helpers.utility import generate_email_token
+from app.helpers.utility import generate_email_tokens
+from app import app
 from app import config_data
 from app import logger
+from app import r
 import jwt
 from app.models.folder import Folder
 from typing import Union
 from app.models.email_template import EmailTemplate
 from datetime import datetime
-import pdfkit
 
-from workers.s3_worker import upload_file_and_get_object_details, get_presigned_url
+from providers import openai_client
+from workers.contract_pdf_worker import ContractPdfWorker
+from workers.s3_worker import get_presigned_url
 
+REMINDER_CHECKPOINT_KEY = 'reminder:checkpoint:{}'  # last processed contract signee id of the day's run
+REMINDER_CHECKPOINT_TTL = 2 * 24 * 60 * 60  # seconds
+DEFAULT_REMINDER_CHUNK_SIZE = 1000
+
+
+def get_reminder_config() -> dict:
+    """Return REMINDER settings from config.yml."""
+    reminder_config = config_data.get('REMINDER') or {}
+    return {
+        'CHUNK_SIZE': int(reminder_config.get('CHUNK_SIZE', DEFAULT_REMINDER_CHUNK_SIZE)),
+    }
 
-class ContractView(BaseView):
-    sections = []
-    sections_dict = {}
 
+class ContractView(BaseView):
     @classmethod
     def create_update(cls):
         """Create & Update Contract"""
@@ -225,23 +240,28 @@ class ContractView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
         user_obj = cls.get_logged_in_user(request=request)
         account_uuid = user_obj.account_uuid
 
         if folder_uuid:
-            contract_objs, objects_count = Contract.get_contracts_list(account_uuid=account_uuid, folder_uuid=folder_uuid,
-                                                                       q=q, sort=sort, page=page, size=size)
+            contract_objs, objects_count, next_cursor, count_strategy = Contract.get_contracts_list(
+                account_uuid=account_uuid, folder_uuid=folder_uuid, q=q, sort=sort, page=page, size=size,
+                cursor=cursor, count_strategy=count_strategy)
 
         else:
-            contract_objs, objects_count = Contract.get_contracts_list(
-                account_uuid=account_uuid, q=q, sort=sort, page=page, size=size)
+            contract_objs, objects_count, next_cursor, count_strategy = Contract.get_contracts_list(
+                account_uuid=account_uuid, q=q, sort=sort, page=page, size=size, cursor=cursor,
+                count_strategy=count_strategy)
 
-        contract_list = Contract.serialize(contract_objs)
+        contract_list = Contract.serialize(contract_objs, summary=True)
 
         data = {'result': contract_list,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                           page_size=int(size), total_items=objects_count)}
+                                                           page_size=int(size), total_items=objects_count,
+                                                           next_cursor=next_cursor, count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
@@ -274,35 +294,54 @@ class ContractView(BaseView):
 
     @classmethod
     def download_as_pdf(cls, contract_uuid: str):
+        """
+        Return link of contract pdf. Pdf of unchanged signed content is returned at once, otherwise rendering is
+        queued and the link is fetched with get_pdf_status.
+        """
+        user_obj = ContractView.get_logged_in_user(request=request)
         contract_obj = Contract.get_by_uuid(contract_uuid)
         if contract_obj is None:
             return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
                                       message_key=ResponseMessageKeys.CONTRACT_NOT_FOUND.value, data=None,
                                       error=None)
-        account_uuid = contract_obj.account_uuid
-        contract_signed_content = contract_obj.signed_content
 
-        file_name = 'contract_{}.pdf'.format(contract_uuid)
-        pdf_local_path = os.path.join(config_data['UPLOAD_FOLDER'], file_name)  # type: ignore  # noqa: FKA100
+        content_hash = ContractPdfWorker.get_content_hash(contract_obj.signed_content)
+        s3_path = ContractPdfWorker.get_cached_pdf(contract_uuid=contract_uuid, content_hash=content_hash)
+        if s3_path is not None:
+            return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
+                                      message_key=ResponseMessageKeys.DOWNLOAD_AS_PDF_SUCCESSFUL.value,
+                                      data={'status': ContractPdfStatus.COMPLETED.value,
+                                            'pdf_file': get_presigned_url(path=s3_path)}, error=None)
 
-        try:
-            pdfkit.from_string(contract_signed_content, pdf_local_path)  # type: ignore  # noqa: FKA100
-            s3_folder_path = f'media/{account_uuid}/contracts/'.lower()
-            s3_file_path = upload_file_and_get_object_details(file_path=pdf_local_path,
-                                                              file_name=file_name,
-                                                              s3_folder_path=s3_folder_path)
+        job_id = ContractPdfWorker.create_job(account_uuid=user_obj.account_uuid, contract_uuid=contract_uuid,
+                                              content_hash=content_hash)
+        return cls.get_pdf_status(job_id=job_id)
 
-            s3_bucket_link = get_presigned_url(path=s3_file_path)
-        except Exception as e:
-            logger.error(e)
-            os.remove(pdf_local_path)
+    @classmethod
+    def get_pdf_status(cls, job_id: str):
+        """Return status of contract pdf job with the pdf link once it is completed"""
+        user_obj = ContractView.get_logged_in_user(request=request)
+        job = ContractPdfWorker.get_job(job_id=job_id, account_uuid=user_obj.account_uuid)
+        if job is None:
             return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
-                                      message_key=ResponseMessageKeys.FAILED.value, data=None,
+                                      message_key=ResponseMessageKeys.CONTRACT_PDF_JOB_NOT_FOUND.value, data=None,
                                       error=None)
 
+        if job['status'] == ContractPdfStatus.FAILED.value:
+            return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
+                                      message_key=ResponseMessageKeys.FAILED.value,
+                                      data={'job_id': job_id, 'status': job['status'], 'pdf_file': None}, error=None)
+
+        completed = job['status'] == ContractPdfStatus.COMPLETED.value
+        data = {
+            'job_id': job_id,
+            'status': job['status'],
+            'pdf_file': get_presigned_url(path=job['s3_path']) if completed else None
+        }
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
-                                  message_key=ResponseMessageKeys.DOWNLOAD_AS_PDF_SUCCESSFUL.value,
-                                  data={'pdf_file': s3_bucket_link}, error=None)
+                                  message_key=(ResponseMessageKeys.DOWNLOAD_AS_PDF_SUCCESSFUL.value if completed
+                                               else ResponseMessageKeys.CONTRACT_PDF_GENERATION_STARTED.value),
+                                  data=data, error=None)
 
     @classmethod
     def send(cls):
@@ -386,6 +425,7 @@ class ContractView(BaseView):
                 ContractSignee.update()
 
         app_url = config_data.get('APP_URL')
+        email_data_list = []
         for recipient in recipients_list:
             recipient_uuid = recipient.get('uuid')
             recipient_full_name = recipient.get('full_name')
@@ -394,9 +434,8 @@ class ContractView(BaseView):
             contract_token = generate_email_token(recipient_uuid)
             contract_link = app_url + '/contract/sign-contract?token=' + contract_token
 
-            email_template_body = email_template_obj.email_body
-            email_template_body = email_template_body.format(
-                signee_name=recipient_full_name, contract_link=contract_link,
+            email_template_body = render_email_body(
+                email_template_obj.email_body, signee_name=recipient_full_name, contract_link=contract_link,
                 contact_information=account_owner.email)
 
             email_data = {
@@ -408,8 +447,9 @@ class ContractView(BaseView):
                     'email_body': email_template_body
                 }
             }
+            email_data_list.append(email_data)
 
-            EmailWorker.send(email_data)
+        EmailWorker.dispatch_many(email_data_list)
 
         if recipients_list:
             contract_obj.status = ContractStatus.SENT_FOR_SIGNING.value
@@ -491,6 +531,7 @@ class ContractView(BaseView):
                 }
                 recipients_list.append(temp)
 
+        email_data_list = []
         for recipient in recipients_list:
             email = recipient.get('email')
             full_name = recipient.get('full_name')
@@ -500,11 +541,12 @@ class ContractView(BaseView):
                 'template': 'emails/contract_cancelled.html',
                 'email_type': EmailTypes.CONTRACT_CANCELLED.value,
                 'email_data': {
-                    'email_body': email_template_body.format(name=full_name)
+                    'email_body': render_email_body(email_template_body, name=full_name)
                 }
             }
+            email_data_list.append(email_data)
 
-            EmailWorker.send(email_data)
+        EmailWorker.dispatch_many(email_data_list)
 
         contract_log_data = {
             'uuid': ContractLog.create_uuid(),
@@ -517,48 +559,15 @@ class ContractView(BaseView):
                                   message_key=ResponseMessageKeys.CONTRACT_IS_CANCELLED.value, data=None,
                                   error=None)
 
-    @classmethod
-    def get_ai_response(cls, client, prompt, section):
-        """Get Contract section using Open AI API call"""
-        try:
-            response = client.chat.completions.create(
-                messages=[
-                    {'role': 'system', 'content': 'You are a legal advisor.'},
-                    {'role': 'user', 'content': prompt.format(section)}
-                ],
-                model=config_data.get('GPT_MODEL_4'),
-            )
-            section_details = response.choices[0].message.content.strip()
-            cls.sections_dict[section] = section_details.replace('\n', '<br>')
-
-        except RateLimitError as rate_err:
-            logger.error('rate_err : {}'.format(rate_err))
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-
-        except APITimeoutError as timeout_err:
-            logger.error('timeout_err : {}'.format(timeout_err))
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-
-        except InternalServerError as internal_err:
-            logger.error('internal_err : {}'.format(internal_err))
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-
-        except Exception as e:
-            logger.error(e)
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-
     @classmethod
     def get_ai_generated_template(cls):   # type: ignore  # noqa: C901
-        """Return AI generated Sample contract template in html"""
+        """Start AI generation of Sample contract template, sections are fetched with get_ai_generation_status"""
+        user_obj = ContractView.get_logged_in_user(request=request)
         data = request.get_json(force=True)
 
         field_types = {'contract_uuid': str, 'purpose': str, 'client_uuid': str, 'signees': list, 'brief': str,
                        'service_name': str, 'duration': int, 'duration_type': str, 'currency_code': str,
-                       'amount': float, 'payment_frequency': str}
+                       'amount': float, 'payment_frequency': str, 'force_refresh': bool}
         required_fields = ['purpose', 'client_uuid', 'signees',
                            'brief']
 
@@ -577,109 +586,76 @@ class ContractView(BaseView):
                                       error=is_valid['data'])
 
         purpose = data.get('purpose')
+        brief = data.get('brief')
 
-        client = OpenAI(
-            api_key=config_data.get('OPEN_AI_KEY'),
-            timeout=httpx.Timeout(
-                600.0, read=300.0, write=300.0, connect=300.0),
-        )
+        client_uuid = data.get('client_uuid')
+        client_obj = Client.get_by_uuid(uuid=client_uuid)
+        if client_obj is None:
+            return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
+                                      message_key=ResponseMessageKeys.CLIENT_NOT_FOUND.value, data=None,
+                                      error=None)
+        client_country = client_obj.country
+        client_legal_name = client_obj.legal_name
 
-        do_generation_process = True
-        try:
-            response = client.chat.completions.create(
-                messages=[
-                    {'role': 'system', 'content': 'You are a legal advisor.'},
-                    {'role': 'user', 'content': f'Give me MUST 7 Section Headings of {purpose} except signature section in a comma separated format. Your language must be British English.'}
-                ],
-                model=config_data.get('GPT_MODEL_4'),
-            )
-            section_string = response.choices[0].message.content.strip()
-            sections = section_string.split(',')
-            cls.sections = [section.strip() for section in sections]
-
-        except RateLimitError as rate_err:
-            logger.error('rate_err : {}'.format(rate_err))
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-            do_generation_process = False
-
-        except APITimeoutError as timeout_err:
-            logger.error('timeout_err : {}'.format(timeout_err))
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-            do_generation_process = False
-
-        except InternalServerError as internal_err:
-            logger.error('internal_err : {}'.format(internal_err))
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-            do_generation_process = False
+        duration = data.get('duration')
+        duration_type = data.get('duration_type')
+        if any([duration, duration_type]) and not all([duration, duration_type]):
+            duration = None
+            duration_type = None
 
-        except Exception as e:
-            logger.error(e)
-            cls.sections = DEFAULT_SECTIONS
-            cls.sections_dict = DEFAULT_SECTION_DICT
-            do_generation_process = False
-
-        if do_generation_process:
-            brief = data.get('brief')
-
-            client_uuid = data.get('client_uuid')
-            client_obj = Client.get_by_uuid(uuid=client_uuid)
-            client_country = client_obj.country
-            client_legal_name = client_obj.legal_name
-
-            duration = data.get('duration')
-            duration_type = data.get('duration_type')
-            if any([duration, duration_type]) and not all([duration, duration_type]):
-                duration = None
-                duration_type = None
-
-            amount = data.get('amount')
-            currency_code = data.get('currency_code')
-            payment_frequency = data.get('payment_frequency')
-            if any([amount, currency_code, payment_frequency]) and not all([amount, currency_code, payment_frequency]):
-                amount = None
-                currency_code = None
-                payment_frequency = None
-
-            duration_text = ''
-            amount_text = ''
-            country_text = ''
-            if duration:
-                duration_text = f'Duration: {duration} {duration_type}(s). '
-            if amount:
-                amount_text = f'Amount: {amount} {currency_code} {payment_frequency}.'
-            if client_country:
-                country_text = f' according to jurisdiction of {client_country} '
-
-            prompt = ('Give me {} section of ' + purpose + country_text + 'without Section Heading. Your language must be British English.'
-                      + '\n Client is ' + client_legal_name
-                      + '\n Brief is ' + brief + '. ' + duration_text + ' ' + amount_text
-                      + '\n Output should be in text format without special characters.')
-            try:
-                threads = []
-
-                for section in cls.sections:
-                    thread = threading.Thread(
-                        target=cls.get_ai_response, args=(client, prompt, section))
-                    threads.append(thread)
-                    thread.start()
-
-                for thread in threads:
-                    thread.join()
-
-            except Exception as e:
-                cls.sections = DEFAULT_SECTIONS
-                cls.sections_dict = DEFAULT_SECTION_DICT
-                logger.error(e)
+        amount = data.get('amount')
+        currency_code = data.get('currency_code')
+        payment_frequency = data.get('payment_frequency')
+        if any([amount, currency_code, payment_frequency]) and not all([amount, currency_code, payment_frequency]):
+            amount = None
+            currency_code = None
+            payment_frequency = None
 
+        duration_text = ''
+        amount_text = ''
+        country_text = ''
+        if duration:
+            duration_text = f'Duration: {duration} {duration_type}(s). '
+        if amount:
+            amount_text = f'Amount: {amount} {currency_code} {payment_frequency}.'
+        if client_country:
+            country_text = f' according to jurisdiction of {client_country} '
+
+        prompt = ('Give me {} section of ' + purpose + country_text + 'without Section Heading. Your language must be British English.'
+                  + '\n Client is ' + client_legal_name
+                  + '\n Brief is ' + brief + '. ' + duration_text + ' ' + amount_text
+                  + '\n Output should be in text format without special characters.')
+
+        job_id = ContractAIWorker.create_job(account_uuid=user_obj.account_uuid, contract_data=data, purpose=purpose,
+                                             prompt=prompt, force_refresh=data.get('force_refresh', False))
+        if job_id is None:
+            return send_json_response(http_status=HttpStatusCode.TOO_MANY_REQUESTS.value, response_status=False,
+                                      message_key=ResponseMessageKeys.AI_GENERATION_LIMIT_REACHED.value, data=None,
+                                      error=None)
+
+        return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
+                                  message_key=ResponseMessageKeys.AI_GENERATION_STARTED.value,
+                                  data={'job_id': job_id}, error=None)
+
+    @classmethod
+    def get_ai_generation_status(cls, job_id: str):
+        """Return status of AI generation job with the sections generated so far"""
+        user_obj = ContractView.get_logged_in_user(request=request)
+        job = ContractAIWorker.get_job(job_id=job_id, account_uuid=user_obj.account_uuid)
+        if job is None:
+            return send_json_response(http_status=HttpStatusCode.OK.value, response_status=False,
+                                      message_key=ResponseMessageKeys.AI_GENERATION_JOB_NOT_FOUND.value, data=None,
+                                      error=None)
+
+        contract_data = job['contract_data']
         data = {
-            'contract_data': data,
-            'content': cls.sections_dict,
-            'sections': cls.sections,
-            'contract_currency_code': data.get('currency_code'),
-            'updated_amount': data.get('amount')
+            'job_id': job_id,
+            'status': job['status'],
+            'contract_data': contract_data,
+            'content': job['content'],
+            'sections': job['sections'],
+            'contract_currency_code': contract_data.get('currency_code'),
+            'updated_amount': contract_data.get('amount')
         }
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
@@ -790,11 +766,22 @@ class ContractView(BaseView):
                                       message_key=ResponseMessageKeys.INVALID_TOKEN.value, data=None,
                                       error=None)
 
+    @classmethod
+    def get_ai_popup_messages(cls, question: str) -> list:
+        """Prompt messages for AI popup"""
+        return [
+            {
+                'role': 'user',
+                'content': question,
+            }
+        ]
+
     @classmethod
     def get_ai_popup_response(cls):
-        """Return AI Popup Response"""
+        """Return AI Popup Response. With `stream` set, answer is streamed as Server-Sent Events."""
+        request_started_at = time.perf_counter()
         data = request.get_json(force=True)
-        field_types = {'query': str}
+        field_types = {'query': str, 'stream': bool}
         required_fields = ['query']
 
         post_data = field_type_validator(
@@ -812,19 +799,15 @@ class ContractView(BaseView):
                                       error=is_valid['data'])
 
         question = data.get('query')
+        if data.get('stream'):
+            return Response(stream_with_context(cls.stream_ai_popup_response(question=question,
+                                                                            started_at=request_started_at)),
+                            mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
         try:
-            client = OpenAI(
-                api_key=config_data.get('OPEN_AI_KEY'),
-                timeout=httpx.Timeout(
-                    600.0, read=300.0, write=300.0, connect=300.0),
-            )
-            completion = client.chat.completions.create(
-                messages=[
-                    {
-                        'role': 'user',
-                        'content': question,
-                    }
-                ],
+            completion = openai_client.get_openai_client().chat.completions.create(
+                messages=cls.get_ai_popup_messages(question=question),
                 model=config_data.get('GPT_MODEL_3_TURBO'),
                 temperature=0.2
             )
@@ -832,6 +815,7 @@ class ContractView(BaseView):
         except Exception as e:
             logger.error(e)
             response_data = 'Oops something went.'
+        logger.info('AI popup response in {:.0f}ms'.format((time.perf_counter() - request_started_at) * 1000))
 
         data = {
             'answer': response_data
@@ -843,58 +827,120 @@ class ContractView(BaseView):
                                   error=None)
 
     @classmethod
-    def send_reminder_to_signees(cls):
-        """Send reminder mail to signees who haven't signed the contract"""
-        logger.info('Started send_reminder_to_signees')
-        contracts = Contract.get_uuid_by_status(
-            status=ContractStatus.SENT_FOR_SIGNING.value)
-        contract_uuids = [data[0] for data in contracts]
-        contract_signees = ContractSignee.get_email_by_contact_uuids_and_status(status=ContractMailStatus.PENDING.value,
-                                                                                contract_uuids=contract_uuids)
-        signee_data = []
-        for data in contract_signees:
-            signee_details = {
-                'uuid': data[0],
-                'signee_email': data[1],
-                'signee_full_name': data[2],
-                'account_uuid': data[3],
-                'contract_uuid': data[4]
-            }
-
-            signee_data.append(signee_details)
-
-        for signee in signee_data:
-            contract_token = generate_email_token(signee['uuid'])
-            contract_link = config_data.get(
-                'APP_URL') + '/contract/sign-contract?token=' + contract_token
-
-            email_template_obj = EmailTemplate.get_email_template_by_email_type(
-                account_uuid=signee['account_uuid'], email_type=EmailTypes.SEND_REMINDER_TO_SIGNEE.value)
-
-            email_template_body = email_template_obj.email_body
-            email_template_subject = email_template_obj.email_subject
-            email_template_body = email_template_body.format(
-                name=signee['signee_full_name'], contract_link=contract_link)
+    def stream_ai_popup_response(cls, question: str, started_at: float):
+        """
+            Yield AI popup answer as Server-Sent Events while OpenAI streams it:
+                data: {"delta": "..."}                                       for every token chunk
+                event: done / data: {"answer": ..., "ttfb_ms": ..., "total_ms": ...}  once completed
+                event: error / data: {"answer": "Oops something went."}     if OpenAI call fails
+            ttfb_ms is time from the request start to the first token sent to the client.
+        """
+        answer = []
+        ttfb_ms = None
+        try:
+            stream = openai_client.get_openai_client().chat.completions.create(
+                messages=cls.get_ai_popup_messages(question=question),
+                model=config_data.get('GPT_MODEL_3_TURBO'),
+                temperature=0.2,
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if ttfb_ms is None:
+                    ttfb_ms = round((time.perf_counter() - started_at) * 1000, 2)
+                answer.append(delta)
+                yield 'data: {}\n\n'.format(json.dumps({'delta': delta}))
+        except Exception as e:
+            logger.error(e)
+            yield 'event: error\ndata: {}\n\n'.format(json.dumps({'answer': 'Oops something went.'}))
+            return
 
-            email_data = {
-                'email_to': signee['signee_email'],
-                'subject': email_template_subject,
-                'template': 'emails/signature_reminder_email.html',
-                'email_type': EmailTypes.SEND_REMINDER_TO_SIGNEE.value,
-                'email_data': {
-                    'email_body': email_template_body
-                }
-            }
+        total_ms = round((time.perf_counter() - started_at) * 1000, 2)
+        logger.info('AI popup streamed response, time to first byte {}ms, total {}ms'.format(ttfb_ms, total_ms))
+        yield 'event: done\ndata: {}\n\n'.format(json.dumps({'answer': ''.join(answer).strip(), 'ttfb_ms': ttfb_ms,
+                                                               'total_ms': total_ms}))
 
-            EmailWorker.send(email_data)
-            current_date = datetime.now().strftime('%Y-%m-%d')
-            logger.info('contract_uuid')
-            logger.info(signee['contract_uuid'])
-            contract_log_data = {
-                'uuid': ContractLog.create_uuid(),
-                'account_uuid': signee['account_uuid'],
-                'contract_uuid': signee['contract_uuid'],
-                'description': 'Reminder email sent to {} on {}.'.format(signee['signee_full_name'], current_date)
-            }
+    @classmethod
+    def send_reminder_to_signees(cls):
+        """
+            Send reminder mail to signees who haven't signed the contract.
+            Signees are processed in chunks of REMINDER.CHUNK_SIZE ordered by id; after every chunk the last id is
+            stored in redis, so that a run which crashed resumes after the last completed chunk on the same day.
+        """
+        logger.info('Started send_reminder_to_signees')
+        if config_data.get('TESTING'):
+            return cls.send_reminder_chunks()
+        with app.app_context():
+            return cls.send_reminder_chunks()
 
-            ContractLog.add(contract_log_data)
+    @classmethod
+    def send_reminder_chunks(cls) -> int:
+        """Send reminders chunk by chunk starting after today's checkpoint, returns number of reminders sent."""
+        reminder_config = get_reminder_config()
+        # one clock for checkpoint key and log descriptions, so that both name the same day
+        current_date = datetime.now().strftime('%Y-%m-%d')
+        checkpoint_key = REMINDER_CHECKPOINT_KEY.format(current_date)
+        last_id = int(r.get(checkpoint_key) or 0)
+        if last_id:
+            logger.info('send_reminder_to_signees resuming after contract signee id {}'.format(last_id))
+
+        templates = {}
+        sent_count = 0
+        while True:
+            signees = ContractSignee.get_reminder_batch(contract_status=ContractStatus.SENT_FOR_SIGNING.value,
+                                                        status=ContractMailStatus.PENDING.value, after_id=last_id,
+                                                        limit=reminder_config['CHUNK_SIZE'])
+            if not signees:
+                break
+
+            missing_account_uuids = list({signee.account_uuid for signee in signees} - templates.keys())
+            if missing_account_uuids:
+                account_templates = EmailTemplate.get_email_templates_by_account_uuids(
+                    account_uuids=missing_account_uuids, email_type=EmailTypes.SEND_REMINDER_TO_SIGNEE.value)
+                for account_uuid in missing_account_uuids:
+                    templates[account_uuid] = account_templates.get(account_uuid)
+
+            contract_tokens = generate_email_tokens([signee.uuid for signee in signees])
+            email_data_list = []
+            contract_log_list = []
+            for signee, contract_token in zip(signees, contract_tokens):
+                email_template_obj = templates[signee.account_uuid]
+                if email_template_obj is None:
+                    logger.error('send_reminder_to_signees: no reminder template for account {}'.format(
+                        signee.account_uuid))
+                    continue
+                contract_link = config_data.get(
+                    'APP_URL') + '/contract/sign-contract?token=' + contract_token
+                email_data_list.append({
+                    'email_to': signee.signee_email,
+                    'subject': email_template_obj.email_subject,
+                    'template': 'emails/signature_reminder_email.html',
+                    'email_type': EmailTypes.SEND_REMINDER_TO_SIGNEE.value,
+                    'email_data': {
+                        'email_body': render_email_body(email_template_obj.email_body, name=signee.signee_full_name,
+                                                        contract_link=contract_link)
+                    }
+                })
+                contract_log_list.append({
+                    'uuid': ContractLog.create_uuid(),
+                    'account_uuid': signee.account_uuid,
+                    'contract_uuid': signee.contract_uuid,
+                    'description': 'Reminder email sent to {} on {}.'.format(signee.signee_full_name, current_date)
+                })
+
+            # mails are queued before the chunk is recorded: a crash in between sends a reminder twice on retry
+            # instead of logging reminders which were never sent and skipping them
+            EmailWorker.dispatch_many(email_data_list)
+            sent_count += len(email_data_list)
+
+            last_id = signees[-1].id
+            if contract_log_list:
+                ContractLog.bulk_insert(contract_log_list)
+            r.set(checkpoint_key, last_id, ex=REMINDER_CHECKPOINT_TTL)
+
+        logger.info('Finished send_reminder_to_signees, {} reminders sent'.format(sent_count))
+        return sent_count
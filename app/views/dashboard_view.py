@@ -1,8 +1,10 @@
 """Contains Client related API definitions."""
 
+from app.helpers.ai_cache import get_ai_cache_stats
 from app.helpers.constants import HttpStatusCode
 from app.helpers.constants import ResponseMessageKeys
 from app.helpers.constants import UserType
+from app.helpers.email_template_cache import get_email_template_cache_stats
 from app.helpers.utility import get_pagination_meta
 from app.helpers.utility import send_json_response
 from app.views.base_view import BaseView
@@ -104,3 +106,23 @@ class DashboardView(BaseView):
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
                                   error=None)
+
+    @classmethod
+    def get_cache_stats(cls):
+        """
+        Get hit/miss counters and hit ratio of the AI completion and email template caches.
+        """
+        user_obj = DashboardView.get_logged_in_user(request=request)
+
+        if user_obj.user_type != UserType.SUPER_ADMIN.value:
+            return send_json_response(http_status=HttpStatusCode.UNAUTHORIZED.value, response_status=False,
+                                      message_key=ResponseMessageKeys.NOT_ALLOWED.value, data=None,
+                                      error=None)
+
+        data = {
+            'ai_cache': get_ai_cache_stats(),
+            'email_template_cache': get_email_template_cache_stats(),
+        }
+        return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
+                                  message_key=ResponseMessageKeys.SUCCESS.value, data=data,
+                                  error=None)
@@ -8,6 +8,7 @@ from app.helpers.constants import ResponseMessageKeys
 from app.helpers.utility import required_validator, field_type_validator, get_pagination_meta
 from app.helpers.utility import send_json_response
 from app.helpers.constants import EmailTypes
+from app.helpers.email_template_cache import invalidate_email_template
 from app import logger
 
 
@@ -106,6 +107,7 @@ class EmailTemplateView(BaseView):
         email_template_obj.email_subject = data.get('email_subject')
 
         EmailTemplate.update()
+        invalidate_email_template(account_uuid=email_template_obj.account_uuid, email_type=email_template_type)
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.RECORD_UPDATED_SUCCESSFULLY.value, error=None,
@@ -97,17 +97,20 @@ class FolderView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
         user_obj = FolderView.get_logged_in_user(request=request)
 
-        folder_objs, objects_count = Folder.get_folder_list(
-            account_uuid=user_obj.account_uuid, page=page, q=q, size=size, sort=sort)
+        folder_objs, objects_count, next_cursor, count_strategy = Folder.get_folder_list(
+            account_uuid=user_obj.account_uuid, page=page, q=q, size=size, sort=sort, cursor=cursor,
+            count_strategy=count_strategy)
         folder_list = Folder.serialize(folder_objs)
         data = {'result': folder_list,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
                                                            page_size=objects_count if size is None else int(
                     size),
-                    total_items=objects_count)}
+                    total_items=objects_count, next_cursor=next_cursor, count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
@@ -386,7 +386,7 @@ class SubscriptionView(BaseView):
                         }
                     }
 
-                EmailWorker.send(email_data)
+                EmailWorker.dispatch(email_data)
                 logger.info('Subscription Email Sent successfully')
 
                 # Creating a new entry in payment table for each subscription
@@ -448,15 +448,19 @@ class SubscriptionView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
-        account_payments, objects_count = Payment.get_by_account(account_uuid=account_uuid, q=q, sort=sort, page=page,
-                                                                 size=size)
+        account_payments, objects_count, next_cursor, count_strategy = Payment.get_by_account(
+            account_uuid=account_uuid, q=q, sort=sort, page=page, size=size, cursor=cursor,
+            count_strategy=count_strategy)
         payment_data = Payment.serialize(account_payments)
 
         data = {'result': payment_data,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
                                                            page_size=objects_count if size is None else int(
-                                                               size), total_items=objects_count)}
+                                                               size), total_items=objects_count,
+                                                           next_cursor=next_cursor, count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
@@ -107,7 +107,7 @@ class UserInviteView(BaseView):
                 }
             }
 
-            EmailWorker.send(email_data)
+            EmailWorker.dispatch(email_data)
             logger.info('POST -> User invitation successfull')
             return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                       message_key=ResponseMessageKeys.SEND_USER_INVITE_SUCCESS.value, data=None,
@@ -315,7 +315,7 @@ class UserInviteView(BaseView):
                 }
             }
 
-            EmailWorker.send(email_data)
+            EmailWorker.dispatch(email_data)
             logger.info('POST -> Resend user invitation successfull')
             return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                       message_key=ResponseMessageKeys.RESEND_USER_INVITE_SUCCESS.value, data=None,
@@ -343,14 +343,18 @@ class UserInviteView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
-        user_invite_objs, objects_count = UserInvite.get_user_invite_list_by_account(
-            q=q, sort=sort, page=page, size=size, account_uuid=account_uuid)
+        user_invite_objs, objects_count, next_cursor, count_strategy = UserInvite.get_user_invite_list_by_account(
+            q=q, sort=sort, page=page, size=size, account_uuid=account_uuid, cursor=cursor,
+            count_strategy=count_strategy)
         user_invite_list = UserInvite.serialize(user_invite_objs)
 
         data = {'result': user_invite_list,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                           page_size=int(size), total_items=objects_count)}
+                                                           page_size=int(size), total_items=objects_count,
+                                                           next_cursor=next_cursor, count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
@@ -9,6 +9,8 @@ from app.helpers.constants import EmailTypes
 from app.helpers.constants import HttpStatusCode
 from app.helpers.constants import ResponseMessageKeys
 from app.helpers.constants import UserType
+from app.helpers.cognito_auth import evict_access_token
+from app.helpers.pagination import row_to_dict
 from app.helpers.utility import field_type_validator, get_pagination_meta
 from app.helpers.utility import required_validator
 from app.helpers.utility import send_json_response
@@ -198,14 +200,17 @@ class UserView(BaseView):
         size = request.args.get('size')
         q = request.args.get('q')
         sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count_strategy = request.args.get('count')
 
-        users_objs, objects_count = User.get_users_with_account_legal_name(
-            q=q, sort=sort, page=page, size=size)
-        users_list = [row._asdict() for row in users_objs]
+        users_objs, objects_count, next_cursor, count_strategy = User.get_users_with_account_legal_name(
+            q=q, sort=sort, page=page, size=size, cursor=cursor, count_strategy=count_strategy)
+        users_list = [row_to_dict(row) for row in users_objs]
 
         data = {'result': users_list,
                 'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                           page_size=int(size), total_items=objects_count)}
+                                                           page_size=int(size), total_items=objects_count,
+                                                           next_cursor=next_cursor, count_strategy=count_strategy)}
 
         return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                   message_key=ResponseMessageKeys.SUCCESS.value, data=data,
@@ -422,7 +427,7 @@ class UserView(BaseView):
                 }
             }
 
-            EmailWorker.send(email_data)
+            EmailWorker.dispatch(email_data)
 
             user_data = User.serialize(user, single_object=True)
 
@@ -843,7 +848,7 @@ class UserView(BaseView):
                         }
                     }
 
-                    EmailWorker.send(email_data)
+                    EmailWorker.dispatch(email_data)
                     return send_json_response(http_status=HttpStatusCode.OK.value, response_status=True,
                                               message_key=ResponseMessageKeys.LOGIN_SUCCESSFULLY.value, data=data,
                                               error=None)
@@ -970,6 +975,7 @@ class UserView(BaseView):
             COGNITO_CLIENT.delete_user(
                 AccessToken=access_token
             )
+            evict_access_token(access_token)
         except COGNITO_CLIENT.exceptions.UserNotFoundException:
             return send_json_response(http_status=HttpStatusCode.BAD_REQUEST.value, response_status=False,
                                       message_key=ResponseMessageKeys.USER_NOT_EXIST.value, data=None,
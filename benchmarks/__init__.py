@@ -0,0 +1,159 @@
+"""
+    Common setup for benchmark scripts.
+    Benchmarks use the same test database as pytest (SQLALCHEMY_TEST_DATABASE_URI from config/config.yml).
+    Run any benchmark from project root, e.g. `python -m benchmarks.cognito_token_cache`.
+"""
+import time
+from typing import Callable, Union
+
+from app import app_set_configurations
+from app import config_data
+from app import db
+from app import initialize_extensions
+from app import register_blueprints
+from app.helpers.constants import SubscriptionStatus
+from app.helpers.constants import UserType
+from flask import Flask
+
+BENCHMARK_USER_EMAIL = 'benchmark.user@project.com'
+BENCHMARK_ACCOUNT_LEGAL_NAME = 'Benchmark Account'
+
+
+def create_benchmark_app() -> Flask:
+    """Create application instance pointing to test database and create all tables."""
+    application = Flask(__name__, instance_relative_config=True)
+    application.config.from_object(config_data)
+    app_set_configurations(application=application, config_data=config_data)
+    application.config.update({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': config_data.get('SQLALCHEMY_TEST_DATABASE_URI')
+    })
+    config_data.update({
+        'TESTING': True,
+    })
+    initialize_extensions(application)
+    register_blueprints(application)
+    with application.app_context():
+        db.create_all()
+    return application
+
+
+def seed_principal() -> dict:
+    """Create account, user, plan and active subscription used by benchmarks (idempotent)."""
+    from app.models.account import Account
+    from app.models.plan import Plan
+    from app.models.subscription import Subscription
+    from app.models.user import User
+
+    user = User.get_by_email(BENCHMARK_USER_EMAIL)
+    if user is None:
+        account = Account(uuid=Account.create_uuid(), legal_name=BENCHMARK_ACCOUNT_LEGAL_NAME,
+                          display_name=BENCHMARK_ACCOUNT_LEGAL_NAME)
+        db.session.add(account)
+        db.session.commit()
+
+        user = User(uuid=User.create_uuid(), account_uuid=account.uuid, first_name='Benchmark', last_name='User',
+                    email=BENCHMARK_USER_EMAIL, force_password_update=False, password='',
+                    user_type=UserType.PRIMARY_USER.value)
+        db.session.add(user)
+        plan = Plan(uuid=Plan.create_uuid(), name='Benchmark Plan', period='month', status='active', amount=0,
+                    discount=0, feature=[])
+        db.session.add(plan)
+        db.session.commit()
+
+        subscription = Subscription(uuid=Subscription.create_uuid(), account_uuid=account.uuid, plan_uuid=plan.uuid,
+                                    status=SubscriptionStatus.ACTIVE.value)
+        db.session.add(subscription)
+        db.session.commit()
+
+    return {'user_uuid': user.uuid, 'account_uuid': user.account_uuid, 'email': user.email}
+
+
+def seed_email_templates(account_uuid: str) -> None:
+    """Create contract email templates for account if missing (idempotent)."""
+    from app.helpers.constants import CONTRACT_CANCELLED
+    from app.helpers.constants import EmailSubject
+    from app.helpers.constants import EmailTypes
+    from app.helpers.constants import SEND_CONTRACT_TO_SIGNEE_EMAIL_TEMPLATE
+    from app.models.email_template import EmailTemplate
+
+    for email_type, email_body in ((EmailTypes.SEND_CONTRACT_TO_SIGNEE, SEND_CONTRACT_TO_SIGNEE_EMAIL_TEMPLATE),
+                                   (EmailTypes.CONTRACT_CANCELLED, CONTRACT_CANCELLED)):
+        if EmailTemplate.get_email_template_by_email_type(account_uuid=account_uuid,
+                                                          email_type=email_type.value) is None:
+            db.session.add(EmailTemplate(uuid=EmailTemplate.create_uuid(), account_uuid=account_uuid,
+                                         email_type=email_type.value,
+                                         email_subject=EmailSubject[email_type.name].value, email_body=email_body))
+    db.session.commit()
+
+
+def seed_contracts(principal: dict, contract_count: int, signees_per_contract: int,
+                   status: Union[str, None] = None) -> list:
+    """
+        Create client with signees_per_contract signees and contract_count contracts shared with all of them.
+        Returns list of contract uuids.
+    """
+    from app.helpers.constants import ContractMailStatus
+    from app.helpers.constants import ContractStatus
+    from app.models.client import Client
+    from app.models.contract import Contract
+    from app.models.contract_signee import ContractSignee
+    from app.models.folder import Folder
+    from app.models.signee import Signee
+
+    seed_email_templates(account_uuid=principal['account_uuid'])
+    suffix = Client.create_uuid()[:8]
+    folder = Folder(uuid=Folder.create_uuid(), account_uuid=principal['account_uuid'],
+                    folder_name=f'Benchmark {suffix}', folder_name_slug=f'benchmark-{suffix}')
+    client = Client(uuid=Client.create_uuid(), account_uuid=principal['account_uuid'],
+                    created_by=principal['user_uuid'], legal_name=f'Benchmark Client {suffix}',
+                    legal_name_slug=f'benchmark-client-{suffix}', display_name=f'Benchmark Client {suffix}',
+                    email=f'client.{suffix}@benchmark.project.com', phone='1000000000', country='United Kingdom')
+    db.session.add_all([folder, client])
+    db.session.commit()
+
+    signees = [Signee(uuid=Signee.create_uuid(), client_uuid=client.uuid, account_uuid=principal['account_uuid'],
+                      created_by=principal['user_uuid'], full_name=f'Signee {index}',
+                      email=f'signee.{suffix}.{index}@benchmark.project.com')
+               for index in range(signees_per_contract)]
+    db.session.add_all(signees)
+    db.session.commit()
+
+    contract_uuids = []
+    for _ in range(contract_count):
+        contract = Contract(uuid=Contract.create_uuid(), account_uuid=principal['account_uuid'],
+                            created_by=principal['user_uuid'], purpose='Benchmark contract', client_uuid=client.uuid,
+                            folder_uuid=folder.uuid, content='<p>Benchmark</p>', signed_content='', brief='Benchmark',
+                            status=status or ContractStatus.SENT_FOR_SIGNING.value)
+        db.session.add(contract)
+        db.session.add_all([ContractSignee(uuid=ContractSignee.create_uuid(), account_uuid=principal['account_uuid'],
+                                           contract_uuid=contract.uuid, client_uuid=client.uuid,
+                                           signee_uuid=signee.uuid, signee_email=signee.email,
+                                           signee_full_name=signee.full_name,
+                                           status=ContractMailStatus.PENDING.value)
+                            for signee in signees])
+        contract_uuids.append(contract.uuid)
+    db.session.commit()
+    return contract_uuids
+
+
+def measure(func: Callable, iterations: int) -> dict:
+    """Call func iterations times and return total seconds, ops/sec and mean latency in ms."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    total = time.perf_counter() - start
+    return {
+        'iterations': iterations,
+        'total_seconds': round(total, 4),
+        'ops_per_second': round(iterations / total, 2) if total else None,
+        'mean_ms': round(total / iterations * 1000, 4),
+    }
+
+
+def print_report(title: str, results: dict) -> None:
+    """Print benchmark results as aligned table."""
+    print(f'\n{title}')
+    print('-' * len(title))
+    for name, result in results.items():
+        print('{:<40} {}'.format(name, ', '.join(f'{key}={value}' for key, value in result.items())))
@@ -0,0 +1,102 @@
+"""
+    Benchmark: size and diff time of the audit log of a contract update request
+        - previous: full request headers, body and args, every changed column, get_history twice per column
+        - policy: CONTRACT_AUDIT_POLICY (signed_content left out, long text as hash and length, header allowlist),
+          single pass over attribute history
+    Contract is not audited, the policy is what an audited contract model would use.
+    The request updates content (content_kb HTML) and status and carries the content and a base64 signature in its
+    body, like the contract editor does.
+
+    python -m benchmarks.audit_payload [content_kb] [iterations]
+"""
+import base64
+import json
+import sys
+
+from app import db
+from app.helpers.audit_policy import AUDIT_DATETIME_FORMAT
+from app.helpers.audit_policy import AuditPolicy
+from app.helpers.constants import ContractStatus
+from app.models.audit_event import AuditableEvent
+from app.models.audit_log import AuditLog
+from app.models.contract import Contract
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_contracts
+from benchmarks import seed_principal
+from sqlalchemy import inspect
+from sqlalchemy.orm import class_mapper
+from sqlalchemy.orm.attributes import get_history
+
+CONTRACT_AUDIT_POLICY = AuditPolicy(exclude_fields=('signed_content',))
+
+
+def previous_update_diff(target) -> tuple:
+    """Diff of AuditableEvent.audit_update before audit policies."""
+    state_before = {}
+    state_after = {}
+    inspr = inspect(target)
+    for attr in class_mapper(target.__class__).column_attrs:
+        if getattr(inspr.attrs, attr.key).history.has_changes():
+            try:
+                state_before[attr.key] = get_history(target, attr.key)[2].pop()
+            except Exception:
+                state_before[attr.key] = get_history(target, attr.key)[2]
+            state_after[attr.key] = getattr(target, attr.key)
+
+    def convert(data):
+        return {key: value.strftime(AUDIT_DATETIME_FORMAT) if hasattr(value, 'strftime') else value
+                for key, value in data.items()}
+
+    return convert(state_before), convert(state_after)
+
+
+def record_bytes(state_before: dict, state_after: dict, request_state: dict) -> int:
+    """JSON size of the audit log row."""
+    return len(json.dumps(dict(request_state, state_before=state_before, state_after=state_after),
+                          default=str).encode('utf-8'))
+
+
+def main():
+    """Seed a contract, build the audit log of one update both ways and print results."""
+    content_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    application = create_benchmark_app()
+    with application.app_context():
+        principal = seed_principal()
+        contract = Contract.get_by_uuid(seed_contracts(principal=principal, contract_count=1,
+                                                       signees_per_contract=1)[0])
+        old_content = '<p>{}</p>'.format('a' * content_kb * 1024)
+        contract.content = contract.signed_content = old_content
+        db.session.commit()
+
+        new_content = '<p>{}</p>'.format('b' * content_kb * 1024)
+        signature = base64.b64encode(b'\x89PNG' * 16 * 1024).decode('utf-8')
+        body = {'contract_uuid': contract.uuid, 'content': new_content, 'signature': signature}
+        headers = {'Authorization': 'Bearer ' + 'x' * 1000, 'Cookie': 'session=' + 'y' * 500,
+                   'User-Agent': 'Mozilla/5.0', 'Content-Type': 'application/json'}
+        with application.test_request_context('/api/v1/contract/update', method='PUT', json=body, headers=headers):
+            contract.content = contract.signed_content = new_content
+            contract.status = ContractStatus.SENT_FOR_SIGNING.value \
+                if contract.status != ContractStatus.SENT_FOR_SIGNING.value else ContractStatus.DRAFT.value
+            mapper = inspect(Contract)
+
+            previous = measure(func=lambda: previous_update_diff(contract), iterations=iterations)
+            previous['record_bytes'] = record_bytes(*previous_update_diff(contract),
+                                                    request_state=AuditLog.get_request_state())
+            policy = measure(func=lambda: AuditableEvent.get_update_diff(mapper, contract,
+                                                                         policy=CONTRACT_AUDIT_POLICY),
+                             iterations=iterations)
+            policy['record_bytes'] = record_bytes(
+                *AuditableEvent.get_update_diff(mapper, contract, policy=CONTRACT_AUDIT_POLICY),
+                request_state=CONTRACT_AUDIT_POLICY.request_state(AuditLog.get_request_state()))
+        db.session.rollback()
+
+    print_report(title=f'Audit log of a contract update with {content_kb} KB content',
+                 results={'previous': previous, 'policy': policy})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+    Benchmark: audit log overhead of Base.add and Base.update inside a request
+        - no audit: model without AuditableEvent
+        - per row insert: previous writer, one audit_log INSERT (and request copy) per flushed row
+        - buffered: audit logs buffered per transaction and written with one multi-row INSERT at commit
+    Overhead is the mean latency above the no audit model, statements the SQL statements per operation.
+
+    python -m benchmarks.audit_writer [iterations] [rows_per_update]
+"""
+import sys
+
+from app import db
+from app.models.audit_event import AuditableEvent
+from app.models.base import Base
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from sqlalchemy import event
+
+
+class PerRowAuditableEvent(AuditableEvent):
+    """Previous writer: audit log inserted on the flush connection as soon as a row is flushed."""
+
+    @staticmethod
+    def create_audit(connection, object_type, object_id, action, state_before=None, state_after=None, session=None):
+        AuditableEvent.create_audit(connection=connection, object_type=object_type, object_id=object_id,
+                                    action=action, state_before=state_before, state_after=state_after)
+
+
+class ItemColumns:
+    """Columns of benchmark items."""
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    uuid = db.Column(db.String, unique=True, nullable=False)
+    name = db.Column(db.String, nullable=False)
+    city = db.Column(db.String)
+
+
+class PlainItem(ItemColumns, Base):
+    __tablename__ = 'audit_benchmark_plain_item'
+
+
+class PerRowAuditedItem(ItemColumns, PerRowAuditableEvent, Base):
+    __tablename__ = 'audit_benchmark_per_row_item'
+
+
+class BufferedAuditedItem(ItemColumns, AuditableEvent, Base):
+    __tablename__ = 'audit_benchmark_buffered_item'
+
+
+class StatementCounter:
+    """Counts SQL statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def main():
+    """Measure add and multi-row update of every model and print results."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows_per_update = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    application = create_benchmark_app()
+    counter = StatementCounter()
+    results = {}
+    baselines = {}
+    with application.app_context(), application.test_request_context(
+            '/api/v1/client/create-update', method='POST', json={'legal_name': 'Benchmark', 'city': 'London'},
+            headers={'Authorization': 'Bearer ' + 'x' * 1000, 'User-Agent': 'benchmark'}):
+        event.listen(db.engine, 'before_cursor_execute', counter)
+        for label, model in (('no audit', PlainItem), ('per row insert', PerRowAuditedItem),
+                             ('buffered', BufferedAuditedItem)):
+            items = []
+
+            def add():
+                items.append(model.add({'uuid': model.create_uuid(), 'name': 'Item'}))
+
+            def update():
+                for item in items[:rows_per_update]:
+                    item.city = model.create_uuid()
+                model.update()
+
+            for operation, func in (('add', add), (f'update {rows_per_update} rows', update)):
+                counter.count = 0
+                result = measure(func=func, iterations=iterations)
+                result['statements'] = round(counter.count / iterations, 2)
+                baselines.setdefault(operation, result['mean_ms'])
+                result['overhead_ms'] = round(result['mean_ms'] - baselines[operation], 4)
+                results[f'{label}, {operation}'] = result
+        event.remove(db.engine, 'before_cursor_execute', counter)
+
+    print_report(title=f'Audit log overhead of {iterations} operations in a request', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+    Benchmark: client bulk import of a generated workbook (tests/assets/client_workbook.py)
+        - per row: previous ClientView.bulk_upload loop, validators, slug existence query and Client.add per row
+          (run on the first legacy_rows rows only, it needs minutes for 50k rows)
+        - vectorized: app.helpers.client_import.import_clients on the whole workbook
+    Rows/sec are reported for both, excel parsing is measured separately.
+
+    python -m benchmarks.client_bulk_upload [rows] [legacy_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app.helpers.client_import import import_clients
+from app.helpers.constants import ResponseMessageKeys
+from app.helpers.utility import field_type_validator
+from app.helpers.utility import required_validator
+from app.helpers.utility import validate_email
+from app.models.client import Client
+from benchmarks import create_benchmark_app
+from benchmarks import print_report
+from benchmarks import seed_principal
+import pandas as pd
+from slugify import slugify
+from tests.assets.client_workbook import write_client_workbook
+
+
+def import_clients_per_row(clients_data: list, account_uuid: str, user_uuid: str) -> list:
+    """Previous bulk upload loop."""
+    field_types = {'legal_name': str, 'display_name': str, 'email': str, 'phone': int, 'street_name': str,
+                   'postal_code': int, 'city': str, 'state': str, 'country': str}
+    error_data_list = []
+    for data in clients_data:
+        client_data = {field: data.get(field) for field in field_types}
+        client_data.update({'email': data.get('email').lower(), 'phone': str(data.get('phone')),
+                            'postal_code': str(data.get('postal_code'))})
+        post_data = field_type_validator(request_data=data, field_types=field_types)
+        is_valid = required_validator(request_data=data, required_fields=list(field_types))
+        if post_data['is_error'] or is_valid['is_error']:
+            error_data_list.append(client_data)
+            continue
+        if not validate_email(data.get('email')):
+            client_data['error'] = ResponseMessageKeys.INVALID_EMAIL_FORMAT.value
+            error_data_list.append(client_data)
+            continue
+        legal_name_slug = slugify(data.get('legal_name'))
+        if Client.check_if_client_exits(account_uuid=account_uuid, legal_name_slug=legal_name_slug):
+            error_data_list.append(client_data)
+            continue
+        client_data.update({'uuid': Client.create_uuid(), 'account_uuid': account_uuid, 'created_by': user_uuid,
+                            'legal_name_slug': legal_name_slug})
+        Client.add(client_data)
+    return error_data_list
+
+
+def main():
+    """Run benchmark for both paths and print results."""
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    legacy_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    application = create_benchmark_app()
+    with application.app_context(), tempfile.TemporaryDirectory() as directory:
+        principal = seed_principal()
+        results = {}
+        prefix = f'Bulk {int(time.time())}'
+        path = write_client_workbook(path=os.path.join(directory, 'clients.xlsx'), row_count=row_count,
+                                     invalid_every=100, duplicate_every=250, prefix=prefix)
+
+        start = time.perf_counter()
+        df = pd.read_excel(path)
+        results['read_excel'] = {'rows': row_count, 'total_seconds': round(time.perf_counter() - start, 4)}
+
+        for name, rows, func in (
+                ('per row', legacy_rows, lambda: len(import_clients_per_row(
+                    clients_data=df.head(legacy_rows).assign(legal_name=df['legal_name'] + ' legacy').to_dict(
+                        orient='records'), account_uuid=principal['account_uuid'], user_uuid=principal['user_uuid']))),
+                ('vectorized', row_count, lambda: import_clients(
+                    chunks=[df], account_uuid=principal['account_uuid'], user_uuid=principal['user_uuid']))):
+            start = time.perf_counter()
+            rows_failed = func()
+            total = time.perf_counter() - start
+            results[name] = {'rows': rows, 'rows_failed': rows_failed, 'total_seconds': round(total, 4),
+                             'rows_per_second': round(rows / total, 2)}
+
+    print_report(title=f'client bulk import of {row_count} row workbook', results=results)
+
+
+if __name__ == '__main__':
+    main()
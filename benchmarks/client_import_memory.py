@@ -0,0 +1,83 @@
+"""
+    Benchmark: peak memory (tracemalloc) of reading and validating client import files
+        - read_excel: previous path, whole workbook as DataFrame plus to_dict(orient='records')
+        - streaming xlsx / streaming csv: read_client_chunks + validate_client_frame chunk by chunk, rejected rows
+          appended to the write-only ErrorWorkbookWriter
+    Every reader runs on files of rows / 10 and rows rows to show whether peak grows with file size, once with valid
+    rows and once with every row invalid (every row goes to the error workbook).
+    The set of legal name slugs used for duplicate detection grows with the file and is part of the streaming peak.
+    No database is needed.
+
+    python -m benchmarks.client_import_memory [rows] [chunk_size]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app import config_data
+from app.helpers.client_import import ErrorWorkbookWriter
+from app.helpers.client_import import read_client_chunks
+from app.helpers.client_import import validate_client_frame
+from benchmarks import print_report
+import pandas as pd
+from tests.assets.client_workbook import write_client_csv
+from tests.assets.client_workbook import write_client_workbook
+
+
+def read_excel(path: str, chunk_size: int) -> int:
+    """Previous reader."""
+    return len(pd.read_excel(path).to_dict(orient='records'))
+
+
+def read_streaming(path: str, chunk_size: int) -> int:
+    """Stream file, validate every chunk and write its rejected rows to the error workbook."""
+    existing_slugs = set()
+    error_writer = ErrorWorkbookWriter()
+    rows = 0
+    for chunk in read_client_chunks(path=path, chunk_size=chunk_size):
+        _, error_data_list = validate_client_frame(df=chunk, existing_slugs=existing_slugs)
+        error_writer.write_rows(error_data_list)
+        rows += len(chunk)
+    error_writer.save()
+    return rows
+
+
+def measure_peak(func, path: str, chunk_size: int) -> dict:
+    """Run func under tracemalloc and return rows, seconds and peak MB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func(path, chunk_size)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'rows': rows, 'total_seconds': round(total, 4), 'peak_mb': round(peak / 1024 / 1024, 2)}
+
+
+def main():
+    """Run benchmark for every reader and file size and print results."""
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        config_data['UPLOAD_FOLDER'] = directory
+        for label, invalid_every in (('valid', 0), ('all invalid', 1)):
+            for rows in (row_count // 10, row_count):
+                file_name = f'clients_{rows}_{invalid_every}'
+                xlsx_path = write_client_workbook(path=os.path.join(directory, f'{file_name}.xlsx'), row_count=rows,
+                                                  invalid_every=invalid_every)
+                csv_path = write_client_csv(path=os.path.join(directory, f'{file_name}.csv'), row_count=rows,
+                                            invalid_every=invalid_every)
+                for name, func, path in (('read_excel', read_excel, xlsx_path),
+                                         ('streaming xlsx', read_streaming, xlsx_path),
+                                         ('streaming csv', read_streaming, csv_path)):
+                    results[f'{name} ({rows} {label} rows)'] = measure_peak(func=func, path=path,
+                                                                            chunk_size=chunk_size)
+
+    print_report(title=f'client import reader peak memory, chunk size {chunk_size}', results=results)
+
+
+if __name__ == '__main__':
+    main()
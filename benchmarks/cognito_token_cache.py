@@ -0,0 +1,107 @@
+"""
+    Benchmark: requests/sec through v1 `before_blueprint` with
+        - current path: every request calls COGNITO_CLIENT.get_user
+        - cached path: token verified locally against JWKS and email served from the token cache.
+    Cognito is replaced by a stub client with configurable latency so the numbers are reproducible.
+
+    python -m benchmarks.cognito_token_cache [iterations] [cognito_latency_ms]
+"""
+import sys
+import time
+
+from app import config_data
+from app.helpers import cognito_auth
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_principal
+from cryptography.hazmat.primitives.asymmetric import rsa
+import jwt
+
+
+class StubCognitoClient:
+    """Stand-in for boto3 cognito-idp client, only get_user is implemented."""
+
+    def __init__(self, email: str, latency: float):
+        self.email = email
+        self.latency = latency
+        self.calls = 0
+
+    def get_user(self, AccessToken: str) -> dict:  # noqa: N803
+        """Simulate network round trip and return user attributes."""
+        self.calls += 1
+        time.sleep(self.latency)
+        return {'Username': self.email, 'UserAttributes': [{'Name': 'email', 'Value': self.email}]}
+
+
+class StubSigningKey:
+    """Mimics jwt.PyJWK returned by PyJWKClient."""
+
+    def __init__(self, key):
+        self.key = key
+
+
+class StubJWKSClient:
+    """Mimics jwt.PyJWKClient with an in-memory public key."""
+
+    def __init__(self, public_key):
+        self.signing_key = StubSigningKey(public_key)
+
+    def get_signing_key_from_jwt(self, token: str) -> StubSigningKey:
+        """Return the only known signing key."""
+        return self.signing_key
+
+
+def build_access_token(private_key, email: str) -> str:
+    """Build a Cognito shaped access token signed with given private key."""
+    now = int(time.time())
+    claims = {
+        'sub': email,
+        'iss': cognito_auth.get_issuer(),
+        'client_id': config_data.get('COGNITO_APP_CLIENT_ID'),
+        'token_use': 'access',
+        'scope': 'aws.cognito.signin.user.admin',
+        'username': email,
+        'iat': now,
+        'exp': now + 3600,
+    }
+    return jwt.encode(payload=claims, key=private_key, algorithm='RS256', headers={'kid': 'benchmark'})
+
+
+def main():
+    """Run benchmark for both paths and print results."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 40.0) / 1000
+
+    application = create_benchmark_app()
+    from app.views import before_blueprint
+
+    with application.app_context():
+        principal = seed_principal()
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    stub_client = StubCognitoClient(email=principal['email'], latency=latency)
+    cognito_auth.COGNITO_CLIENT = stub_client
+    cognito_auth.jwks_client = StubJWKSClient(private_key.public_key())
+    access_token = build_access_token(private_key=private_key, email=principal['email'])
+    headers = {'Authorization': 'Bearer ' + access_token}
+
+    def call_blueprint():
+        with application.test_request_context('/api/v1/folder/list', headers=headers):
+            response = before_blueprint()
+            assert response is None, response
+
+    results = {}
+    for name, enabled in (('current path (get_user per request)', False), ('cached path', True)):
+        cognito_auth._cache_config['ENABLED'] = enabled
+        cognito_auth.clear_token_cache()
+        stub_client.calls = 0
+        result = measure(func=call_blueprint, iterations=iterations)
+        result['cognito_calls'] = stub_client.calls
+        results[name] = result
+
+    print_report(title=f'before_blueprint, stub Cognito latency {latency * 1000:.0f}ms', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+    Benchmark: size and latency of one /contract/list page of contracts with large bodies
+        - full rows: previous list query (every column) serialized with content and signed_content
+        - summary: Contract.get_contracts_list (content and signed_content deferred) serialized with summary=True
+    Response bytes are the JSON size of the page, DB bytes the size of the values fetched by the list query.
+
+    python -m benchmarks.contract_list_payload [contracts] [content_kb] [iterations]
+"""
+import json
+import sys
+
+from app import db
+from app.models.client import Client
+from app.models.contract import Contract
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_contracts
+from benchmarks import seed_principal
+from sqlalchemy import asc
+from sqlalchemy.orm import defer
+
+
+def previous_list_query(account_uuid: str, folder_uuid: str, size: int):
+    """List query before bodies were deferred."""
+    return db.session.query(Contract).join(Client, Contract.client_uuid == Client.uuid).filter(
+        Contract.account_uuid == account_uuid).filter(Contract.folder_uuid == folder_uuid).order_by(
+        asc(Contract.created_at)).limit(size)
+
+
+def fetched_bytes(query) -> int:
+    """Bytes of every column value returned by the SQL statement of query (rows are not turned into objects)."""
+    return sum(len(str(value).encode('utf-8')) for row in db.session.connection().execute(query.statement)
+               for value in row if value is not None)
+
+
+def response_bytes(contract_list: list) -> int:
+    """Size of serialized page."""
+    return len(json.dumps(contract_list, default=str).encode('utf-8'))
+
+
+def main():
+    """Seed contracts with large bodies, compare both list paths and print results."""
+    contracts = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    content_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    application = create_benchmark_app()
+    with application.app_context():
+        principal = seed_principal()
+        contract_uuids = seed_contracts(principal=principal, contract_count=contracts, signees_per_contract=1)
+        body = '<p>{}</p>'.format('x' * content_kb * 1024)
+        Contract.query.filter(Contract.uuid.in_(contract_uuids)).update(
+            {'content': body, 'signed_content': body}, synchronize_session=False)
+        db.session.commit()
+        account_uuid = principal['account_uuid']
+        folder_uuid = Contract.get_by_uuid(contract_uuids[0]).folder_uuid
+
+        def previous_page():
+            contract_list = Contract.serialize(previous_list_query(account_uuid, folder_uuid, contracts).all())
+            db.session.remove()
+            return contract_list
+
+        def summary_page():
+            contract_objs, _, _, _ = Contract.get_contracts_list(account_uuid=account_uuid, folder_uuid=folder_uuid,
+                                                           sort='asc', page=1, size=contracts)
+            contract_list = Contract.serialize(contract_objs, summary=True)
+            db.session.remove()
+            return contract_list
+
+        summary_query = previous_list_query(account_uuid, folder_uuid, contracts).options(
+            *[defer(column) for column in Contract.list_deferred_columns()])
+        results = {}
+        for name, page, query in (('full rows', previous_page, previous_list_query(account_uuid, folder_uuid,
+                                                                                    contracts)),
+                                  ('summary', summary_page, summary_query)):
+            result = measure(func=lambda: response_bytes(page()), iterations=iterations)
+            result['response_bytes'] = response_bytes(page())
+            result['db_bytes'] = fetched_bytes(query)
+            results[name] = result
+
+    print_report(title=f'/contract/list page of {contracts} contracts with {content_kb} KB bodies', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+    Benchmark: EmailTemplate.get_email_template_by_email_type and rendering of the email body
+        - db: cache disabled, one query per lookup
+        - redis: local layer emptied before every lookup, template read from redis
+        - local: template served from the in process LRU
+        - str.format vs render_email_body (pre-compiled body) of the send contract template for recipients recipients
+
+    python -m benchmarks.email_template_cache [iterations] [recipients]
+"""
+import sys
+
+from app import config_data
+from app.helpers.constants import EmailTypes
+from app.helpers.email_template_cache import invalidate_email_template
+from app.helpers.email_template_cache import local_templates
+from app.helpers.email_template_cache import render_email_body
+from app.models.email_template import EmailTemplate
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_email_templates
+from benchmarks import seed_principal
+
+
+def main():
+    """Measure template lookups through every cache layer and body rendering and print results."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    recipients = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    application = create_benchmark_app()
+    email_type = EmailTypes.SEND_CONTRACT_TO_SIGNEE.value
+    with application.app_context():
+        principal = seed_principal()
+        account_uuid = principal['account_uuid']
+        seed_email_templates(account_uuid=account_uuid)
+        invalidate_email_template(account_uuid=account_uuid, email_type=email_type)
+
+        def lookup():
+            return EmailTemplate.get_email_template_by_email_type(account_uuid=account_uuid, email_type=email_type)
+
+        def redis_lookup():
+            local_templates.clear()
+            return lookup()
+
+        config_data['EMAIL_TEMPLATE_CACHE'] = {'ENABLED': False}
+        db_result = measure(func=lookup, iterations=iterations)
+        config_data['EMAIL_TEMPLATE_CACHE'] = {'ENABLED': True}
+        email_body = lookup().email_body
+        redis_result = measure(func=redis_lookup, iterations=iterations)
+        local_result = measure(func=lookup, iterations=iterations)
+        invalidate_email_template(account_uuid=account_uuid, email_type=email_type)
+
+    fields = [{'signee_name': f'Signee {index}', 'contract_link': f'https://app.project.com/contract/sign-contract'
+               f'?token={"x" * 200}{index}', 'contact_information': principal['email']} for index in range(recipients)]
+
+    def format_bodies():
+        return [email_body.format(**recipient) for recipient in fields]
+
+    def render_bodies():
+        return [render_email_body(email_body, **recipient) for recipient in fields]
+
+    print_report(title=f'Email template lookup ({iterations} lookups)',
+                 results={'db': db_result, 'redis': redis_result, 'local': local_result})
+    print_report(title=f'Email body rendering for {recipients} recipients',
+                 results={'str.format': measure(func=format_bodies, iterations=iterations // 10 or 1),
+                          'pre-compiled': measure(func=render_bodies, iterations=iterations // 10 or 1)})
+
+
+if __name__ == '__main__':
+    main()
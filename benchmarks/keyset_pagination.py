@@ -0,0 +1,67 @@
+"""
+    Benchmark: page latency of Folder.get_folder_list at growing depth on a large table
+        - offset: page/size, query.count() plus OFFSET (page - 1) * size
+        - cursor: seek after (created_at, id) of the previous page, no count
+    Folders are inserted with generate_series on first run and an (account_uuid, created_at, id) index is created so
+    that the cursor query can seek; both are kept for later runs.
+
+    python -m benchmarks.keyset_pagination [rows] [page_size] [iterations]
+"""
+import sys
+
+from app import db
+from app.helpers.pagination import encode_cursor
+from app.models.folder import Folder
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_principal
+from sqlalchemy import text
+
+FOLDER_PREFIX = 'keyset-benchmark'
+
+
+def seed_folders(account_uuid: str, rows: int) -> None:
+    """Insert folders until account has rows benchmark folders, created_at one second apart."""
+    existing = db.session.query(Folder).filter(Folder.account_uuid == account_uuid).filter(
+        Folder.folder_name_slug.like(f'{FOLDER_PREFIX}-%')).count()
+    if existing < rows:
+        db.session.execute(text(
+            'INSERT INTO folder (uuid, account_uuid, folder_name, folder_name_slug, created_at) '
+            "SELECT gen_random_uuid()::text, :account_uuid, 'Keyset ' || n, :prefix || '-' || n, "
+            "now() - make_interval(secs => n) FROM generate_series(:start, :stop) AS n"),
+            {'account_uuid': account_uuid, 'prefix': FOLDER_PREFIX, 'start': existing + 1, 'stop': rows})
+    db.session.execute(text('CREATE INDEX IF NOT EXISTS ix_folder_account_uuid_created_at_id '
+                            'ON folder (account_uuid, created_at, id)'))
+    db.session.commit()
+
+
+def main():
+    """Seed folders, measure both modes at every depth and print results."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    application = create_benchmark_app()
+    with application.app_context():
+        account_uuid = seed_principal()['account_uuid']
+        seed_folders(account_uuid=account_uuid, rows=rows)
+
+        results = {}
+        last_page = rows // page_size
+        for page in sorted({1, 10, 100, 1000, last_page // 2, last_page} - {0}):
+            previous_row = Folder.query.filter(Folder.account_uuid == account_uuid).order_by(
+                Folder.created_at.desc(), Folder.id.desc()).offset((page - 1) * page_size - 1).first() \
+                if page > 1 else None
+            cursor = encode_cursor(previous_row.created_at, previous_row.id) if previous_row else ''
+
+            results[f'offset page {page}'] = measure(func=lambda: Folder.get_folder_list(
+                account_uuid=account_uuid, page=page, size=page_size), iterations=iterations)
+            results[f'cursor page {page}'] = measure(func=lambda: Folder.get_folder_list(
+                account_uuid=account_uuid, size=page_size, cursor=cursor), iterations=iterations)
+
+    print_report(title=f'Folder list pages of {page_size} on {rows} rows', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+    Benchmark: first page latency of Folder.get_folder_list with every count strategy on a large table
+        - exact: query.count() on every request
+        - cached: count read from redis after the first request
+        - estimated: planner row estimate (EXPLAIN)
+    Uses the folders seeded by benchmarks.keyset_pagination.
+
+    python -m benchmarks.list_count [rows] [iterations]
+"""
+import sys
+
+from app import config_data
+from app.helpers.constants import CountStrategy
+from app.helpers.pagination import invalidate_counts
+from app.models.folder import Folder
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_principal
+from benchmarks.keyset_pagination import seed_folders
+
+
+def main():
+    """Seed folders, measure first page with every count strategy and print results."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    application = create_benchmark_app()
+    with application.app_context():
+        account_uuid = seed_principal()['account_uuid']
+        seed_folders(account_uuid=account_uuid, rows=rows)
+        config_data['PAGINATION_COUNT'] = {'CACHE_TTL': 300}
+        invalidate_counts(table=Folder.__tablename__, account_uuids={account_uuid})
+
+        results = {}
+        for count_strategy in CountStrategy:
+            total_items = Folder.get_folder_list(account_uuid=account_uuid, page=1, size=20,
+                                                 count_strategy=count_strategy.value)[1]
+            result = measure(func=lambda: Folder.get_folder_list(
+                account_uuid=account_uuid, page=1, size=20, count_strategy=count_strategy.value),
+                iterations=iterations)
+            result['total_items'] = total_items
+            results[count_strategy.value] = result
+
+    print_report(title=f'Folder list first page on {rows} rows', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+    Benchmark: renders/sec of the reminder and "signed by all" mail templates
+        - flask: render_template inside a new app context per mail, as send_mail did
+        - precompiled: render_mail_templates of the mail template environment, one call per fan-out
+    Cold load compares compiling every mail template in a new environment with loading their cached bytecode.
+
+    python -m benchmarks.mail_templates [recipients] [iterations]
+"""
+import sys
+
+from app import app
+from benchmarks import measure
+from benchmarks import print_report
+from flask import render_template
+from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
+from providers import mail as mail_provider
+from providers.mail import get_mail_template_cache_dir
+from providers.mail import preload_mail_templates
+from providers.mail import render_mail_templates
+
+TEMPLATES = {
+    'reminder': 'emails/signature_reminder_email.html',
+    'signed by all': 'emails/update_account_owner_when_contract_signed_by_all_signee.html',
+}
+
+
+def with_renders_per_second(result: dict, recipients: int) -> dict:
+    """Add mails rendered per second to measure result."""
+    result['renders_per_second'] = round(result['ops_per_second'] * recipients, 2) if result['ops_per_second'] else None
+    return result
+
+
+def cold_load(bytecode_cache: bool) -> None:
+    """Create a new mail template environment and load every template into it."""
+    environment = mail_provider.get_mail_template_environment()
+    mail_provider._template_environment = Environment(
+        loader=environment.loader, autoescape=environment.autoescape, auto_reload=False, cache_size=-1,
+        bytecode_cache=FileSystemBytecodeCache(get_mail_template_cache_dir()) if bytecode_cache else None)
+    preload_mail_templates()
+    mail_provider._template_environment = environment
+
+
+def main():
+    """Render both templates for recipients recipients both ways and print results."""
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    data_list = [{'email_body': f'<p>Hi Signee {index}, please sign the contract.</p>', 'full_name': f'Signee {index}',
+                  'contract_link': f'https://app.project.com/contract/sign-contract?token={"x" * 200}{index}'}
+                 for index in range(recipients)]
+    preload_mail_templates()
+
+    for label, template in TEMPLATES.items():
+        def flask_render():
+            for data in data_list:
+                with app.app_context():
+                    render_template(template, data=data)
+
+        def precompiled_render():
+            render_mail_templates(template=template, data_list=data_list)
+
+        print_report(title=f'Rendering {label} mail for {recipients} recipients',
+                     results={'flask': with_renders_per_second(measure(func=flask_render, iterations=iterations),
+                                                               recipients=recipients),
+                              'precompiled': with_renders_per_second(
+                                  measure(func=precompiled_render, iterations=iterations), recipients=recipients)})
+
+    print_report(title='Cold load of every mail template',
+                 results={'compile': measure(func=lambda: cold_load(bytecode_cache=False), iterations=iterations),
+                          'bytecode cache': measure(func=lambda: cold_load(bytecode_cache=True),
+                                                    iterations=iterations)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+    Benchmark: mails/sec sent through providers.mail against a local SMTP stub
+        - per message: send_mail opens a new SMTP connection and app context for every mail (previous path)
+        - batched: send_mail_batch reuses one connection per MAIL.BATCH_SIZE mails
+    The stub sleeps connect_latency per connection to stand in for TLS handshake and login.
+
+    python -m benchmarks.mail_throughput [mails] [connect_latency_ms] [batch_size]
+"""
+import copy
+import sys
+
+from app import config_data
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from providers import mail as mail_provider
+from providers.mail import send_mail
+from providers.mail import send_mail_batch
+from tests.smtp_stub import SMTPStubServer
+
+
+def main():
+    """Run benchmark for both paths and print results."""
+    mail_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    connect_latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50.0) / 1000
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    create_benchmark_app()
+    config_data['MAIL']['BATCH_SIZE'] = batch_size
+    smtp_stub = SMTPStubServer(connect_latency=connect_latency).start()
+    mail_state = copy.copy(mail_provider.app.extensions['mail'])
+    smtp_stub.configure_mail(mail_state)
+    mail_provider.app.extensions['mail'] = mail_state
+
+    mail_list = [{
+        'email_to': f'signee{index}@benchmark.project.com',
+        'subject': 'Reminder',
+        'template': 'emails/signature_reminder_email.html',
+        'email_type': 'SEND_REMINDER_TO_SIGNEE',
+        'email_data': {'email_body': 'Please sign the contract.'}
+    } for index in range(mail_count)]
+
+    def send_per_message():
+        for mail_data in mail_list:
+            send_mail(email_to=mail_data['email_to'], subject=mail_data['subject'], template=mail_data['template'],
+                      email_type=mail_data['email_type'], data=mail_data['email_data'])
+
+    def send_batched():
+        assert send_mail_batch(mail_list) == []
+
+    results = {}
+    for name, func in (('per message connection', send_per_message), ('batched', send_batched)):
+        smtp_stub.connections = 0
+        smtp_stub.messages = 0
+        result = measure(func=func, iterations=1)
+        result['mails_per_second'] = round(smtp_stub.messages / result['total_seconds'], 2)
+        result['smtp_connections'] = smtp_stub.connections
+        results[name] = result
+    smtp_stub.stop()
+
+    print_report(title=f'{mail_count} mails, stub SMTP connect latency {connect_latency * 1000:.0f}ms, '
+                       f'batch size {batch_size}', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+    Benchmark: SQL queries per request issued by v1 `before_blueprint`, counted with a SQLAlchemy
+    `before_cursor_execute` event listener, for
+        - previous path: User.get_by_email + Subscription.get_active_subscription_by_account_uuid + Account.get_by_uuid
+        - principal snapshot without redis (single joined query)
+        - principal snapshot with redis (cache hit after first request)
+    Cognito token resolution is stubbed out so only database work is measured.
+
+    python -m benchmarks.principal_cache [iterations]
+"""
+import sys
+
+from app import config_data
+from app import db
+from app.helpers import principal_cache
+from app.models.account import Account
+from app.models.subscription import Subscription
+from app.models.user import User
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_principal
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Count statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        """before_cursor_execute listener."""
+        self.count += 1
+
+
+def previous_lookup(email: str):
+    """Lookups done by before_blueprint before principal snapshot was introduced."""
+    user_object = User.get_by_email(email)
+    Subscription.get_active_subscription_by_account_uuid(account_uuid=user_object.account_uuid)
+    User.serialize(user_object, single_object=True)
+    Account.get_by_uuid(user_object.account_uuid)
+
+
+def main():
+    """Run benchmark and print queries per request for each path."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    application = create_benchmark_app()
+    from app.views import before_blueprint
+    import app.views as views
+
+    with application.app_context():
+        principal = seed_principal()
+        email = principal['email']
+        views.get_email_by_access_token = lambda access_token: email
+        counter = QueryCounter()
+        event.listen(db.engine, 'before_cursor_execute', counter)
+
+        def run(func):
+            def wrapped():
+                func()
+                db.session.remove()
+            return wrapped
+
+        def call_blueprint():
+            with application.test_request_context('/api/v1/folder/list', headers={'Authorization': 'Bearer token'}):
+                response = before_blueprint()
+                assert response is None, response
+
+        results = {}
+        for name, func, cache_enabled in (('previous path', lambda: previous_lookup(email), False),
+                                          ('snapshot, redis disabled', call_blueprint, False),
+                                          ('snapshot, redis enabled', call_blueprint, True)):
+            config_data['PRINCIPAL_CACHE'] = {'ENABLED': cache_enabled}
+            principal_cache.invalidate_principals({'emails': {email}, 'account_uuids': set()})
+            counter.count = 0
+            result = measure(func=run(func), iterations=iterations)
+            result['queries_per_request'] = round(counter.count / iterations, 2)
+            results[name] = result
+
+        event.remove(db.engine, 'before_cursor_execute', counter)
+
+    print_report(title='before_blueprint database round trips', results=results)
+
+
+if __name__ == '__main__':
+    main()
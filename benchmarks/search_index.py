@@ -0,0 +1,104 @@
+"""
+    Benchmark: client list search (q) on a large account with and without the pg_trgm GIN index of migration 0047
+        - seq scan: index dropped inside a transaction that is rolled back afterwards
+        - trigram index: gin_trgm_ops index on the searched expression of app.helpers.search
+    Reports EXPLAIN ANALYZE execution time and scan node of the filtered query, and latency of
+    Client.get_all_by_account_uuid for a rare and a common search term.
+    Clients are inserted with generate_series on first run and kept for later runs.
+
+    python -m benchmarks.search_index [rows] [iterations]
+"""
+import json
+import sys
+
+from app import db
+from app.helpers.pagination import compile_query
+from app.helpers.search import CLIENT_SEARCH_COLUMNS
+from app.helpers.search import SEARCH_DOCUMENT_SEPARATOR
+from app.helpers.search import model_columns
+from app.helpers.search import search_filter
+from app.models.client import Client
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_principal
+from sqlalchemy import text
+
+CLIENT_PREFIX = 'search-benchmark'
+INDEX_NAME = 'ix_client_search_trgm'
+
+
+def seed_clients(principal: dict, rows: int) -> None:
+    """Insert clients until account has rows benchmark clients and create the search index as migration 0047 does."""
+    existing = db.session.query(Client).filter(Client.account_uuid == principal['account_uuid']).filter(
+        Client.legal_name_slug.like(f'{CLIENT_PREFIX}-%')).count()
+    if existing < rows:
+        db.session.execute(text(
+            'INSERT INTO client (uuid, account_uuid, created_by, legal_name, legal_name_slug, display_name, email, '
+            'phone, city, country, is_account_client, created_at) '
+            "SELECT gen_random_uuid()::text, :account_uuid, :user_uuid, 'Search Client ' || n, :prefix || '-' || n, "
+            "'Client ' || md5(n::text), 'client.' || n || '@search-benchmark.com', (1000000000 + n)::text, "
+            "(ARRAY['London', 'Paris', 'Berlin', 'Madrid'])[n % 4 + 1], 'Europe', false, "
+            'now() - make_interval(secs => n) FROM generate_series(:start, :stop) AS n'),
+            {'account_uuid': principal['account_uuid'], 'user_uuid': principal['user_uuid'], 'prefix': CLIENT_PREFIX,
+             'start': existing + 1, 'stop': rows})
+    document = f' || {SEARCH_DOCUMENT_SEPARATOR} || '.join(
+        f"coalesce({column}, '')" for column in CLIENT_SEARCH_COLUMNS)
+    db.session.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON client USING gin (({document}) gin_trgm_ops)'))
+    db.session.execute(text('ANALYZE client'))
+    db.session.commit()
+
+
+def explain(account_uuid: str, q: str) -> dict:
+    """EXPLAIN ANALYZE of the filtered client list query, returns execution ms and scan node types."""
+    query = db.session.query(Client).filter(Client.account_uuid == account_uuid).filter(
+        search_filter(q, model_columns(Client, CLIENT_SEARCH_COLUMNS)))
+    compiled = compile_query(query)
+    plan = db.session.connection().exec_driver_sql('EXPLAIN (ANALYZE, FORMAT JSON) ' + str(compiled),
+                                                   compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    def node_types(node):
+        yield node['Node Type']
+        for child in node.get('Plans', []):
+            yield from node_types(child)
+
+    return {'explain_ms': plan[0]['Execution Time'],
+            'scan': '/'.join(node for node in node_types(plan[0]['Plan']) if 'Scan' in node)}
+
+
+def main():
+    """Seed clients, measure searches with and without the trigram index and print results."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    application = create_benchmark_app()
+    with application.app_context():
+        principal = seed_principal()
+        account_uuid = principal['account_uuid']
+        seed_clients(principal=principal, rows=rows)
+
+        def search(q: str) -> dict:
+            result = explain(account_uuid=account_uuid, q=q)
+            result.update(measure(func=lambda: Client.get_all_by_account_uuid(
+                account_uuid=account_uuid, q=q, sort='desc', page=1, size=20), iterations=iterations))
+            return result
+
+        results = {}
+        terms = {'rare': f'client.{rows // 2}@', 'common': 'paris'}
+        for name, q in terms.items():
+            results[f'trigram index, {name}'] = search(q)
+
+        # DDL is transactional, the index is back after rollback
+        db.session.execute(text(f'DROP INDEX {INDEX_NAME}'))
+        for name, q in terms.items():
+            results[f'seq scan, {name}'] = search(q)
+        db.session.rollback()
+
+    print_report(title=f'Client list search on {rows} clients', results=results)
+
+
+if __name__ == '__main__':
+    main()
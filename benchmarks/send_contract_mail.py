@@ -0,0 +1,74 @@
+"""
+    Benchmark: request latency of POST /api/v1/contract/send for a contract with 10 signees
+        - inline path: every mail is rendered and sent over SMTP inside the request (EMAIL_QUEUE disabled)
+        - queued path: mails are enqueued on SEND_MAIL queue (EMAIL_QUEUE enabled), jobs are discarded afterwards
+    SMTP is replaced by a stub with configurable latency per message, authentication is stubbed out.
+
+    python -m benchmarks.send_contract_mail [iterations] [smtp_latency_ms] [signees]
+"""
+import sys
+import time
+
+from app import config_data
+from app import send_mail_q
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_contracts
+from benchmarks import seed_principal
+from providers import mail as mail_provider
+
+
+class StubMail:
+    """Stand-in for flask_mail.Mail.send with a fixed round trip per message."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.sent = 0
+
+    def send(self, message) -> None:
+        """Simulate SMTP round trip."""
+        self.sent += 1
+        time.sleep(self.latency)
+
+
+def main():
+    """Run benchmark for both paths and print results."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 150.0) / 1000
+    signees = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    application = create_benchmark_app()
+    import app.views as views
+
+    with application.app_context():
+        principal = seed_principal()
+        contract_uuid = seed_contracts(principal=principal, contract_count=1, signees_per_contract=signees)[0]
+
+    views.get_email_by_access_token = lambda access_token: principal['email']
+    stub_mail = StubMail(latency=latency)
+    mail_provider.mail = stub_mail
+    client = application.test_client()
+
+    def send_contract():
+        response = client.post('/api/v1/contract/send', json={'contract_uuid': contract_uuid},
+                               headers={'Authorization': 'Bearer token'})
+        assert response.status_code == 200, response.json
+
+    results = {}
+    for name, queue_enabled in (('inline send', False), ('queued send', True)):
+        config_data['EMAIL_QUEUE'] = {'ENABLED': queue_enabled}
+        stub_mail.sent = 0
+        jobs_before = send_mail_q.count
+        result = measure(func=send_contract, iterations=iterations)
+        result['mails_sent_in_request'] = stub_mail.sent
+        result['jobs_enqueued'] = send_mail_q.count - jobs_before
+        results[name] = result
+    send_mail_q.empty()
+
+    print_report(title=f'/contract/send with {signees} signees, stub SMTP latency {latency * 1000:.0f}ms',
+                 results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+    Benchmark: daily reminder job (ContractView.send_reminder_to_signees) over many pending signees
+        - per signee: previous path, template query, token, ContractLog.add (uuid existence query + commit) per signee
+        - chunked: current path, one signee query, one template query per new account and one bulk insert per chunk
+    Mails are counted instead of dispatched. Seeds contracts x signees pending signees once (default 50 x 1000 = 50k).
+
+    python -m benchmarks.send_reminders [contracts] [signees_per_contract] [chunk_size]
+"""
+from datetime import datetime
+import sys
+
+from app import config_data
+from app import db
+from app import r
+from app.helpers.constants import ContractMailStatus
+from app.helpers.constants import ContractStatus
+from app.helpers.constants import EmailSubject
+from app.helpers.constants import EmailTypes
+from app.helpers.constants import SEND_REMINDER_TO_SIGNEE
+from app.helpers.utility import generate_email_token
+from app.models.contract_log import ContractLog
+from app.models.contract_signee import ContractSignee
+from app.models.email_template import EmailTemplate
+from app.views.contract_view import ContractView
+from app.views.contract_view import REMINDER_CHECKPOINT_KEY
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_contracts
+from benchmarks import seed_principal
+from sqlalchemy import event
+from workers.email_worker import EmailWorker
+
+
+def send_reminders_per_signee(signees: list) -> None:
+    """Previous implementation of send_reminder_to_signees, one round trip chain per signee."""
+    email_data_list = []
+    for signee in signees:
+        contract_link = config_data.get('APP_URL') + '/contract/sign-contract?token=' + generate_email_token(signee.uuid)
+        email_template_obj = EmailTemplate.get_email_template_by_email_type(
+            account_uuid=signee.account_uuid, email_type=EmailTypes.SEND_REMINDER_TO_SIGNEE.value)
+        email_data_list.append({
+            'email_to': signee.signee_email,
+            'subject': email_template_obj.email_subject,
+            'template': 'emails/signature_reminder_email.html',
+            'email_type': EmailTypes.SEND_REMINDER_TO_SIGNEE.value,
+            'email_data': {'email_body': email_template_obj.email_body.format(name=signee.signee_full_name,
+                                                                              contract_link=contract_link)}
+        })
+        ContractLog.add({
+            'uuid': ContractLog.create_uuid(),
+            'account_uuid': signee.account_uuid,
+            'contract_uuid': signee.contract_uuid,
+            'description': 'Reminder email sent to {} on {}.'.format(signee.signee_full_name,
+                                                                     datetime.now().strftime('%Y-%m-%d'))
+        })
+    EmailWorker.dispatch_many(email_data_list)
+
+
+def main():
+    """Run benchmark for both paths and print results."""
+    contract_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    signees_per_contract = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+
+    application = create_benchmark_app()
+    config_data['REMINDER'] = {'CHUNK_SIZE': chunk_size}
+    dispatched = []
+    EmailWorker.dispatch_many = lambda data_list: dispatched.extend(data_list)
+
+    with application.app_context():
+        principal = seed_principal()
+        if EmailTemplate.get_email_template_by_email_type(account_uuid=principal['account_uuid'],
+                                                          email_type=EmailTypes.SEND_REMINDER_TO_SIGNEE.value) is None:
+            EmailTemplate.add({'uuid': EmailTemplate.create_uuid(), 'account_uuid': principal['account_uuid'],
+                               'email_type': EmailTypes.SEND_REMINDER_TO_SIGNEE.value,
+                               'email_subject': EmailSubject.SEND_REMINDER_TO_SIGNEE.value,
+                               'email_body': SEND_REMINDER_TO_SIGNEE})
+        seed_contracts(principal=principal, contract_count=contract_count, signees_per_contract=signees_per_contract)
+        signees = ContractSignee.get_reminder_batch(contract_status=ContractStatus.SENT_FOR_SIGNING.value,
+                                                    status=ContractMailStatus.PENDING.value, after_id=0,
+                                                    limit=sys.maxsize)
+
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(1))
+
+        def send_chunked():
+            r.delete(REMINDER_CHECKPOINT_KEY.format(datetime.utcnow().strftime('%Y-%m-%d')))
+            ContractView.send_reminder_to_signees()
+
+        results = {}
+        for name, func in (('per signee', lambda: send_reminders_per_signee(signees)), ('chunked', send_chunked)):
+            dispatched.clear()
+            statements.clear()
+            result = measure(func=func, iterations=1)
+            result['signees_per_second'] = round(len(dispatched) / result['total_seconds'], 2)
+            result['sql_statements'] = len(statements)
+            results[name] = result
+
+    print_report(title=f'send_reminder_to_signees with {len(signees)} pending signees, chunk size {chunk_size}',
+                 results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+    Benchmark: ContractSignee inserts/sec through ContractSignee.add with different uuid strategies
+        - existence query: previous create_uuid, SELECT by uuid inside a new app context before every insert
+        - uuid4: create_uuid without query, unique constraint catches conflicts
+        - uuid7: time ordered uuids (UUID.VERSION 7)
+
+    python -m benchmarks.uuid_inserts [inserts]
+"""
+import sys
+from uuid import uuid4
+
+from app import app
+from app import config_data
+from app import db
+from app.helpers.constants import ContractMailStatus
+from app.models.contract_signee import ContractSignee
+from benchmarks import create_benchmark_app
+from benchmarks import measure
+from benchmarks import print_report
+from benchmarks import seed_contracts
+from benchmarks import seed_principal
+
+
+def create_uuid_with_existence_query() -> str:
+    """Previous Base.create_uuid."""
+    with app.app_context():
+        uuid = str(uuid4())
+        if db.session.query(ContractSignee).filter(ContractSignee.uuid == uuid).first():
+            return create_uuid_with_existence_query()
+        return uuid
+
+
+def main():
+    """Run benchmark for every strategy and print results."""
+    inserts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    application = create_benchmark_app()
+    with application.app_context():
+        principal = seed_principal()
+        contract_uuid = seed_contracts(principal=principal, contract_count=1, signees_per_contract=1)[0]
+        template = ContractSignee.query.filter(ContractSignee.contract_uuid == contract_uuid).first()
+        data = {'account_uuid': template.account_uuid, 'contract_uuid': contract_uuid,
+                'client_uuid': template.client_uuid, 'signee_uuid': template.signee_uuid,
+                'signee_email': template.signee_email, 'signee_full_name': template.signee_full_name,
+                'status': ContractMailStatus.PENDING.value}
+
+        results = {}
+        for name, create_uuid, version in (('existence query', create_uuid_with_existence_query, 4),
+                                           ('uuid4', ContractSignee.create_uuid, 4),
+                                           ('uuid7', ContractSignee.create_uuid, 7)):
+            config_data['UUID'] = {'VERSION': version}
+            results[name] = measure(func=lambda: ContractSignee.add(dict(data, uuid=create_uuid())),
+                                    iterations=inserts)
+
+    print_report(title=f'{inserts} ContractSignee inserts', results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""pg_trgm indexes for list search (q)
+
+Revision ID: 0047
+Revises: 0046
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0047'
+down_revision = '0046'
+branch_labels = None
+depends_on = None
+
+
+def search_document(columns):
+    """Same expression as app.helpers.search.search_document, indexes are only used when expressions match."""
+    if len(columns) == 1:
+        return columns[0]
+    return " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+
+
+# index name, table, searched columns (app.helpers.search *_SEARCH_COLUMNS)
+SEARCH_INDEXES = (
+    ('ix_contract_search_trgm', 'contract', ('purpose', 'brief')),
+    ('ix_client_search_trgm', 'client', ('legal_name', 'display_name', 'email', 'phone', 'street_name', 'postal_code',
+                                         'city', 'state', 'country')),
+    ('ix_client_legal_name_trgm', 'client', ('legal_name',)),
+    ('ix_account_search_trgm', 'account', ('legal_name', 'display_name', 'postal_code', 'address', 'city', 'state',
+                                           'country')),
+    ('ix_user_search_trgm', '"user"', ('first_name', 'last_name', 'email', 'mobile_number', 'user_type')),
+    ('ix_user_invite_search_trgm', 'user_invite', ('first_name', 'last_name', 'email', 'status')),
+    ('ix_folder_folder_name_trgm', 'folder', ('folder_name',)),
+    ('ix_email_template_email_type_trgm', 'email_template', ('email_type',)),
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, table, columns in SEARCH_INDEXES:
+        op.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} '
+                   f'USING gin (({search_document(columns)}) gin_trgm_ops)')
+
+
+def downgrade():
+    for index_name, _, _ in SEARCH_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
@@ -0,0 +1,47 @@
+"""composite indexes for account scoped filters
+
+Revision ID: 0048
+Revises: 0047
+Create Date: 2026-10-18 11:04:27.590113
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0048'
+down_revision = '0047'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_contract_account_uuid_folder_uuid_created_at_id', 'contract',
+                    ['account_uuid', 'folder_uuid', 'created_at', 'id'], unique=False)
+    op.create_index('ix_contract_account_uuid_status', 'contract', ['account_uuid', 'status'], unique=False)
+    op.create_index('ix_contract_signee_account_uuid_contract_uuid_client_uuid', 'contract_signee',
+                    ['account_uuid', 'contract_uuid', 'client_uuid'], unique=False)
+    op.create_index('ix_contract_signee_contract_uuid_status', 'contract_signee', ['contract_uuid', 'status'],
+                    unique=False)
+    op.create_index('ix_subscription_account_uuid_status', 'subscription', ['account_uuid', 'status'], unique=False)
+    op.create_index('ix_email_template_account_uuid_email_type', 'email_template', ['account_uuid', 'email_type'],
+                    unique=False)
+    op.create_index('ix_contract_log_account_uuid_contract_uuid', 'contract_log', ['account_uuid', 'contract_uuid'],
+                    unique=False)
+    op.create_index('ix_signee_account_uuid_client_uuid', 'signee', ['account_uuid', 'client_uuid'], unique=False)
+    op.create_index('ix_client_account_uuid_created_at_id', 'client', ['account_uuid', 'created_at', 'id'],
+                    unique=False)
+    # may already exist where benchmarks.keyset_pagination was run
+    op.execute('CREATE INDEX IF NOT EXISTS ix_folder_account_uuid_created_at_id ON folder (account_uuid, created_at, id)')
+
+
+def downgrade():
+    op.drop_index('ix_folder_account_uuid_created_at_id', table_name='folder')
+    op.drop_index('ix_client_account_uuid_created_at_id', table_name='client')
+    op.drop_index('ix_signee_account_uuid_client_uuid', table_name='signee')
+    op.drop_index('ix_contract_log_account_uuid_contract_uuid', table_name='contract_log')
+    op.drop_index('ix_email_template_account_uuid_email_type', table_name='email_template')
+    op.drop_index('ix_subscription_account_uuid_status', table_name='subscription')
+    op.drop_index('ix_contract_signee_contract_uuid_status', table_name='contract_signee')
+    op.drop_index('ix_contract_signee_account_uuid_contract_uuid_client_uuid', table_name='contract_signee')
+    op.drop_index('ix_contract_account_uuid_status', table_name='contract')
+    op.drop_index('ix_contract_account_uuid_folder_uuid_created_at_id', table_name='contract')
@@ -0,0 +1,102 @@
+"""audit_log partitioned by month of created_at
+
+Revision ID: 0049
+Revises: 0048
+Create Date: 2026-10-18 12:21:06.713941
+
+Existing rows are copied into the partitioned table, which takes a while on a large audit_log; rows without
+created_at get the migration time. Partitions are named audit_log_YYYY_MM like AuditLog.create_partitions, which
+keeps creating them (and dropping expired ones) from then on.
+"""
+from datetime import datetime
+from datetime import timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0049'
+down_revision = '0048'
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3
+COLUMNS = ('id, user_id, table_name, object_id, action, state_before, state_after, method, url, headers, body, args, '
+           'ip, created_at, updated_at')
+
+
+def add_months(month, months):
+    """First day (UTC midnight) of the month months after the month of given datetime."""
+    month_index = month.year * 12 + month.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def upgrade():
+    op.execute('ALTER TABLE audit_log RENAME TO audit_log_legacy')
+    op.execute('ALTER TABLE audit_log_legacy RENAME CONSTRAINT audit_log_pkey TO audit_log_legacy_pkey')
+    op.execute('UPDATE audit_log_legacy SET created_at = now() WHERE created_at IS NULL')
+    op.execute("""
+        CREATE TABLE audit_log (
+            id BIGINT NOT NULL DEFAULT nextval('audit_log_id_seq'),
+            user_id BIGINT,
+            table_name TEXT NOT NULL,
+            object_id VARCHAR,
+            action VARCHAR,
+            state_before JSON,
+            state_after JSON,
+            method VARCHAR,
+            url VARCHAR,
+            headers JSON,
+            body JSON,
+            args JSON,
+            ip VARCHAR,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT audit_log_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id')
+
+    now = datetime.now(tz=timezone.utc)
+    oldest = op.get_bind().execute(sa.text('SELECT min(created_at) FROM audit_log_legacy')).scalar() or now
+    op.execute('CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT')
+    month = add_months(oldest, 0)
+    while month <= add_months(now, PREMAKE_MONTHS):
+        op.execute(f"CREATE TABLE audit_log_{month:%Y_%m} PARTITION OF audit_log "
+                   f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')")
+        month = add_months(month, 1)
+
+    op.execute(f'INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_legacy')
+    op.execute('DROP TABLE audit_log_legacy')
+
+    op.create_index('ix_audit_log_created_at', 'audit_log', ['created_at'], unique=False)
+    op.create_index('ix_audit_log_user_id_created_at', 'audit_log', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_log_table_name_object_id', 'audit_log', ['table_name', 'object_id'], unique=False)
+
+
+def downgrade():
+    op.execute('ALTER TABLE audit_log RENAME TO audit_log_partitioned')
+    op.execute('ALTER TABLE audit_log_partitioned RENAME CONSTRAINT audit_log_pkey TO audit_log_partitioned_pkey')
+    op.execute("""
+        CREATE TABLE audit_log (
+            id BIGINT NOT NULL DEFAULT nextval('audit_log_id_seq'),
+            user_id BIGINT,
+            table_name TEXT NOT NULL,
+            object_id VARCHAR,
+            action VARCHAR,
+            state_before JSON,
+            state_after JSON,
+            method VARCHAR,
+            url VARCHAR,
+            headers JSON,
+            body JSON,
+            args JSON,
+            ip VARCHAR,
+            created_at TIMESTAMP WITH TIME ZONE,
+            updated_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT audit_log_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute('ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id')
+    op.execute(f'INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_partitioned')
+    op.execute('DROP TABLE audit_log_partitioned')
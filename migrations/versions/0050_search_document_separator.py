@@ -0,0 +1,50 @@
+"""join columns of search indexes with the unit separator
+
+Revision ID: 0050
+Revises: 0049
+Create Date: 2026-10-18 16:05:27.904512
+
+Multi column search documents join their columns with chr(31) instead of a space, so that a search never matches
+across the boundary of two columns. Their pg_trgm indexes are rebuilt on the new expression, single column indexes
+are unchanged.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0050'
+down_revision = '0049'
+branch_labels = None
+depends_on = None
+
+
+def search_document(columns, separator):
+    """Same expression as app.helpers.search.search_document, indexes are only used when expressions match."""
+    return f' || {separator} || '.join(f"coalesce({column}, '')" for column in columns)
+
+
+# index name, table, searched columns (app.helpers.search *_SEARCH_COLUMNS with more than one column)
+SEARCH_INDEXES = (
+    ('ix_contract_search_trgm', 'contract', ('purpose', 'brief')),
+    ('ix_client_search_trgm', 'client', ('legal_name', 'display_name', 'email', 'phone', 'street_name', 'postal_code',
+                                         'city', 'state', 'country')),
+    ('ix_account_search_trgm', 'account', ('legal_name', 'display_name', 'postal_code', 'address', 'city', 'state',
+                                           'country')),
+    ('ix_user_search_trgm', '"user"', ('first_name', 'last_name', 'email', 'mobile_number', 'user_type')),
+    ('ix_user_invite_search_trgm', 'user_invite', ('first_name', 'last_name', 'email', 'status')),
+)
+
+
+def rebuild_indexes(separator):
+    """Recreate multi column search indexes on documents joined with separator (SQL expression)."""
+    for index_name, table, columns in SEARCH_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+        op.execute(f'CREATE INDEX {index_name} ON {table} '
+                   f'USING gin (({search_document(columns, separator)}) gin_trgm_ops)')
+
+
+def upgrade():
+    rebuild_indexes('chr(31)')
+
+
+def downgrade():
+    rebuild_indexes("' '")
@@ -1,11 +1,19 @@
+import os
+import smtplib
+import tempfile
+import threading
 import traceback
 
 from app import app
 from app import config_data
 from app import logger
-from flask import render_template
 from flask_mail import Mail
 from flask_mail import Message
+from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
+from jinja2 import FileSystemLoader
+from jinja2 import select_autoescape
+from jinja2 import Template
 
 app.config['MAIL_SERVER'] = config_data['MAIL']['MAIL_SERVER']
 app.config['MAIL_PORT'] = config_data['MAIL']['MAIL_PORT']
@@ -16,21 +24,173 @@ app.config['MAIL_USE_SSL'] = config_data['MAIL']['MAIL_USE_SSL']
 app.config['MAIL_DEFAULT_SENDER'] = config_data['MAIL']['MAIL_DEFAULT_SENDER']
 mail = Mail(app)
 
+DEFAULT_MAIL_BATCH_SIZE = 50
+DEFAULT_MAIL_TEMPLATE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'mail_template_bytecode')
+MAIL_TEMPLATE_FOLDER = 'emails'
+
+_template_environment = None
+_template_environment_lock = threading.Lock()
+
+
+def get_mail_batch_size() -> int:
+    """Number of mails sent over one SMTP connection (MAIL.BATCH_SIZE in config.yml)."""
+    return int(config_data['MAIL'].get('BATCH_SIZE', DEFAULT_MAIL_BATCH_SIZE))
+
+
+def get_mail_template_cache_dir() -> str:
+    """Directory of compiled mail template bytecode (MAIL.TEMPLATE_CACHE_DIR in config.yml), shared by processes."""
+    return config_data['MAIL'].get('TEMPLATE_CACHE_DIR') or DEFAULT_MAIL_TEMPLATE_CACHE_DIR
+
+
+def get_mail_template_environment() -> Environment:
+    """
+        Return process wide Jinja environment of mail templates, created on first use. Unlike Flask's environment it
+        needs no app context, never checks template files for changes and keeps every compiled template in memory.
+        Bytecode is cached on disk, so a new process loads compiled templates instead of parsing them again.
+    """
+    global _template_environment
+    if _template_environment is None:
+        with _template_environment_lock:
+            if _template_environment is None:
+                cache_dir = get_mail_template_cache_dir()
+                os.makedirs(cache_dir, exist_ok=True)
+                _template_environment = Environment(
+                    loader=FileSystemLoader(os.path.join(app.root_path, app.template_folder)),
+                    autoescape=select_autoescape(['html', 'htm', 'xml']), auto_reload=False, cache_size=-1,
+                    bytecode_cache=FileSystemBytecodeCache(cache_dir))
+    return _template_environment
+
+
+def get_mail_template(template: str) -> Template:
+    """Return compiled mail template, e.g. 'emails/contract_cancelled.html'."""
+    return get_mail_template_environment().get_template(template)
+
+
+def preload_mail_templates() -> int:
+    """Compile every mail template (worker start), returns number of templates loaded."""
+    environment = get_mail_template_environment()
+    templates = environment.list_templates(filter_func=lambda name: name.startswith(MAIL_TEMPLATE_FOLDER + '/'))
+    for template in templates:
+        environment.get_template(template)
+    return len(templates)
+
+
+def render_mail_template(template: str, data: dict) -> str:
+    """Render mail template with data, same output as flask.render_template(template, data=data)."""
+    return get_mail_template(template).render(data=data)
+
+
+def render_mail_templates(template: str, data_list: list) -> list:
+    """Render one mail template for every data (per recipient context) in data_list."""
+    compiled_template = get_mail_template(template)
+    return [compiled_template.render(data=data) for data in data_list]
 
-def send_mail(email_to, subject, template, email_type, data):
-    """This method is used to send emails."""
-    try:
-        if isinstance(email_to, str):
-            email_to = [email_to]
 
-        msg = Message(subject, sender=(config_data['MAIL']['MAIL_DEFAULT_SENDER_NAME'],
-                                       config_data['MAIL']['MAIL_DEFAULT_SENDER']), recipients=email_to)
+def render_mail_batch(mail_list: list) -> list:
+    """
+        Render html of mails (dicts with template and email_data), None for mails that could not be rendered.
+        Mails are grouped by template, so a fan-out is rendered with one render_mail_templates call.
+    """
+    rendered = [None] * len(mail_list)
+    indexes_by_template = {}
+    for index, mail_data in enumerate(mail_list):
+        indexes_by_template.setdefault(mail_data.get('template'), []).append(index)
 
+    for template, indexes in indexes_by_template.items():
+        try:
+            htmls = render_mail_templates(template=template,
+                                          data_list=[mail_list[index].get('email_data', {}) for index in indexes])
+        except Exception as e:
+            logger.error('Unable to render mail template {} : {}'.format(template, e))
+            continue
+        for index, html in zip(indexes, htmls):
+            rendered[index] = html
+    return rendered
+
+
+def build_message(email_to, subject, template, data, html=None) -> Message:
+    """Create html Message for given template (or already rendered html), must be called inside app context."""
+    if isinstance(email_to, str):
+        email_to = [email_to]
+
+    msg = Message(subject, sender=(config_data['MAIL']['MAIL_DEFAULT_SENDER_NAME'],
+                                   config_data['MAIL']['MAIL_DEFAULT_SENDER']), recipients=email_to)
+    msg.html = html if html is not None else render_mail_template(template=template, data=data)
+    return msg
+
+
+def send_mail(email_to, subject, template, email_type, data):
+    """This method is used to send emails. Errors are logged and raised again so that queued mail jobs are retried."""
+    try:
         with app.app_context():
-            msg.html = render_template(template, data=data)
+            msg = build_message(email_to=email_to, subject=subject, template=template, data=data)
 
             response = mail.send(msg)
             logger.info('Mail sent successfully : {}'.format(response))
     except Exception as e:
         logger.error(traceback.format_exc())
         logger.error('Unable to send mail: ' + str(e))
+        raise
+
+
+def send_over_connection(connection, msg) -> bool:
+    """
+        Send message over open Flask-Mail connection. If the server dropped the connection, reconnect once and retry.
+        Returns False if message was rejected, raises if reconnecting fails.
+    """
+    try:
+        connection.send(msg)
+        return True
+    except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+        logger.info('SMTP connection lost, reconnecting: ' + str(e))
+        connection.host = connection.configure_host()
+    except smtplib.SMTPException as e:
+        # message rejected by the server (recipient, sender or data refused), connection is still usable
+        logger.error('Mail to {} rejected : {}'.format(msg.recipients, e))
+        return False
+
+    try:
+        connection.send(msg)
+        return True
+    except Exception as e:
+        logger.error('Unable to send mail to {} : {}'.format(msg.recipients, e))
+        return False
+
+
+def send_mail_batch(mail_list):
+    """
+        Send mails (dicts with email_to, subject, template, email_type, email_data) reusing one SMTP connection
+        (TLS handshake and login) for every MAIL.BATCH_SIZE mails. Templates of a batch are rendered with
+        render_mail_batch before connecting. Returns the mails that could not be sent.
+    """
+    failed = []
+    batch_size = get_mail_batch_size()
+    with app.app_context():
+        for start in range(0, len(mail_list), batch_size):
+            pending = list(mail_list[start:start + batch_size])
+            rendered = render_mail_batch(pending)
+            try:
+                with mail.connect() as connection:
+                    while pending:
+                        mail_data = pending[0]
+                        html = rendered[0]
+                        msg = None
+                        if html is not None:
+                            try:
+                                msg = build_message(email_to=mail_data.get('email_to'),
+                                                    subject=mail_data.get('subject'),
+                                                    template=mail_data.get('template'),
+                                                    data=mail_data.get('email_data', {}), html=html)
+                            except Exception as e:
+                                logger.error('Unable to build mail: ' + str(e))
+                        if msg is None or not send_over_connection(connection=connection, msg=msg):
+                            failed.append(mail_data)
+                        pending.pop(0)
+                        rendered.pop(0)
+            except Exception as e:
+                logger.error(traceback.format_exc())
+                logger.error('Unable to send mail batch: ' + str(e))
+                failed.extend(pending)
+
+    logger.info('Mail batch sent : {} mails, {} failed'.format(len(mail_list), len(failed)))
+    return failed
@@ -0,0 +1,27 @@
+"""
+    Process wide OpenAI client. The client owns an httpx connection pool, so sharing one instance keeps connections
+    (and TLS sessions) to the OpenAI API alive between requests instead of building a new pool per call.
+"""
+import threading
+
+import httpx
+from openai import OpenAI
+
+from app import config_data
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """Return shared OpenAI client, created on first use. OpenAI client is thread safe."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(
+                    api_key=config_data.get('OPEN_AI_KEY'),
+                    timeout=httpx.Timeout(
+                        600.0, read=300.0, write=300.0, connect=300.0),
+                )
+    return _client
@@ -0,0 +1,62 @@
+"""
+    Generates client bulk upload files (columns of ClientView.bulk_upload) for tests and benchmarks.
+
+    python tests/assets/client_workbook.py <path.xlsx|path.csv> [rows] [invalid_every] [duplicate_every]
+"""
+import csv
+import sys
+
+import pandas as pd
+
+
+def build_client_rows(row_count: int, invalid_every: int = 0, duplicate_every: int = 0, prefix: str = 'Client') -> list:
+    """
+        Build row_count client rows. Every invalid_every-th row has an invalid email and every duplicate_every-th row
+        repeats the legal name of the previous row (0 = none).
+    """
+    rows = []
+    for index in range(row_count):
+        legal_name = f'{prefix} {index}'
+        if duplicate_every and index and index % duplicate_every == 0:
+            legal_name = rows[-1]['legal_name']
+        rows.append({
+            'legal_name': legal_name,
+            'display_name': f'{prefix} Display {index}',
+            'email': f'client{index}.example.com' if invalid_every and index % invalid_every == invalid_every - 1
+            else f'Client{index}@Example.com',
+            'phone': 7000000000 + index,
+            'street_name': f'{index} Main Street',
+            'postal_code': 380015,
+            'city': 'Ahmedabad',
+            'state': 'Gujarat',
+            'country': 'India'
+        })
+    return rows
+
+
+def write_client_workbook(path: str, row_count: int, invalid_every: int = 0, duplicate_every: int = 0,
+                          prefix: str = 'Client') -> str:
+    """Write generated client rows to xlsx workbook at path and return path."""
+    rows = build_client_rows(row_count=row_count, invalid_every=invalid_every, duplicate_every=duplicate_every,
+                             prefix=prefix)
+    pd.DataFrame(rows).to_excel(path, index=False)
+    return path
+
+
+def write_client_csv(path: str, row_count: int, invalid_every: int = 0, duplicate_every: int = 0,
+                     prefix: str = 'Client') -> str:
+    """Write generated client rows to csv file at path and return path."""
+    rows = build_client_rows(row_count=row_count, invalid_every=invalid_every, duplicate_every=duplicate_every,
+                             prefix=prefix)
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+if __name__ == '__main__':
+    write_file = write_client_csv if sys.argv[1].endswith('.csv') else write_client_workbook
+    write_file(path=sys.argv[1], row_count=int(sys.argv[2]) if len(sys.argv) > 2 else 50000,
+               invalid_every=int(sys.argv[3]) if len(sys.argv) > 3 else 0,
+               duplicate_every=int(sys.argv[4]) if len(sys.argv) > 4 else 0)
@@ -2,8 +2,12 @@
     This file contains the configuration of settings and initialization of the testing framework for the project.
 """
 import json
+import threading
+import time
+from types import SimpleNamespace
 
 from slugify import slugify
+from sqlalchemy import event
 
 from app import app_set_configurations
 from app import config_data
@@ -371,3 +375,114 @@ def get_auth_token_by_user_type(client, is_super_admin):
     return auth_token
 
 
+class ConcurrencyTracker:
+    """Records threads used for section generation calls and the highest number of simultaneous section calls."""
+
+    def __init__(self, thread_name_prefix='ai-section'):
+        self.thread_name_prefix = thread_name_prefix
+        self.section_threads = set()
+        self.active_section_calls = 0
+        self.max_active_section_calls = 0
+        self.lock = threading.Lock()
+
+    def is_section_call(self):
+        """Section calls run on executor threads, heading calls run on the job thread."""
+        return threading.current_thread().name.startswith(self.thread_name_prefix)
+
+    def enter(self):
+        """Call started."""
+        if not self.is_section_call():
+            return
+        with self.lock:
+            self.section_threads.add(threading.current_thread().name)
+            self.active_section_calls += 1
+            self.max_active_section_calls = max(self.max_active_section_calls, self.active_section_calls)
+
+    def exit(self):
+        """Call finished."""
+        if not self.is_section_call():
+            return
+        with self.lock:
+            self.active_section_calls -= 1
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the engine while used as context manager."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        event.remove(self.engine, 'before_cursor_execute', self)
+
+
+class QueryRecorder(QueryCounter):
+    """Records (statement, parameters) of SELECT statements executed on the engine while used as context manager."""
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        super().__call__(conn, cursor, statement, parameters, context, executemany)
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append((statement, parameters))
+
+
+class FakeOpenAIClient:
+    """
+        Stand-in for openai.OpenAI used by AI generation tests, only chat.completions.create is implemented.
+        Section headings prompt returns `sections`, section prompts return a fixed section text and any other prompt
+        returns `Answer to <prompt>`. Every call sleeps `delay` seconds and is recorded in `tracker` when given.
+        With stream=True the text is returned as chunks, one word per chunk.
+    """
+
+    def __init__(self, sections=None, fail_sections=None, delay=0, tracker=None, chunk_delay=0):
+        self.sections = sections or ['Definitions', 'Term', 'Payment', 'Confidentiality', 'Termination',
+                                     'Liability', 'Governing Law']
+        self.fail_sections = fail_sections or []
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.tracker = tracker
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, model, **kwargs):
+        """Return response shaped like openai ChatCompletion."""
+        self.calls += 1
+        if self.tracker is not None:
+            self.tracker.enter()
+        try:
+            time.sleep(self.delay)
+            prompt = messages[-1]['content']
+            section = next((section for section in self.sections
+                            if prompt.startswith(f'Give me {section} section')), None)
+            if 'Section Headings' in prompt:
+                content = ', '.join(self.sections)
+            elif section is not None:
+                if section in self.fail_sections:
+                    raise Exception(f'Failed to generate {section}')
+                content = f'{section} content.\nSecond line.'
+            else:
+                content = f'Answer to {prompt}'
+        finally:
+            if self.tracker is not None:
+                self.tracker.exit()
+        if kwargs.get('stream'):
+            return self.stream(content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def stream(self, content):
+        """Yield content word by word shaped like openai ChatCompletionChunk, sleeping `chunk_delay` between chunks."""
+        for index, word in enumerate(content.split(' ')):
+            time.sleep(self.chunk_delay)
+            delta = word if index == 0 else ' ' + word
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
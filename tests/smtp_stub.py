@@ -0,0 +1,101 @@
+"""
+    Minimal local SMTP server used by mail tests and benchmarks. Accepts every message, counts connections and
+    messages, can drop the connection after a number of messages to exercise reconnects and can refuse recipients.
+"""
+import socketserver
+import threading
+import time
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Handle one SMTP session (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)."""
+
+    def reply(self, line):
+        """Send reply line to client."""
+        self.wfile.write((line + '\r\n').encode('utf-8'))
+
+    def handle(self):
+        """Run SMTP dialogue until QUIT or disconnect."""
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.connect_latency)
+        messages_on_connection = 0
+        self.reply('220 localhost SMTP stub')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ')[0].upper()
+            if verb == 'EHLO':
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif verb == 'RCPT' and command.partition(':')[2].strip().strip('<>') in server.reject_recipients:
+                self.reply('550 Mailbox unavailable')
+            elif verb in ('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                time.sleep(server.latency)
+                with server.lock:
+                    server.messages += 1
+                messages_on_connection += 1
+                self.reply('250 OK queued')
+                if server.drop_after and messages_on_connection >= server.drop_after:
+                    return
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+    """
+        Threaded SMTP sink on 127.0.0.1 and a free port.
+        latency: seconds spent per message, connect_latency: seconds spent per connection (emulates TLS and login),
+        drop_after: close connection after this many messages (0 = never), reject_recipients: addresses refused at RCPT.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency=0.0, connect_latency=0.0, drop_after=0, reject_recipients=()):
+        super().__init__(('127.0.0.1', 0), SMTPStubHandler)
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.drop_after = drop_after
+        self.reject_recipients = set(reject_recipients)
+        self.connections = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def port(self):
+        """Port the server listens on."""
+        return self.server_address[1]
+
+    def start(self):
+        """Serve in background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close socket."""
+        self.shutdown()
+        self.server_close()
+
+    def configure_mail(self, mail_state):
+        """Point Flask-Mail state (app.extensions['mail']) to this server."""
+        mail_state.server = '127.0.0.1'
+        mail_state.port = self.port
+        mail_state.use_tls = False
+        mail_state.use_ssl = False
+        mail_state.username = None
+        mail_state.password = None
+        mail_state.suppress = False
+        mail_state.max_emails = None
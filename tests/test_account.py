@@ -2,11 +2,20 @@
     This file contains the test cases for the Account module.
 """
 import pytest
+from app import config_data
+from app import db
+from app import r
 from app.helpers.constants import ResponseMessageKeys
+from app.helpers.constants import UserType
+from app.helpers.pagination import row_to_dict
+from app.helpers.principal_cache import get_principal
+from app.helpers.principal_cache import PRINCIPAL_KEY
 from app.helpers.utility import get_pagination_meta
 from app.models.account import Account
+from app.models.user import User
 from flask import jsonify
 from tests.conftest import get_auth_token_by_user_type
+from tests.conftest import TEST_USER_PRIMARY_EMAIL
 from tests.conftest import validate_response
 from tests.conftest import validate_status_code
 
@@ -31,13 +40,14 @@ def test_list(super_admin_client):
     q = None
     sort = 'asc'
 
-    account_objs, objects_count = Account.get_account_list(
+    account_objs, objects_count, next_cursor, count_strategy = Account.get_account_list(
         q=q, sort=sort, page=page, size=size)
-    account_list = [row._asdict() for row in account_objs]
+    account_list = [row_to_dict(row) for row in account_objs]
 
     data = {'result': jsonify(account_list).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                       page_size=int(size), total_items=objects_count)}
+                                                       page_size=int(size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
@@ -97,13 +107,14 @@ def test_list_download_false(super_admin_client):
     q = None
     sort = 'asc'
 
-    account_objs, objects_count = Account.get_account_list(
+    account_objs, objects_count, next_cursor, count_strategy = Account.get_account_list(
         q=q, sort=sort, page=page, size=size)
-    account_list = [row._asdict() for row in account_objs]
+    account_list = [row_to_dict(row) for row in account_objs]
 
     data = {'result': jsonify(account_list).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                       page_size=int(size), total_items=objects_count)}
+                                                       page_size=int(size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
@@ -114,6 +125,30 @@ def test_list_download_false(super_admin_client):
         expected=expected_response, received=api_response.json)
 
 
+def test_list_rows_leave_out_cursor_columns(super_admin_client):
+    """
+       TEST CASE: Account and user lists return the selected columns only, cursor key columns are left out
+       user : SUPER ADMIN
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=super_admin_client, is_super_admin=True)
+
+    for path, columns in (('account/list', {'id', 'uuid', 'legal_name', 'display_name', 'postal_code', 'address',
+                                            'city', 'state', 'country', 'first_name', 'last_name', 'user_uuid'}),
+                          ('user/list', {'first_name', 'last_name', 'email', 'mobile_number', 'user_type',
+                                         'legal_name'})):
+        for query_string in ('page=1&size=10', 'cursor=&size=10'):
+            api_response = super_admin_client.get(
+                f'/api/v1/{path}?{query_string}',
+                content_type='application/json',
+                headers={'Authorization': 'Bearer ' + auth_token}
+            )
+            assert validate_status_code(
+                expected=200, received=api_response.status_code)
+            for row in api_response.json['data']['result']:
+                assert set(row) == columns
+
+
 def test_list_negative_not_logged_in(super_admin_client):
     """
        TEST CASE: (Negative) Get Accounts
@@ -198,3 +233,27 @@ def test_initiate_delete_negative_invalid_account_uuid(user_client):
         expected=400, received=api_response.status_code)
     assert validate_response(
         expected=expected_response, received=api_response.json)
+
+
+def test_delete_invalidates_cached_principal(user_client, monkeypatch):
+    """
+       TEST CASE: Cached principal snapshot of a user is dropped when the delete of Base.delete_by_id is committed
+    """
+    monkeypatch.setitem(config_data, 'PRINCIPAL_CACHE', {'ENABLED': True})
+    account_uuid = User.get_by_email(TEST_USER_PRIMARY_EMAIL).account_uuid
+    email = 'principal.delete@project.com'
+    user_obj = User(uuid=User.create_uuid(), account_uuid=account_uuid, first_name='Principal', last_name='Delete',
+                    email=email, force_password_update=False, password='', user_type=UserType.SECONDARY_USER.value)
+    db.session.add(user_obj)
+    db.session.commit()
+
+    assert get_principal(email) is not None
+    assert r.exists(PRINCIPAL_KEY.format(email))
+
+    User.delete_by_id(user_obj.id)
+    # snapshot is dropped only once the delete is committed
+    assert r.exists(PRINCIPAL_KEY.format(email))
+    db.session.commit()
+
+    assert not r.exists(PRINCIPAL_KEY.format(email))
+    assert get_principal(email) is None
@@ -1,9 +1,12 @@
 """
     This file contains the test cases for the ai popup module.
 """
+import json
 
 from app.helpers.constants import ResponseMessageKeys
 from app.helpers.constants import ValidationMessages
+from providers import openai_client
+from tests.conftest import FakeOpenAIClient
 from tests.conftest import get_auth_token_by_user_type
 from tests.conftest import validate_response
 from tests.conftest import validate_status_code
@@ -34,6 +37,100 @@ def test_get_ai_popup_response(user_client):
         expected=expected_response, received=api_response.json)
 
 
+def parse_server_sent_events(body):
+    """Return list of (event, data) tuples from text/event-stream body."""
+    events = []
+    for block in body.strip().split('\n\n'):
+        event = 'message'
+        for line in block.split('\n'):
+            if line.startswith('event: '):
+                event = line[len('event: '):]
+            elif line.startswith('data: '):
+                events.append((event, json.loads(line[len('data: '):])))
+    return events
+
+
+def test_get_ai_popup_response_fake_client(user_client, monkeypatch):
+    """
+        TEST CASE: Get AI popup response from shared OpenAI client
+    """
+    fake_client = FakeOpenAIClient()
+    monkeypatch.setattr(openai_client, 'get_openai_client', lambda: fake_client)
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    data = {
+        'query': 'Generate me a disclaimer for Use of Information'
+    }
+
+    expected_response = {'data': {'answer': 'Answer to Generate me a disclaimer for Use of Information'},
+                         'message': ResponseMessageKeys.SUCCESS.value, 'status': True}
+
+    api_response = user_client.post(
+        '/api/v1/contract/get-ai-popup-response', json=data, content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
+
+
+def test_get_ai_popup_response_stream(user_client, monkeypatch):
+    """
+        TEST CASE: Get AI popup response streamed as Server-Sent Events
+    """
+    fake_client = FakeOpenAIClient(chunk_delay=0.01)
+    monkeypatch.setattr(openai_client, 'get_openai_client', lambda: fake_client)
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    data = {
+        'query': 'Generate me a disclaimer for Use of Information',
+        'stream': True
+    }
+
+    api_response = user_client.post(
+        '/api/v1/contract/get-ai-popup-response', json=data, content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}, buffered=False
+    )
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert api_response.mimetype == 'text/event-stream'
+    events = parse_server_sent_events(api_response.get_data(as_text=True))
+    answer = 'Answer to Generate me a disclaimer for Use of Information'
+    deltas = [data['delta'] for event, data in events if event == 'message']
+    assert deltas == ['Answer'] + [' ' + word for word in answer.split(' ')[1:]]
+    event, done = events[-1]
+    assert event == 'done'
+    assert done['answer'] == answer
+    assert 0 < done['ttfb_ms'] <= done['total_ms']
+
+
+def test_get_ai_popup_response_stream_error(user_client, monkeypatch):
+    """
+        TEST CASE: (Negative) Get AI popup response stream when OpenAI call fails
+    """
+    def failing_client():
+        raise Exception('OpenAI is not available')
+
+    monkeypatch.setattr(openai_client, 'get_openai_client', failing_client)
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.post(
+        '/api/v1/contract/get-ai-popup-response', json={'query': 'Generate me a disclaimer', 'stream': True},
+        content_type='application/json', headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert parse_server_sent_events(api_response.get_data(as_text=True)) == [
+        ('error', {'answer': 'Oops something went.'})]
+
+
 def test_get_ai_popup_response_negative_no_query(user_client):
     """
     TEST CASE: (Negative)Get AI popup response without required field query
@@ -0,0 +1,119 @@
+"""This file contains the test cases for the audit_log partitions and audit log writer."""
+from datetime import datetime
+from datetime import timezone
+import hashlib
+
+from app import db
+from app.helpers.audit_policy import AuditPolicy
+from app.helpers.constants import DatabaseAction
+from app.models.audit_event import AuditableEvent
+from app.models.audit_log import AUDIT_LOG_DEFAULT_PARTITION
+from app.models.audit_log import AuditLog
+from app.models.audit_log import get_audit_log_config
+from app.models.user import User
+from sqlalchemy import inspect
+from sqlalchemy import text
+from tests.conftest import QueryCounter
+from tests.conftest import TEST_USER_PRIMARY_EMAIL
+
+
+def test_partitions_created_with_table(user_client):
+    """
+    TEST CASE: Default partition and partitions of this and the coming months exist and receive the audit logs
+    """
+    now = datetime.now(tz=timezone.utc)
+    partition_names = AuditLog.get_partition_names(db.session.connection())
+
+    assert AUDIT_LOG_DEFAULT_PARTITION in partition_names
+    assert f'audit_log_{now:%Y_%m}' in partition_names
+    assert len(partition_names) == get_audit_log_config()['PREMAKE_MONTHS'] + 2
+
+    db.session.execute(AuditLog.__table__.insert().values(table_name='client', object_id='1', action='create'))
+    db.session.commit()
+    assert db.session.execute(text(f'SELECT count(*) FROM audit_log_{now:%Y_%m}')).scalar() == 1
+    assert db.session.execute(text(f'SELECT count(*) FROM {AUDIT_LOG_DEFAULT_PARTITION}')).scalar() == 0
+
+
+def test_drop_expired_partitions(user_client):
+    """
+    TEST CASE: Partitions older than retention are dropped, recent and default partitions are kept
+    """
+    connection = db.session.connection()
+    now = datetime.now(tz=timezone.utc)
+    AuditLog.create_partitions(connection=connection, start=datetime(2020, 1, 15, tzinfo=timezone.utc), months=2)
+    assert {'audit_log_2020_01', 'audit_log_2020_02'} <= set(AuditLog.get_partition_names(connection))
+
+    dropped = AuditLog.drop_expired_partitions(connection=connection, retention_months=12, now=now)
+    db.session.commit()
+
+    partition_names = AuditLog.get_partition_names(db.session.connection())
+    assert dropped == ['audit_log_2020_01', 'audit_log_2020_02']
+    assert 'audit_log_2020_01' not in partition_names
+    assert AUDIT_LOG_DEFAULT_PARTITION in partition_names
+    assert f'audit_log_{now:%Y_%m}' in partition_names
+
+
+def test_audit_records_written_at_commit(user_client):
+    """
+    TEST CASE: Audit logs of a transaction are buffered and written with one INSERT at commit
+    """
+    before_count = db.session.query(AuditLog).count()
+    for object_id in range(3):
+        AuditableEvent.create_audit(connection=None, object_type='client', object_id=str(object_id),
+                                    action=DatabaseAction.UPDATE.value, state_before={'city': 'A'},
+                                    state_after={'city': 'B'}, session=db.session)
+    assert db.session.query(AuditLog).count() == before_count
+
+    with QueryCounter(db.engine) as counter:
+        db.session.commit()
+
+    assert counter.count == 1
+    assert db.session.query(AuditLog).count() == before_count + 3
+
+
+def test_audit_records_discarded_on_rollback(user_client):
+    """
+    TEST CASE: Audit logs buffered in a rolled back transaction are not written
+    """
+    before_count = db.session.query(AuditLog).count()
+    AuditableEvent.create_audit(connection=None, object_type='client', object_id='1',
+                                action=DatabaseAction.DELETE.value, session=db.session)
+    db.session.rollback()
+    db.session.commit()
+
+    assert db.session.query(AuditLog).count() == before_count
+
+
+def test_audit_policy_compacts_payload(user_client):
+    """
+    TEST CASE: Audit policy hashes long text and keeps only allowed headers
+    """
+    policy = AuditPolicy(max_text_length=10)
+    long_text = '<p>{}</p>'.format('x' * 100)
+
+    assert policy.compact({'content': long_text, 'items': ['short']}) == {
+        'content': {'sha256': hashlib.sha256(long_text.encode('utf-8')).hexdigest(), 'length': len(long_text)},
+        'items': ['short']}
+
+    request_state = policy.request_state({'user_id': 1, 'method': 'POST', 'url': '', 'ip': '',
+                                          'headers': {'Authorization': 'Bearer token', 'User-Agent': 'pytest'},
+                                          'body': {'content': long_text}, 'args': {}})
+    assert request_state['headers'] == {'User-Agent': 'pytest'}
+    assert request_state['body']['content']['length'] == len(long_text)
+
+
+def test_audit_update_diff(user_client):
+    """
+    TEST CASE: Update diff holds changed audited columns only, excluded columns are left out
+    """
+    user_obj = User.get_by_email(TEST_USER_PRIMARY_EMAIL)
+    first_name = user_obj.first_name
+    user_obj.first_name = first_name + ' Updated'
+    user_obj.password = 'changed'
+
+    state_before, state_after = AuditableEvent.get_update_diff(inspect(User), user_obj,
+                                                               policy=AuditPolicy(exclude_fields=('password',)))
+    db.session.rollback()
+
+    assert state_before == {'first_name': first_name}
+    assert state_after == {'first_name': first_name + ' Updated'}
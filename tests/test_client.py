@@ -1,13 +1,25 @@
 """This file contains the test cases for the client module."""
+import os
+
+import pandas as pd
 import pytest
 
+from app import config_data
 from app.helpers.constants import ResponseMessageKeys
+from app.helpers import client_import
+from app.helpers.client_import import read_client_chunks
+from app.helpers.client_import import validate_client_frame
+from app.helpers.constants import ClientImportStatus
 from app.helpers.constants import ValidationMessages
 from app.helpers.utility import get_pagination_meta
 from app.models.client import Client
 from app.models.user import User
+from app.views import client_view
 from flask import jsonify
 from slugify import slugify
+from tests.assets.client_workbook import build_client_rows
+from tests.assets.client_workbook import write_client_csv
+from tests.assets.client_workbook import write_client_workbook
 from tests.conftest import CLIENT_CITY
 from tests.conftest import CLIENT_COUNTRY
 from tests.conftest import CLIENT_DISPLAY_NAME
@@ -1367,13 +1379,14 @@ def test_list(user_client):
     sort = 'asc'
 
     account_uuid = user_obj.account_uuid
-    client_objs, objects_count = Client.get_all_by_account_uuid(q=q, sort=sort, page=page, size=size,
+    client_objs, objects_count, next_cursor, count_strategy = Client.get_all_by_account_uuid(q=q, sort=sort, page=page, size=size,
                                                                 account_uuid=account_uuid)
     client_list = Client.serialize(client_objs)
 
     data = {'result': jsonify(client_list).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                       page_size=int(size), total_items=objects_count)}
+                                                       page_size=int(size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
@@ -1384,6 +1397,33 @@ def test_list(user_client):
         expected=expected_response, received=api_response.json)
 
 
+def test_list_search(user_client):
+    """
+    TEST CASE: Search clients with q, case-insensitive and matching % and _ literally
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    def search(q):
+        api_response = user_client.get(
+            '/api/v1/client/list', query_string={'page': 1, 'size': 10, 'sort': 'asc', 'q': q},
+            content_type='application/json',
+            headers={'Authorization': 'Bearer ' + auth_token}
+        )
+        assert validate_status_code(
+            expected=200, received=api_response.status_code)
+        return [client['email'] for client in api_response.json['data']['result']]
+
+    assert CLIENT_EMAIL in search(CLIENT_LEGAL_NAME.lower())
+    assert CLIENT_EMAIL in search(CLIENT_DISPLAY_NAME.upper())
+    assert CLIENT_EMAIL in search(CLIENT_EMAIL.split('@')[0])
+    assert CLIENT_EMAIL not in search(CLIENT_EMAIL.replace('.', '_'))
+    assert search('%') == []
+    # q is matched within one column, never across legal name and display name
+    assert CLIENT_EMAIL not in search(f'{CLIENT_LEGAL_NAME} {CLIENT_DISPLAY_NAME}')
+
+
 def test_list_negative_not_logged_in(user_client):
     """
     TEST CASE: (Negative) Get clients but USER not logged-in
@@ -1468,3 +1508,225 @@ def test_get_by_uuid_negative_client_not_found(user_client):
         expected=200, received=api_response.status_code)
     assert validate_response(
         expected=expected_response, received=api_response.json)
+
+
+def upload_client_workbook(user_client, auth_token: str, path: str):
+    """Post workbook to bulk upload API and return response of import job status API."""
+    with open(path, 'rb') as workbook:
+        api_response = user_client.post(
+            '/api/v1/client/bulk-upload', data={'clients_data': (workbook, os.path.basename(path))},
+            content_type='multipart/form-data',
+            headers={'Authorization': 'Bearer ' + auth_token}
+        )
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert api_response.json['message'] == ResponseMessageKeys.CLIENT_IMPORT_STARTED.value
+
+    return user_client.get(
+        '/api/v1/client/bulk-upload/' + api_response.json['data']['job_id'],
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+
+def test_bulk_upload(user_client, tmp_path):
+    """
+    TEST CASE: Bulk upload clients from Excel file
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    account_uuid = User.get_by_email(TEST_USER_PRIMARY_EMAIL).account_uuid
+    clients_before = len(Client.get_legal_name_slugs(account_uuid=account_uuid))
+    path = write_client_workbook(path=str(tmp_path / 'clients.xlsx'), row_count=20, prefix='Bulk')
+
+    api_response = upload_client_workbook(user_client=user_client, auth_token=auth_token, path=path)
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert api_response.json['data']['status'] == ClientImportStatus.COMPLETED.value
+    assert api_response.json['data']['rows_total'] == 20
+    assert api_response.json['data']['rows_processed'] == 20
+    assert api_response.json['data']['rows_failed'] == 0
+    assert api_response.json['data']['error_file'] is None
+    assert len(Client.get_legal_name_slugs(account_uuid=account_uuid)) == clients_before + 20
+    assert Client.check_if_client_exits(account_uuid=account_uuid, legal_name_slug=slugify('Bulk 19'))
+
+
+def test_bulk_upload_negative_invalid_rows(user_client, tmp_path, monkeypatch):
+    """
+    TEST CASE: Bulk upload inserts valid rows and returns error workbook for invalid and duplicate rows
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    account_uuid = User.get_by_email(TEST_USER_PRIMARY_EMAIL).account_uuid
+    clients_before = len(Client.get_legal_name_slugs(account_uuid=account_uuid))
+    error_files = []
+    monkeypatch.setattr(client_import, 'upload_file_and_get_object_details',
+                        lambda file_path, file_name, s3_folder_path: error_files.append(file_path) or file_name)
+    monkeypatch.setattr(client_view, 'get_presigned_url', lambda path: 'https://s3/' + path)
+    monkeypatch.setitem(config_data, 'CLIENT_IMPORT', {'CHUNK_SIZE': 4})
+    # rows 4 and 9 have invalid email, row 8 repeats legal name of row 7 (in another chunk)
+    path = write_client_workbook(path=str(tmp_path / 'clients.xlsx'), row_count=10, invalid_every=5, duplicate_every=4,
+                                 prefix='Bulk Errors')
+
+    api_response = upload_client_workbook(user_client=user_client, auth_token=auth_token, path=path)
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert api_response.json['data']['status'] == ClientImportStatus.COMPLETED.value
+    assert api_response.json['data']['rows_processed'] == 10
+    assert api_response.json['data']['rows_failed'] == 3
+    assert api_response.json['data']['error_file'].startswith('https://s3/error_client_data_')
+    error_rows = pd.read_excel(error_files[0]).to_dict(orient='records')
+    assert [row['error'] for row in error_rows] == [
+        ResponseMessageKeys.INVALID_EMAIL_FORMAT.value,
+        ResponseMessageKeys.CLIENT_ALREADY_EXISTS.value.format('Bulk Errors 7'),
+        ResponseMessageKeys.INVALID_EMAIL_FORMAT.value
+    ]
+    assert len(Client.get_legal_name_slugs(account_uuid=account_uuid)) == clients_before + 7
+
+
+def test_bulk_upload_status_negative_job_not_found(user_client):
+    """
+    TEST CASE: Get client import job status - job does not exist
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.get(
+        '/api/v1/client/bulk-upload/' + '1234',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    expected_response = {
+        'message': ResponseMessageKeys.CLIENT_IMPORT_JOB_NOT_FOUND.value, 'status': False}
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
+
+
+def test_validate_client_frame_type_and_required_errors(user_client):
+    """
+    TEST CASE: Client rows with wrong types or missing values are rejected with validator messages
+    """
+    rows = build_client_rows(row_count=3, prefix='Frame')
+    rows[0]['phone'] = 'not a number'
+    rows[1]['city'] = None
+    existing_slugs = {slugify('Frame 2')}
+
+    clients, error_data_list = validate_client_frame(df=pd.DataFrame(rows), existing_slugs=existing_slugs)
+
+    assert clients == []
+    assert [row['error'] for row in error_data_list] == [
+        {'phone': 'Phone should be integer value.'},
+        {'city': 'City is required.'},
+        ResponseMessageKeys.CLIENT_ALREADY_EXISTS.value.format('Frame 2')
+    ]
+
+
+def test_validate_client_frame_keeps_integer_text(user_client):
+    """
+    TEST CASE: Phone and postal code cells are stored as typed, leading zeros included
+    """
+    rows = build_client_rows(row_count=2, prefix='Zero')
+    rows[0]['postal_code'] = ' 02134 '
+    rows[0]['phone'] = '+917000000000'
+    rows[1]['postal_code'] = 2134.0
+
+    clients, error_data_list = validate_client_frame(df=pd.DataFrame(rows), existing_slugs=set())
+
+    assert error_data_list == []
+    assert [client['postal_code'] for client in clients] == ['02134', '2134']
+    assert clients[0]['phone'] == '+917000000000'
+
+
+def test_validate_client_frame_non_integer_values(user_client):
+    """
+    TEST CASE: Non finite and fractional phone or postal code values are rejected as type errors
+    """
+    rows = build_client_rows(row_count=3, prefix='Finite')
+    rows[0]['phone'] = 'inf'
+    rows[1]['postal_code'] = float('inf')
+    rows[2]['postal_code'] = '12.5'
+
+    clients, error_data_list = validate_client_frame(df=pd.DataFrame(rows), existing_slugs=set())
+
+    assert clients == []
+    assert [row['error'] for row in error_data_list] == [
+        {'phone': 'Phone should be integer value.'},
+        {'postal_code': 'Postal Code should be integer value.'},
+        {'postal_code': 'Postal Code should be integer value.'}
+    ]
+    assert error_data_list[0]['phone'] == 'inf'
+
+
+def test_error_workbook_writer_streams_chunks(user_client, tmp_path, monkeypatch):
+    """
+    TEST CASE: Rejected rows of every chunk are appended to one error workbook on disk
+    """
+    monkeypatch.setitem(config_data, 'UPLOAD_FOLDER', str(tmp_path))
+    rows = build_client_rows(row_count=5, invalid_every=1, prefix='Writer')
+    error_writer = client_import.ErrorWorkbookWriter()
+    assert error_writer.save() is None
+
+    for start in (0, 3):
+        _, error_data_list = validate_client_frame(df=pd.DataFrame(rows[start:start + 3]), existing_slugs=set())
+        error_writer.write_rows(error_data_list)
+
+    assert error_writer.rows_written == 5
+    error_rows = pd.read_excel(error_writer.save()).to_dict(orient='records')
+    assert [row['legal_name'] for row in error_rows] == [f'Writer {index}' for index in range(5)]
+    assert {row['error'] for row in error_rows} == {ResponseMessageKeys.INVALID_EMAIL_FORMAT.value}
+
+
+def test_bulk_upload_csv(user_client, tmp_path):
+    """
+    TEST CASE: Bulk upload clients from csv file
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    account_uuid = User.get_by_email(TEST_USER_PRIMARY_EMAIL).account_uuid
+    path = write_client_csv(path=str(tmp_path / 'clients.csv'), row_count=5, prefix='Bulk Csv')
+
+    api_response = upload_client_workbook(user_client=user_client, auth_token=auth_token, path=path)
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert api_response.json['data']['status'] == ClientImportStatus.COMPLETED.value
+    assert api_response.json['data']['rows_total'] == 5
+    assert api_response.json['data']['rows_failed'] == 0
+    client_obj = Client.query.filter(Client.account_uuid == account_uuid,
+                                     Client.legal_name_slug == slugify('Bulk Csv 4')).first()
+    assert client_obj.phone == '7000000004'
+    assert client_obj.postal_code == '380015'
+    assert client_obj.email == 'client4@example.com'
+
+
+def test_read_client_chunks_xlsx_and_csv(user_client, tmp_path):
+    """
+    TEST CASE: xlsx and csv files are read in chunks and validate to the same clients
+    """
+    xlsx_path = write_client_workbook(path=str(tmp_path / 'clients.xlsx'), row_count=7, prefix='Chunk')
+    csv_path = write_client_csv(path=str(tmp_path / 'clients.csv'), row_count=7, prefix='Chunk')
+
+    validated = []
+    for path in (xlsx_path, csv_path):
+        chunks = list(read_client_chunks(path=path, chunk_size=3))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        existing_slugs = set()
+        clients = []
+        for chunk in chunks:
+            chunk_clients, error_data_list = validate_client_frame(df=chunk, existing_slugs=existing_slugs)
+            assert error_data_list == []
+            clients.extend(chunk_clients)
+        validated.append(clients)
+
+    assert validated[0] == validated[1]
+    assert validated[0][6]['phone'] == '7000000006'
@@ -1,12 +1,25 @@
 """This file contains the test cases for the contract module."""
+import os
+import threading
+import uuid
+
 import pytest
 
 from app.helpers.constants import ResponseMessageKeys, CurrencyCode
+from app.helpers.constants import AIGenerationStatus, DEFAULT_SECTIONS, DEFAULT_SECTION_DICT
+from app.helpers.constants import ContractPdfStatus
+from app.helpers.ai_cache import get_ai_cache_stats
+from app.helpers.constants import CountStrategy
+from app.helpers.pagination import count_cache_key
+from app.helpers.constants import UserType
 from app.helpers.constants import ValidationMessages
+from app.helpers.constants import ContractMailStatus, ContractStatus, EmailSubject, EmailTypes, SEND_REMINDER_TO_SIGNEE
 from app.helpers.utility import get_pagination_meta
 from app.models.client import Client
 from app.models.contract import Contract
+from app.models.contract_log import ContractLog
 from app.models.contract_signee import ContractSignee
+from app.models.email_template import EmailTemplate
 from app.models.signee import Signee
 from app.models.user import User
 from flask import jsonify
@@ -16,12 +29,26 @@ from tests.conftest import CONTRACT_BRIEF
 from tests.conftest import CONTRACT_SERVICE_NAME
 from tests.conftest import CONTRACT_DURATION
 from tests.conftest import CONTRACT_AMOUNT
+from tests.conftest import ConcurrencyTracker
+from tests.conftest import FakeOpenAIClient
 from tests.conftest import get_auth_token_by_user_type
+from tests.conftest import QueryCounter
 from tests.conftest import TEST_USER_PRIMARY_EMAIL
 from tests.conftest import validate_response
 from tests.conftest import validate_status_code
 from app.models.folder import Folder
+from app import config_data
+from app import db
 from app import logger
+from app import r
+from app.views import contract_view
+from app.views.contract_view import ContractView
+from workers.email_worker import EmailWorker
+from workers import contract_ai_worker
+from workers.contract_ai_worker import ContractAIWorker
+from workers import contract_pdf_worker
+from workers.contract_pdf_worker import CONTRACT_PDF_OBJECT_KEY
+from workers.contract_pdf_worker import ContractPdfWorker
 
 
 @pytest.mark.run(order=8)
@@ -1460,13 +1487,14 @@ def test_list_with_folder_uuid(user_client):
     q = None
     sort = 'asc'
 
-    contract_objs, objects_count = Contract.get_contracts_list(account_uuid=account_uuid, folder_uuid=folder_uuid, q=q, sort=sort, page=page,
+    contract_objs, objects_count, next_cursor, count_strategy = Contract.get_contracts_list(account_uuid=account_uuid, folder_uuid=folder_uuid, q=q, sort=sort, page=page,
                                                                size=size)
-    contract_list = Contract.serialize(contract_objs)
+    contract_list = Contract.serialize(contract_objs, summary=True)
 
     data = {'result': jsonify(contract_list).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                       page_size=int(size), total_items=objects_count)}
+                                                       page_size=int(size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
@@ -1499,13 +1527,14 @@ def test_list_without_folder_uuid(user_client):
     sort = 'asc'
 
     account_uuid = user_obj.account_uuid
-    contract_objs, objects_count = Contract.get_contracts_list(account_uuid=account_uuid, q=q, sort=sort, page=page,
+    contract_objs, objects_count, next_cursor, count_strategy = Contract.get_contracts_list(account_uuid=account_uuid, q=q, sort=sort, page=page,
                                                                size=size)
-    contract_list = Contract.serialize(contract_objs)
+    contract_list = Contract.serialize(contract_objs, summary=True)
 
     data = {'result': jsonify(contract_list).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                       page_size=int(size), total_items=objects_count)}
+                                                       page_size=int(size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
@@ -1516,6 +1545,223 @@ def test_list_without_folder_uuid(user_client):
         expected=expected_response, received=api_response.json)
 
 
+def test_list_query_count_independent_of_page_size(user_client):
+    """
+    TEST CASE: Contract list runs the same number of queries for 1 and 5 contracts per page
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    contract_obj = Contract.get_by_id(1)
+    # every contract has its own creator and client, so loading relations per row would add queries per contract
+    for index in range(5):
+        user_obj = User(uuid=User.create_uuid(), account_uuid=contract_obj.account_uuid, first_name='Query',
+                        last_name=f'Count {index}', email=f'query.count{index}@project.com',
+                        force_password_update=False, password='', user_type=UserType.SECONDARY_USER.value)
+        client_obj = Client(uuid=Client.create_uuid(), account_uuid=contract_obj.account_uuid,
+                            created_by=user_obj.uuid, legal_name=f'Query Count {index}',
+                            legal_name_slug=f'query-count-{index}', display_name=f'Query Count {index}',
+                            email=f'query.count.client{index}@project.com', phone='7000000000')
+        db.session.add(user_obj)
+        db.session.add(client_obj)
+        db.session.commit()
+        Contract.add({'uuid': Contract.create_uuid(), 'account_uuid': contract_obj.account_uuid,
+                      'created_by': user_obj.uuid, 'purpose': contract_obj.purpose,
+                      'client_uuid': client_obj.uuid, 'folder_uuid': contract_obj.folder_uuid,
+                      'content': contract_obj.content, 'signed_content': contract_obj.signed_content,
+                      'brief': contract_obj.brief, 'status': ContractStatus.DRAFT.value})
+
+    query_counts = {}
+    for size in (1, 5):
+        # start from an empty identity map so that relations already loaded by earlier tests are not reused
+        db.session.expunge_all()
+        with QueryCounter(db.engine) as query_counter:
+            # newest first, so both pages list the contracts created above
+            api_response = user_client.get(
+                f'/api/v1/contract/list?page=1&size={size}&sort=desc',
+                content_type='application/json',
+                headers={'Authorization': 'Bearer ' + auth_token}
+            )
+        assert validate_status_code(
+            expected=200, received=api_response.status_code)
+        assert len(api_response.json['data']['result']) == size
+        result = api_response.json['data']['result']
+        assert len({contract['created_by']['uuid'] for contract in result}) == size
+        assert len({contract['client_uuid']['uuid'] for contract in result}) == size
+        query_counts[size] = query_counter.count
+
+    assert query_counts[1] == query_counts[5]
+
+
+def test_list_omits_contract_content(user_client):
+    """
+    TEST CASE: Contract list leaves out content and signed_content, contract get still returns them
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    list_response = user_client.get(
+        '/api/v1/contract/list?page=1&size=10&sort=asc',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+    contract = list_response.json['data']['result'][0]
+    assert 'content' not in contract
+    assert 'signed_content' not in contract
+
+    get_response = user_client.get(
+        f'/api/v1/contract/get/{contract["uuid"]}',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+    assert validate_status_code(
+        expected=200, received=get_response.status_code)
+    assert get_response.json['data'][0]['content'] == Contract.get_by_uuid(contract['uuid']).content
+
+
+def test_list_with_cursor(user_client):
+    """
+    TEST CASE: Walking contract list with next_cursor returns the same contracts in the same order as offset mode
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    headers = {'Authorization': 'Bearer ' + auth_token}
+
+    offset_response = user_client.get('/api/v1/contract/list?page=1&size=1000&sort=asc',
+                                      content_type='application/json', headers=headers)
+    expected_uuids = [contract['uuid'] for contract in offset_response.json['data']['result']]
+
+    cursor_uuids = []
+    cursor = ''
+    while cursor is not None:
+        api_response = user_client.get(f'/api/v1/contract/list?size=2&sort=asc&cursor={cursor}',
+                                       content_type='application/json', headers=headers)
+        assert validate_status_code(
+            expected=200, received=api_response.status_code)
+        pagination_metadata = api_response.json['data']['pagination_metadata']
+        assert pagination_metadata['total_items'] is None
+        cursor_uuids.extend(contract['uuid'] for contract in api_response.json['data']['result'])
+        cursor = pagination_metadata['next_cursor']
+
+    assert len(expected_uuids) > 2
+    assert cursor_uuids == expected_uuids
+
+
+def test_list_negative_invalid_cursor(user_client):
+    """
+    TEST CASE: (Negative) Get contracts with cursor which can not be decoded
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.get(
+        '/api/v1/contract/list?size=10&sort=asc&cursor=invalid',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    expected_response = {'message': ResponseMessageKeys.INVALID_CURSOR.value,
+                         'status': False}
+
+    assert validate_status_code(
+        expected=400, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
+
+
+def get_contract_list_metadata(user_client, auth_token, query_string):
+    """Call contract list API and return its pagination metadata."""
+    api_response = user_client.get(
+        f'/api/v1/contract/list?{query_string}',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    return api_response.json['data']['pagination_metadata']
+
+
+def test_list_cached_count(user_client):
+    """
+    TEST CASE: Cached count is reused until a contract is added with Contract.add or deleted with Contract.delete_by_id
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    contract_obj = Contract.get_by_id(1)
+    r.delete(count_cache_key(table=Contract.__tablename__, scope=contract_obj.account_uuid))
+    contract_data = {'account_uuid': contract_obj.account_uuid, 'created_by': contract_obj.created_by,
+                     'purpose': contract_obj.purpose, 'client_uuid': contract_obj.client_uuid,
+                     'folder_uuid': contract_obj.folder_uuid, 'content': contract_obj.content,
+                     'signed_content': contract_obj.signed_content, 'brief': contract_obj.brief,
+                     'status': ContractStatus.DRAFT.value}
+
+    pagination_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10&count=cached')
+    assert pagination_metadata['count_strategy'] == CountStrategy.CACHED.value
+    total_items = pagination_metadata['total_items']
+
+    # added without Base.add, cached count is not invalidated
+    db.session.add(Contract(uuid=Contract.create_uuid(), **contract_data))
+    db.session.commit()
+    pagination_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10&count=cached')
+    assert pagination_metadata['total_items'] == total_items
+
+    added_contract = Contract.add(dict(contract_data, uuid=Contract.create_uuid()))
+    pagination_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10&count=cached')
+    assert pagination_metadata['total_items'] == total_items + 2
+
+    # cached count is dropped when the delete is committed
+    Contract.delete_by_id(added_contract.id)
+    db.session.commit()
+    pagination_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10&count=cached')
+    assert pagination_metadata['total_items'] == total_items + 1
+
+
+def test_list_estimated_count(user_client, monkeypatch):
+    """
+    TEST CASE: Estimated count is used only for large results, small results are counted exactly
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    exact_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10')
+
+    pagination_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10&count=estimated')
+    assert pagination_metadata['count_strategy'] == CountStrategy.EXACT.value
+    assert pagination_metadata['total_items'] == exact_metadata['total_items']
+
+    monkeypatch.setitem(config_data, 'PAGINATION_COUNT', {'ESTIMATE_MIN_ROWS': 0})
+    pagination_metadata = get_contract_list_metadata(user_client, auth_token, 'page=1&size=10&count=estimated')
+    assert pagination_metadata['count_strategy'] == CountStrategy.ESTIMATED.value
+    assert isinstance(pagination_metadata['total_items'], int)
+
+
+def test_list_negative_invalid_count(user_client):
+    """
+    TEST CASE: (Negative) Get contracts with unknown count strategy
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.get(
+        '/api/v1/contract/list?page=1&size=10&count=approximate',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    expected_response = {'message': ResponseMessageKeys.INVALID_COUNT_STRATEGY.value,
+                         'status': False}
+
+    assert validate_status_code(
+        expected=400, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
+
+
 def test_list_negative_not_logged_in(user_client):
     """
     TEST CASE: (Negative) Get contracts but USER not logged-in
@@ -1629,6 +1875,36 @@ def test_send(user_client):
         expected=expected_response, received=api_response.json)
 
 
+def test_send_reminder_to_signees(user_client, monkeypatch):
+    """
+    TEST CASE: Reminder is sent and logged once per pending signee, a second run on the same day resumes after the
+    checkpoint and sends nothing
+    """
+    user = User.get_by_email(TEST_USER_PRIMARY_EMAIL)
+    if EmailTemplate.get_email_template_by_email_type(account_uuid=user.account_uuid,
+                                                      email_type=EmailTypes.SEND_REMINDER_TO_SIGNEE.value) is None:
+        EmailTemplate.add({'uuid': EmailTemplate.create_uuid(), 'account_uuid': user.account_uuid,
+                           'email_type': EmailTypes.SEND_REMINDER_TO_SIGNEE.value,
+                           'email_subject': EmailSubject.SEND_REMINDER_TO_SIGNEE.value,
+                           'email_body': SEND_REMINDER_TO_SIGNEE})
+    for key in r.scan_iter('reminder:checkpoint:*'):
+        r.delete(key)
+    monkeypatch.setitem(config_data, 'REMINDER', {'CHUNK_SIZE': 1})
+    dispatched = []
+    monkeypatch.setattr(EmailWorker, 'dispatch_many', lambda data_list: dispatched.extend(data_list))
+    pending_signees = ContractSignee.get_reminder_batch(contract_status=ContractStatus.SENT_FOR_SIGNING.value,
+                                                        status=ContractMailStatus.PENDING.value, after_id=0,
+                                                        limit=1000)
+    logs_before = db.session.query(ContractLog).count()
+
+    assert ContractView.send_reminder_to_signees() == len(pending_signees) > 0
+    assert sorted(mail['email_to'] for mail in dispatched) == sorted(signee.signee_email for signee in pending_signees)
+    assert db.session.query(ContractLog).count() == logs_before + len(pending_signees)
+
+    assert ContractView.send_reminder_to_signees() == 0
+    assert len(dispatched) == len(pending_signees)
+
+
 def test_send_not_logged_in(user_client):
     """
     TEST CASE: Send contract - USER not logged in
@@ -1787,10 +2063,12 @@ def test_cancel_type_missmatch_contract_uuid(user_client):
         expected=expected_response, received=api_response.json)
 
 
-def test_get_ai_generated_template(user_client):
+def test_get_ai_generated_template(user_client, monkeypatch):
     """
     TEST CASE: Get AI generated template for contract
     """
+    fake_client = FakeOpenAIClient()
+    monkeypatch.setattr(ContractAIWorker, 'get_openai_client', classmethod(lambda cls: fake_client))
     auth_token = get_auth_token_by_user_type(
         client=user_client, is_super_admin=False)
     user_obj = User.get_by_email(TEST_USER_PRIMARY_EMAIL)
@@ -1811,6 +2089,21 @@ def test_get_ai_generated_template(user_client):
         headers={'Authorization': 'Bearer ' + auth_token}
     )
 
+    expected_response = {
+        'data': {'job_id': '*'},
+        'message': ResponseMessageKeys.AI_GENERATION_STARTED.value, 'status': True
+    }
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
+
+    job_id = api_response.json['data']['job_id']
+    api_response = user_client.get(
+        f'/api/v1/contract/get-ai-generated-template/{job_id}',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
     expected_contract_data = {
         'purpose': CONTRACT_PURPOSE, 'client_uuid': client_obj.uuid, 'signees': signee_list,
         'template_uuid': None, 'brief': CONTRACT_BRIEF, 'service_name': CONTRACT_SERVICE_NAME,
@@ -1818,9 +2111,11 @@ def test_get_ai_generated_template(user_client):
     }
     expected_response = {
         'data': {
+            'job_id': job_id,
+            'status': AIGenerationStatus.COMPLETED.value,
             'contract_data': expected_contract_data,
-            'content': '*',
-            'sections': '*',
+            'content': {section: f'{section} content.<br>Second line.' for section in fake_client.sections},
+            'sections': fake_client.sections,
             'contract_currency_code': '*',
             'updated_amount': '*'
         },
@@ -1832,6 +2127,164 @@ def test_get_ai_generated_template(user_client):
         expected=expected_response, received=api_response.json)
 
 
+def test_get_ai_generated_template_section_failure(user_client, monkeypatch):
+    """
+    TEST CASE: Get AI generated template falls back to default sections when a section fails
+    """
+    fake_client = FakeOpenAIClient(fail_sections=['Payment'])
+    monkeypatch.setattr(ContractAIWorker, 'get_openai_client', classmethod(lambda cls: fake_client))
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    user_obj = User.get_by_email(TEST_USER_PRIMARY_EMAIL)
+    client_obj = Client.get_by_user_uuid(user_uuid=user_obj.uuid)
+    contract_data = {'purpose': CONTRACT_PURPOSE, 'client_uuid': client_obj.uuid, 'signees': [],
+                     'brief': CONTRACT_BRIEF}
+
+    api_response = user_client.post(
+        '/api/v1/contract/get-ai-generated-template', json=contract_data, content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+    job_id = api_response.json['data']['job_id']
+    api_response = user_client.get(
+        f'/api/v1/contract/get-ai-generated-template/{job_id}',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert api_response.json['data']['status'] == AIGenerationStatus.COMPLETED.value
+    assert api_response.json['data']['sections'] == DEFAULT_SECTIONS
+    assert api_response.json['data']['content'] == DEFAULT_SECTION_DICT
+
+
+def test_get_ai_generation_status_job_not_found(user_client):
+    """
+    TEST CASE: (Negative) Get AI generation status with unknown job id
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.get(
+        '/api/v1/contract/get-ai-generated-template/unknown-job-id',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    expected_response = {
+        'message': ResponseMessageKeys.AI_GENERATION_JOB_NOT_FOUND.value, 'status': False
+    }
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
+
+
+def test_get_ai_generated_template_concurrent_jobs(user_client, monkeypatch):
+    """
+    TEST CASE: Simultaneous AI generations keep their own sections and share a bounded thread pool
+    """
+    max_workers = 4
+    monkeypatch.setitem(config_data, 'AI_GENERATION', {'MAX_WORKERS': max_workers, 'SECTION_TIMEOUT': 10,
+                                                       'MAX_JOBS_PER_ACCOUNT': 1})
+    monkeypatch.setattr(contract_ai_worker, '_executor', None)
+    tracker = ConcurrencyTracker()
+    clients = {f'job-{index}': FakeOpenAIClient(sections=[f'Job {index} Section {number}' for number in range(7)],
+                                                delay=0.02, tracker=tracker)
+               for index in range(12)}
+    monkeypatch.setattr(ContractAIWorker, 'get_openai_client',
+                        classmethod(lambda cls: clients[threading.current_thread().name]))
+
+    job_ids = {}
+    barrier = threading.Barrier(len(clients))
+
+    def start_generation(name):
+        barrier.wait()
+        job_ids[name] = ContractAIWorker.create_job(account_uuid=name, contract_data={'purpose': name},
+                                                    purpose=name, prompt='Give me {} section of ' + name + '.')
+
+    threads = [threading.Thread(target=start_generation, args=(name,), name=name) for name in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, fake_client in clients.items():
+        job = ContractAIWorker.get_job(job_id=job_ids[name], account_uuid=name)
+        assert job['status'] == AIGenerationStatus.COMPLETED.value
+        assert job['contract_data'] == {'purpose': name}
+        assert job['sections'] == fake_client.sections
+        assert list(job['content']) == fake_client.sections
+        assert job['content'] == {section: f'{section} content.<br>Second line.' for section in fake_client.sections}
+        assert ContractAIWorker.get_job(job_id=job_ids[name], account_uuid='other-account') is None
+
+    assert 1 < len(tracker.section_threads) <= max_workers
+    assert 1 < tracker.max_active_section_calls <= max_workers
+
+
+def test_get_ai_generated_template_account_concurrency_limit(user_client, monkeypatch):
+    """
+    TEST CASE: (Negative) Account can not run more than MAX_JOBS_PER_ACCOUNT generations at once
+    """
+    monkeypatch.setitem(config_data, 'AI_GENERATION', {'MAX_JOBS_PER_ACCOUNT': 1})
+    fake_client = FakeOpenAIClient(delay=0.2)
+    monkeypatch.setattr(ContractAIWorker, 'get_openai_client', classmethod(lambda cls: fake_client))
+
+    job_ids = []
+    barrier = threading.Barrier(3)
+
+    def start_generation():
+        barrier.wait()
+        job_ids.append(ContractAIWorker.create_job(account_uuid='limited-account', contract_data={},
+                                                   purpose=CONTRACT_PURPOSE, prompt='Give me {} section.'))
+
+    threads = [threading.Thread(target=start_generation) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert job_ids.count(None) == 2
+    assert ContractAIWorker.create_job(account_uuid='limited-account', contract_data={}, purpose=CONTRACT_PURPOSE,
+                                       prompt='Give me {} section.') is not None
+
+
+def test_get_ai_generated_template_cache(user_client, monkeypatch):
+    """
+    TEST CASE: Repeated AI generation with the same prompts is served from cache unless force_refresh is set
+    """
+    monkeypatch.setitem(config_data, 'AI_CACHE', {'ENABLED': True})
+    fake_client = FakeOpenAIClient()
+    monkeypatch.setattr(ContractAIWorker, 'get_openai_client', classmethod(lambda cls: fake_client))
+    purpose = f'{CONTRACT_PURPOSE} {uuid.uuid4().hex}'
+    prompt = 'Give me {} section of ' + purpose + '.'
+    stats = get_ai_cache_stats()
+
+    first_job_id = ContractAIWorker.create_job(account_uuid='cache-account', contract_data={}, purpose=purpose,
+                                               prompt=prompt)
+    assert fake_client.calls == len(fake_client.sections) + 1
+
+    # same prompts with different whitespace
+    second_job_id = ContractAIWorker.create_job(account_uuid='cache-account', contract_data={},
+                                                purpose=purpose, prompt='  ' + prompt.replace(' ', '  '))
+    assert fake_client.calls == len(fake_client.sections) + 1
+    first_job = ContractAIWorker.get_job(job_id=first_job_id, account_uuid='cache-account')
+    second_job = ContractAIWorker.get_job(job_id=second_job_id, account_uuid='cache-account')
+    assert second_job['sections'] == first_job['sections']
+    assert second_job['content'] == first_job['content']
+
+    new_stats = get_ai_cache_stats()
+    assert new_stats['hits'] - stats['hits'] == len(fake_client.sections) + 1
+    assert new_stats['misses'] - stats['misses'] == len(fake_client.sections) + 1
+
+    # prompts differing in case are generated again
+    ContractAIWorker.create_job(account_uuid='cache-account', contract_data={}, purpose=purpose.upper(),
+                                prompt=prompt.upper())
+    assert fake_client.calls == 2 * (len(fake_client.sections) + 1)
+
+    ContractAIWorker.create_job(account_uuid='cache-account', contract_data={}, purpose=purpose, prompt=prompt,
+                                force_refresh=True)
+    assert fake_client.calls == 3 * (len(fake_client.sections) + 1)
+
+
 def test_get_ai_generated_template_not_logged_in(user_client):
     """
     TEST CASE: (Negative) Get AI generated template for contract - USER not logged in
@@ -2258,3 +2711,71 @@ def test_download_as_pdf_negative_contract_not_found(user_client):
     assert validate_response(
         expected=expected_response, received=api_response.json)
 
+
+def test_download_as_pdf(user_client, monkeypatch):
+    """
+    TEST CASE: Download contract as pdf - pdf is rendered once per signed content and then served from cache
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    contract_obj = Contract.get_by_id(1)
+    signed_content = contract_obj.signed_content
+    rendered = []
+
+    def from_string(content, path):
+        rendered.append(content)
+        with open(path, 'w') as pdf_file:
+            pdf_file.write(content or '')
+
+    def upload_file(file_path, file_name, s3_folder_path):
+        os.remove(file_path)
+        return s3_folder_path + file_name
+
+    monkeypatch.setattr(contract_pdf_worker.pdfkit, 'from_string', from_string)
+    monkeypatch.setattr(contract_pdf_worker, 'upload_file_and_get_object_details', upload_file)
+    monkeypatch.setattr(contract_view, 'get_presigned_url', lambda path: 'https://s3.project.com/' + path)
+    r.delete(CONTRACT_PDF_OBJECT_KEY.format(contract_obj.uuid, ContractPdfWorker.get_content_hash(signed_content)))
+
+    responses = [user_client.get('/api/v1/contract/download-as-pdf/' + contract_obj.uuid,
+                                 content_type='application/json', headers={'Authorization': 'Bearer ' + auth_token})
+                 for _ in range(2)]
+    contract_obj.signed_content = (signed_content or '') + '<p>Signed again</p>'
+    Contract.update()
+    changed_response = user_client.get('/api/v1/contract/download-as-pdf/' + contract_obj.uuid,
+                                       content_type='application/json',
+                                       headers={'Authorization': 'Bearer ' + auth_token})
+    contract_obj.signed_content = signed_content
+    Contract.update()
+
+    assert len(rendered) == 2
+    for api_response in responses + [changed_response]:
+        assert validate_status_code(
+            expected=200, received=api_response.status_code)
+        assert api_response.json['message'] == ResponseMessageKeys.DOWNLOAD_AS_PDF_SUCCESSFUL.value
+        assert api_response.json['data']['status'] == ContractPdfStatus.COMPLETED.value
+    assert responses[0].json['data']['pdf_file'] == responses[1].json['data']['pdf_file']
+    assert changed_response.json['data']['pdf_file'] != responses[0].json['data']['pdf_file']
+
+
+def test_get_pdf_status_negative_job_not_found(user_client):
+    """
+    TEST CASE: (Negative) Get contract pdf job status - job id invalid
+    User : Any User Type
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.get(
+        '/api/v1/contract/download-as-pdf/job/' + '1234',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    expected_response = {
+        'message': ResponseMessageKeys.CONTRACT_PDF_JOB_NOT_FOUND.value, 'status': False}
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
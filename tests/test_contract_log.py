@@ -1,6 +1,10 @@
 """This file contains the test cases for the contract_log module."""
+import uuid
+
 from flask import jsonify
 
+from app import config_data
+
 from app.helpers.constants import ResponseMessageKeys
 from app.models.contract import Contract
 from app.models.contract_log import ContractLog
@@ -65,3 +69,33 @@ def test_list_not_logged_in(user_client):
         expected=401, received=api_response.status_code)
     assert validate_response(
         expected=expected_response, received=api_response.json)
+
+
+def test_add_retries_on_uuid_conflict(user_client):
+    """
+    TEST CASE: Record is inserted with a new uuid when given uuid already exists
+    """
+    user_obj = User.get_by_email(TEST_USER_PRIMARY_EMAIL)
+    data = {
+        'uuid': ContractLog.create_uuid(),
+        'account_uuid': user_obj.account_uuid,
+        'contract_uuid': Contract.get_by_id(1).uuid,
+        'description': 'uuid conflict test'
+    }
+    first_log = ContractLog.add(dict(data))
+    second_log = ContractLog.add(dict(data))
+
+    assert first_log.uuid == data['uuid']
+    assert second_log is not None
+    assert second_log.uuid != data['uuid']
+
+
+def test_create_uuid_version_7(user_client, monkeypatch):
+    """
+    TEST CASE: Time ordered UUIDv7 is generated when UUID.VERSION is 7
+    """
+    monkeypatch.setitem(config_data, 'UUID', {'VERSION': 7})
+    uuids = [ContractLog.create_uuid() for _ in range(3)]
+
+    assert all(uuid.UUID(value).version == 7 for value in uuids)
+    assert uuids[0][:8] <= uuids[-1][:8]
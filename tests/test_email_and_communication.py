@@ -1,7 +1,11 @@
 """
     This file contains the test cases for the email template module.
 """
+from app import config_data
 from app.helpers.constants import ResponseMessageKeys
+from app.helpers.email_template_cache import get_email_template_cache_stats
+from app.helpers.email_template_cache import invalidate_email_template
+from app.helpers.email_template_cache import render_email_body
 from app.models.account import Account
 from tests.conftest import get_auth_token_by_user_type
 from tests.conftest import validate_response
@@ -337,3 +341,50 @@ def test_update_by_email_template_uuid_negative_type_missmatch_email_body(user_c
         expected=400, received=api_response.status_code)
     assert validate_response(
         expected=expected_response, received=api_response.json)
+
+
+def test_email_template_cache(user_client, monkeypatch):
+    """
+        TEST CASE: Email template lookups are served from cache and invalidated when the template is updated
+    """
+    monkeypatch.setitem(config_data, 'EMAIL_TEMPLATE_CACHE', {'ENABLED': True})
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+    email_template_obj = EmailTemplate.get_by_id(1)
+    account_uuid = email_template_obj.account_uuid
+    email_type = email_template_obj.email_type
+    invalidate_email_template(account_uuid=account_uuid, email_type=email_type)
+    stats = get_email_template_cache_stats()
+
+    EmailTemplate.get_email_template_by_email_type(account_uuid=account_uuid, email_type=email_type)
+    cached_obj = EmailTemplate.get_email_template_by_email_type(account_uuid=account_uuid, email_type=email_type)
+    assert cached_obj.email_body == email_template_obj.email_body
+
+    new_stats = get_email_template_cache_stats()
+    assert new_stats['misses'] - stats['misses'] == 1
+    assert new_stats['local_hits'] - stats['local_hits'] == 1
+
+    data = {
+        'email_subject': EmailSubject.CONTRACT_CANCELLED.value,
+        'email_body': CONTRACT_CANCELLED + ' <br><br> Updated'
+    }
+    api_response = user_client.post(
+        '/api/v1/email-template/update/' + email_template_obj.uuid, json=data, content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+
+    updated_obj = EmailTemplate.get_email_template_by_email_type(account_uuid=account_uuid, email_type=email_type)
+    assert updated_obj.email_body == data['email_body']
+    invalidate_email_template(account_uuid=account_uuid, email_type=email_type)
+
+
+def test_render_email_body(user_client):
+    """
+        TEST CASE: Pre-compiled email body renders like str.format
+    """
+    email_body = CONTRACT_CANCELLED + ' {{literal}} {name:>10}'
+
+    assert render_email_body(CONTRACT_CANCELLED, name='Signee') == CONTRACT_CANCELLED.format(name='Signee')
+    assert render_email_body(email_body, name='Signee') == email_body.format(name='Signee')
@@ -0,0 +1,192 @@
+"""
+    This file contains the test cases for queued email dispatch.
+"""
+import copy
+import json
+from types import SimpleNamespace
+
+from app import app
+from app import config_data
+from app import r
+from app import send_mail_q
+from flask import render_template
+from providers import mail as mail_provider
+from providers.mail import preload_mail_templates
+from providers.mail import render_mail_templates
+from providers.mail import send_mail_batch
+from tests.smtp_stub import SMTPStubServer
+from workers import email_worker
+from workers.email_worker import EMAIL_DEAD_LETTER_KEY
+from workers.email_worker import EmailWorker
+from workers.email_worker import move_to_dead_letter
+
+EMAIL_DATA = {
+    'email_to': 'signee@project.com',
+    'subject': 'Subject',
+    'template': 'emails/send_contract_to_signee.html',
+    'email_type': 'SEND_CONTRACT_TO_SIGNEE',
+    'email_data': {'email_body': 'Body'}
+}
+
+
+def test_dispatch_sends_inline_while_testing(user_client, monkeypatch):
+    """
+        TEST CASE: Mail is sent inside the request when EMAIL_QUEUE is not enabled
+    """
+    sent = []
+    monkeypatch.setattr(email_worker, 'send_mail', lambda **kwargs: sent.append(kwargs))
+    jobs_before = send_mail_q.count
+
+    EmailWorker.dispatch(EMAIL_DATA)
+
+    assert len(sent) == 1
+    assert sent[0]['email_to'] == EMAIL_DATA['email_to']
+    assert send_mail_q.count == jobs_before
+
+
+def test_dispatch_enqueues_mail_job(user_client, monkeypatch):
+    """
+        TEST CASE: Mail is enqueued on SEND_MAIL queue with retries when EMAIL_QUEUE is enabled
+    """
+    monkeypatch.setitem(config_data, 'EMAIL_QUEUE', {'ENABLED': True, 'RETRY_INTERVALS': [1, 2]})
+    job_ids_before = set(send_mail_q.job_ids)
+
+    EmailWorker.dispatch(EMAIL_DATA)
+
+    new_job_ids = set(send_mail_q.job_ids) - job_ids_before
+    assert len(new_job_ids) == 1
+    job = send_mail_q.fetch_job(new_job_ids.pop())
+    assert job.args == (EMAIL_DATA,)
+    assert job.retries_left == 2
+    assert job.retry_intervals == [1, 2]
+    job.delete()
+
+
+def test_failed_mail_job_moves_to_dead_letter(user_client, monkeypatch):
+    """
+        TEST CASE: Mail job is moved to dead letter list only after the last retry and can be re-sent
+    """
+    r.delete(EMAIL_DEAD_LETTER_KEY)
+    error = Exception('SMTP unavailable')
+
+    move_to_dead_letter(SimpleNamespace(id='job-1', args=(EMAIL_DATA,), retries_left=1), r, Exception, error, None)
+    assert r.llen(EMAIL_DEAD_LETTER_KEY) == 0
+
+    move_to_dead_letter(SimpleNamespace(id='job-1', args=(EMAIL_DATA,), retries_left=0), r, Exception, error, None)
+    entry = json.loads(r.lindex(EMAIL_DEAD_LETTER_KEY, 0))
+    assert entry['job_id'] == 'job-1'
+    assert entry['data'] == EMAIL_DATA
+    assert entry['error'] == 'SMTP unavailable'
+
+    sent = []
+    monkeypatch.setattr(email_worker, 'send_mail', lambda **kwargs: sent.append(kwargs))
+    assert EmailWorker.requeue_dead_letters() == 1
+    assert len(sent) == 1
+    assert r.llen(EMAIL_DEAD_LETTER_KEY) == 0
+
+
+def start_smtp_stub(monkeypatch, **kwargs):
+    """Start local SMTP stub and point Flask-Mail to it for the duration of the test."""
+    smtp_stub = SMTPStubServer(**kwargs).start()
+    mail_state = copy.copy(mail_provider.app.extensions['mail'])
+    smtp_stub.configure_mail(mail_state)
+    monkeypatch.setitem(mail_provider.app.extensions, 'mail', mail_state)
+    return smtp_stub
+
+
+def test_send_mail_batch_reuses_connection(user_client, monkeypatch):
+    """
+        TEST CASE: Batch of mails is sent over one SMTP connection per MAIL.BATCH_SIZE mails
+    """
+    monkeypatch.setitem(config_data['MAIL'], 'BATCH_SIZE', 10)
+    smtp_stub = start_smtp_stub(monkeypatch)
+
+    failed = send_mail_batch([dict(EMAIL_DATA, email_to=f'signee{index}@project.com') for index in range(25)])
+    smtp_stub.stop()
+
+    assert failed == []
+    assert smtp_stub.messages == 25
+    assert smtp_stub.connections == 3
+
+
+def test_send_mail_batch_reconnects(user_client, monkeypatch):
+    """
+        TEST CASE: Batch continues on a new connection when SMTP server drops the connection
+    """
+    smtp_stub = start_smtp_stub(monkeypatch, drop_after=4)
+
+    failed = send_mail_batch([dict(EMAIL_DATA, email_to=f'signee{index}@project.com') for index in range(10)])
+    smtp_stub.stop()
+
+    assert failed == []
+    assert smtp_stub.messages == 10
+    assert smtp_stub.connections == 3
+
+
+def test_send_mail_batch_recipient_refused(user_client, monkeypatch):
+    """
+        TEST CASE: (Negative) Only the mail refused by the SMTP server fails, mails after it are still sent
+    """
+    smtp_stub = start_smtp_stub(monkeypatch, reject_recipients=['signee2@project.com'])
+    mail_list = [dict(EMAIL_DATA, email_to=f'signee{index}@project.com') for index in range(5)]
+
+    failed = send_mail_batch(mail_list)
+    smtp_stub.stop()
+
+    assert failed == [mail_list[2]]
+    assert smtp_stub.messages == 4
+    assert smtp_stub.connections == 1
+
+
+def test_send_mail_batch_server_unavailable(user_client, monkeypatch):
+    """
+        TEST CASE: (Negative) Mails are returned as failed when SMTP server is not reachable
+    """
+    smtp_stub = start_smtp_stub(monkeypatch)
+    smtp_stub.stop()
+    mail_list = [dict(EMAIL_DATA, email_to=f'signee{index}@project.com') for index in range(3)]
+
+    assert send_mail_batch(mail_list) == mail_list
+
+
+def test_dispatch_many_enqueues_batches(user_client, monkeypatch):
+    """
+        TEST CASE: dispatch_many enqueues one SEND_MAIL job per MAIL.BATCH_SIZE mails
+    """
+    monkeypatch.setitem(config_data, 'EMAIL_QUEUE', {'ENABLED': True})
+    monkeypatch.setitem(config_data['MAIL'], 'BATCH_SIZE', 2)
+    job_ids_before = set(send_mail_q.job_ids)
+
+    EmailWorker.dispatch_many([EMAIL_DATA] * 5)
+
+    jobs = [send_mail_q.fetch_job(job_id) for job_id in set(send_mail_q.job_ids) - job_ids_before]
+    assert sorted(len(job.args[0]) for job in jobs) == [1, 2, 2]
+    for job in jobs:
+        job.delete()
+
+
+def test_render_mail_templates(user_client):
+    """
+        TEST CASE: Precompiled mail templates render like flask.render_template for every recipient
+    """
+    data_list = [{'email_body': f'<p>Body {index}</p>', 'contract_link': f'https://project.com/{index}'}
+                 for index in range(3)]
+
+    assert preload_mail_templates() > 0
+    with app.app_context():
+        expected = [render_template('emails/signature_reminder_email.html', data=data) for data in data_list]
+    assert render_mail_templates(template='emails/signature_reminder_email.html', data_list=data_list) == expected
+
+
+def test_send_mail_batch_template_not_found(user_client, monkeypatch):
+    """
+        TEST CASE: (Negative) Mails of a missing template are returned as failed, the others are sent
+    """
+    smtp_stub = start_smtp_stub(monkeypatch)
+    missing_template_mail = dict(EMAIL_DATA, template='emails/missing_template.html')
+
+    failed = send_mail_batch([EMAIL_DATA, missing_template_mail, EMAIL_DATA])
+    smtp_stub.stop()
+
+    assert failed == [missing_template_mail]
+    assert smtp_stub.messages == 2
@@ -163,13 +163,14 @@ def test_get_folder_list(user_client):
     q = None
     sort = 'asc'
 
-    folder_list_objs, objects_count = Folder.get_folder_list(
+    folder_list_objs, objects_count, next_cursor, count_strategy = Folder.get_folder_list(
         q=q, sort=sort, page=page, size=size, account_uuid=account_uuid)
     folder_list = Folder.serialize(folder_list_objs)
 
     data = {'result': jsonify(folder_list).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
-                                                       page_size=int(size), total_items=objects_count)}
+                                                       page_size=int(size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
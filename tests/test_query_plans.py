@@ -0,0 +1,98 @@
+"""
+    Query plan regression tests for the hot account scoped queries.
+    Every statement of a hot query is explained with enable_seqscan off: the planner then uses any index that can serve
+    the filter, so a Seq Scan left in the plan means no index matches it, whatever the size of the seeded tables.
+"""
+import json
+import uuid
+
+import pytest
+
+from app import db
+from app.helpers.constants import ContractMailStatus
+from app.helpers.constants import ContractStatus
+from app.helpers.constants import EmailTypes
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.contract_log import ContractLog
+from app.models.contract_signee import ContractSignee
+from app.models.email_template import EmailTemplate
+from app.models.folder import Folder
+from app.models.signee import Signee
+from app.models.subscription import Subscription
+from app.models.user import User
+from tests.conftest import QueryRecorder
+from tests.conftest import TEST_USER_PRIMARY_EMAIL
+from sqlalchemy import text
+
+HOT_QUERIES = [
+    ('ix_contract_account_uuid_folder_uuid_created_at_id',
+     lambda account_uuid, other_uuid: Contract.get_contracts_list(account_uuid=account_uuid, folder_uuid=other_uuid,
+                                                                  page=1, size=10)),
+    ('ix_contract_account_uuid_status',
+     lambda account_uuid, other_uuid: Contract.get_by_status(account_uuid=account_uuid,
+                                                             status=ContractStatus.DRAFT.value)),
+    ('ix_contract_signee_account_uuid_contract_uuid_client_uuid',
+     lambda account_uuid, other_uuid: ContractSignee.get_by_account_client_and_contract(
+         account_uuid=account_uuid, client_uuid=other_uuid, contract_uuid=other_uuid)),
+    ('ix_contract_signee_contract_uuid_status',
+     lambda account_uuid, other_uuid: ContractSignee.get_count_by_contact_uuid_and_status(
+         status=ContractMailStatus.SIGNED.value, contract_uuid=other_uuid)),
+    ('ix_subscription_account_uuid_status',
+     lambda account_uuid, other_uuid: Subscription.get_active_subscription_by_account_uuid(account_uuid=account_uuid)),
+    ('ix_email_template_account_uuid_email_type',
+     lambda account_uuid, other_uuid: EmailTemplate.get_email_template_by_email_type(
+         account_uuid=account_uuid, email_type=EmailTypes.SEND_CONTRACT_TO_SIGNEE.value)),
+    ('ix_contract_log_account_uuid_contract_uuid',
+     lambda account_uuid, other_uuid: ContractLog.get_by_account_and_contract(account_uuid=account_uuid,
+                                                                              contract_uuid=other_uuid)),
+    ('ix_signee_account_uuid_client_uuid',
+     lambda account_uuid, other_uuid: Signee.get_all_signee_uuid_by_client_uuid(account_uuid=account_uuid,
+                                                                               client_uuid=other_uuid)),
+    ('ix_client_account_uuid_created_at_id',
+     lambda account_uuid, other_uuid: Client.get_all_by_account_uuid(account_uuid=account_uuid, page=1, size=10)),
+    ('ix_folder_account_uuid_created_at_id',
+     lambda account_uuid, other_uuid: Folder.get_folder_list(account_uuid=account_uuid, page=1, size=10)),
+]
+
+
+def plan_nodes(node):
+    """Yield node and all its child nodes of EXPLAIN (FORMAT JSON) plan."""
+    yield node
+    for child in node.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def explain(statement, parameters):
+    """Plan nodes of statement with sequential scans disabled."""
+    connection = db.session.connection()
+    connection.exec_driver_sql('SET enable_seqscan = off')
+    try:
+        plan = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+    finally:
+        connection.exec_driver_sql('RESET enable_seqscan')
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]['Plan']))
+
+
+@pytest.mark.parametrize('index_name, run_query', HOT_QUERIES, ids=[index_name for index_name, _ in HOT_QUERIES])
+def test_hot_query_uses_index(user_client, index_name, run_query):
+    """
+    TEST CASE: Hot query does not fall back to a sequential scan and uses its composite index
+    """
+    account_uuid = User.get_by_email(TEST_USER_PRIMARY_EMAIL).account_uuid
+    db.session.execute(text('ANALYZE'))
+
+    with QueryRecorder(db.engine) as recorder:
+        run_query(account_uuid, uuid.uuid4().hex)
+
+    assert recorder.statements
+    used_indexes = set()
+    for statement, parameters in recorder.statements:
+        nodes = explain(statement, parameters)
+        seq_scans = [node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan']
+        assert seq_scans == [], f'Sequential scan on {seq_scans} in: {statement}'
+        used_indexes.update(node['Index Name'] for node in nodes if 'Index Name' in node)
+
+    assert index_name in used_indexes
@@ -34,14 +34,15 @@ def test_get_payments_by_account(user_client):
     q = None
     sort = 'asc'
 
-    account_payments, objects_count = Payment.get_by_account(account_uuid=account_uuid, q=q, sort=sort, page=page,
+    account_payments, objects_count, next_cursor, count_strategy = Payment.get_by_account(account_uuid=account_uuid, q=q, sort=sort, page=page,
                                                              size=size)
     payment_data = Payment.serialize(account_payments)
 
     data = {'result': jsonify(payment_data).json,
             'pagination_metadata': get_pagination_meta(current_page=1 if page is None else int(page),
                                                        page_size=objects_count if size is None else int(
-                                                           size), total_items=objects_count)}
+                                                           size), total_items=objects_count,
+                                                       next_cursor=next_cursor, count_strategy=count_strategy)}
 
     expected_response = {'data': data, 'message': ResponseMessageKeys.SUCCESS.value,
                          'status': True}
@@ -191,3 +191,45 @@ def test_get_dashboard_details_negative_not_super_admin(user_client):
         expected=401, received=api_response.status_code)
     assert validate_response(
         expected=expected_response, received=api_response.json)
+
+
+def test_get_cache_stats(super_admin_client):
+    """
+       TEST CASE: Get cache hit ratios - user : SUPER ADMIN
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=super_admin_client, is_super_admin=True)
+
+    api_response = super_admin_client.get(
+        '/api/v1/admin/cache-stats',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    assert validate_status_code(
+        expected=200, received=api_response.status_code)
+    assert set(api_response.json['data']) == {'ai_cache', 'email_template_cache'}
+    assert set(api_response.json['data']['email_template_cache']) == {
+        'local_hits', 'redis_hits', 'misses', 'hit_ratio', 'local_entries'}
+
+
+def test_get_cache_stats_negative_not_super_admin(user_client):
+    """
+       TEST CASE: (Negative) Get cache hit ratios - user : NOT SUPER ADMIN
+    """
+    auth_token = get_auth_token_by_user_type(
+        client=user_client, is_super_admin=False)
+
+    api_response = user_client.get(
+        '/api/v1/admin/cache-stats',
+        content_type='application/json',
+        headers={'Authorization': 'Bearer ' + auth_token}
+    )
+
+    expected_response = {'message': ResponseMessageKeys.NOT_ALLOWED.value,
+                         'status': False}
+
+    assert validate_status_code(
+        expected=401, received=api_response.status_code)
+    assert validate_response(
+        expected=expected_response, received=api_response.json)
@@ -0,0 +1,153 @@
+"""Contains methods and logic to import clients from uploaded workbook or csv file in background."""
+import os
+import traceback
+from typing import Union
+import uuid
+
+from app import app
+from app import client_import_q
+from app import config_data
+from app import logger
+from app import r
+from app.helpers.client_import import count_client_rows
+from app.helpers.client_import import ErrorWorkbookWriter
+from app.helpers.client_import import import_clients
+from app.helpers.client_import import read_client_chunks
+from app.helpers.constants import ClientImportStatus
+from app.helpers.constants import TimeInSeconds
+from workers.s3_worker import download_file
+from workers.s3_worker import upload_file_and_get_object_details
+
+CLIENT_IMPORT_JOB_KEY = 'client_import:{}'
+DEFAULT_CLIENT_IMPORT_JOB_TIMEOUT = 3600  # seconds
+
+
+def get_client_import_job_config() -> dict:
+    """Return CLIENT_IMPORT job settings from config.yml. Staged files are kept locally unless STAGE_ON_S3 is set."""
+    import_config = config_data.get('CLIENT_IMPORT') or {}
+    return {
+        'STAGE_ON_S3': bool(import_config.get('STAGE_ON_S3', False)),
+        'JOB_TIMEOUT': int(import_config.get('JOB_TIMEOUT', DEFAULT_CLIENT_IMPORT_JOB_TIMEOUT)),
+    }
+
+
+class ClientImportWorker:
+    """
+        Imports client workbooks in RQ worker (CLIENT_IMPORT queue) so that uploads of any size do not hold a web worker.
+        Job state is kept in redis hash client_import:<job_id> with status, account_uuid, user_uuid, staged file,
+        rows_total, rows_processed, rows_failed and S3 path of the error workbook.
+    """
+
+    @classmethod
+    def stage_file(cls, job_id: str, account_uuid: str, user_uuid: str, temp_path: str) -> dict:
+        """Move uploaded file to its job location: S3 when CLIENT_IMPORT.STAGE_ON_S3 is set, else UPLOAD_FOLDER."""
+        file_name = 'client_import_{}{}'.format(job_id, os.path.splitext(temp_path)[1])
+        if get_client_import_job_config()['STAGE_ON_S3']:
+            s3_path = upload_file_and_get_object_details(file_path=temp_path, file_name=file_name,
+                                                         s3_folder_path=f'imports/{account_uuid}/{user_uuid}/'.lower())
+            return {'storage': 's3', 'file_path': s3_path}
+        file_path = os.path.join(config_data['UPLOAD_FOLDER'], file_name)  # type: ignore  # noqa: FKA100
+        os.replace(temp_path, file_path)
+        return {'storage': 'local', 'file_path': file_path}
+
+    @classmethod
+    def create_job(cls, account_uuid: str, user_uuid: str, temp_path: str) -> str:
+        """Stage uploaded file, store initial job state and enqueue import. Import runs inline while testing."""
+        job_id = uuid.uuid4().hex
+        staged_file = cls.stage_file(job_id=job_id, account_uuid=account_uuid, user_uuid=user_uuid,
+                                     temp_path=temp_path)
+        job_key = CLIENT_IMPORT_JOB_KEY.format(job_id)
+        pipeline = r.pipeline()
+        pipeline.hset(job_key, mapping={
+            'status': ClientImportStatus.QUEUED.value,
+            'account_uuid': account_uuid,
+            'user_uuid': user_uuid,
+            'storage': staged_file['storage'],
+            'file_path': staged_file['file_path'],
+            'rows_total': 0,
+            'rows_processed': 0,
+            'rows_failed': 0,
+        })
+        pipeline.expire(job_key, TimeInSeconds.TWO_DAYS.value)
+        pipeline.execute()
+
+        if config_data.get('TESTING'):
+            cls.run(job_id)
+        else:
+            client_import_q.enqueue(cls.run, args=(job_id,), job_id=job_id,
+                                    job_timeout=get_client_import_job_config()['JOB_TIMEOUT'], result_ttl=0)
+        return job_id
+
+    @classmethod
+    def get_job(cls, job_id: str, account_uuid: str) -> Union[dict, None]:
+        """Return job state, None if job does not exist or belongs to other account."""
+        job = r.hgetall(CLIENT_IMPORT_JOB_KEY.format(job_id))
+        if not job or job.get(b'account_uuid', b'').decode('utf-8') != account_uuid:
+            return None
+
+        job = {key.decode('utf-8'): value.decode('utf-8') for key, value in job.items()}
+        return {
+            'status': job['status'],
+            'rows_total': int(job['rows_total']),
+            'rows_processed': int(job['rows_processed']),
+            'rows_failed': int(job['rows_failed']),
+            'error_file': job.get('error_file'),
+        }
+
+    @classmethod
+    def update_job(cls, job_id: str, **fields) -> None:
+        """Set given fields of job state."""
+        r.hset(CLIENT_IMPORT_JOB_KEY.format(job_id), mapping=fields)
+
+    @classmethod
+    def add_progress(cls, job_id: str, rows_processed: int, rows_failed: int) -> None:
+        """Add counts of an imported chunk to job state."""
+        job_key = CLIENT_IMPORT_JOB_KEY.format(job_id)
+        pipeline = r.pipeline()
+        pipeline.hincrby(job_key, 'rows_processed', rows_processed)
+        pipeline.hincrby(job_key, 'rows_failed', rows_failed)
+        pipeline.execute()
+
+    @classmethod
+    def run(cls, job_id: str) -> None:
+        """RQ job: stream staged file, import clients chunk by chunk and upload error workbook of rejected rows."""
+        if config_data.get('TESTING'):
+            return cls.import_file(job_id)
+        with app.app_context():
+            return cls.import_file(job_id)
+
+    @classmethod
+    def import_file(cls, job_id: str) -> None:
+        """Import staged file of the job, progress is written to job state after every chunk."""
+        job = {key.decode('utf-8'): value.decode('utf-8')
+               for key, value in r.hgetall(CLIENT_IMPORT_JOB_KEY.format(job_id)).items()}
+        if not job:
+            logger.error('Client import job {} not found'.format(job_id))
+            return
+
+        local_path = job['file_path']
+        try:
+            cls.update_job(job_id, status=ClientImportStatus.IN_PROGRESS.value)
+            if job['storage'] == 's3':
+                local_path = download_file(path=job['file_path'], file_path=os.path.join(
+                    config_data['UPLOAD_FOLDER'], os.path.basename(job['file_path'])))  # type: ignore  # noqa: FKA100
+            cls.update_job(job_id, rows_total=count_client_rows(path=local_path))
+
+            error_writer = ErrorWorkbookWriter()
+            rows_failed = import_clients(
+                chunks=read_client_chunks(path=local_path), account_uuid=job['account_uuid'],
+                user_uuid=job['user_uuid'],
+                on_progress=lambda rows_processed, rows_failed: cls.add_progress(
+                    job_id=job_id, rows_processed=rows_processed, rows_failed=rows_failed),
+                error_writer=error_writer)
+            if rows_failed:
+                cls.update_job(job_id, error_file=error_writer.upload(account_uuid=job['account_uuid'],
+                                                                      user_uuid=job['user_uuid']))
+            cls.update_job(job_id, status=ClientImportStatus.COMPLETED.value)
+        except Exception as e:
+            logger.error('Inside ClientImportWorker.import_file() {} : {}'.format(job_id, e))
+            logger.error(traceback.format_exc())
+            cls.update_job(job_id, status=ClientImportStatus.FAILED.value)
+        finally:
+            if os.path.exists(local_path):
+                os.remove(local_path)
@@ -0,0 +1,300 @@
+"""Contains methods and logic to generate contract sections with OpenAI in background."""
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import json
+import math
+import threading
+import traceback
+from typing import Any, Union
+import uuid
+
+from app import ai_contract_q
+from app import config_data
+from app import logger
+from app import r
+from app.helpers import ai_cache
+from app.helpers.ai_cache import get_ai_cache_config
+from app.helpers.constants import AIGenerationStatus
+from app.helpers.constants import DEFAULT_SECTION_DICT
+from app.helpers.constants import DEFAULT_SECTIONS
+from app.helpers.constants import TimeInSeconds
+from providers import openai_client
+
+AI_GENERATION_JOB_KEY = 'ai_generation:{}'
+AI_GENERATION_CONTENT_KEY = 'ai_generation:{}:content'
+AI_GENERATION_ACCOUNT_KEY = 'ai_generation:account:{}'
+AI_GENERATION_JOB_TIMEOUT = 900  # seconds
+DEFAULT_AI_GENERATION_MAX_WORKERS = 8
+DEFAULT_AI_GENERATION_SECTION_TIMEOUT = 120  # seconds
+DEFAULT_AI_GENERATION_MAX_JOBS_PER_ACCOUNT = 2
+SECTION_HEADINGS_PROMPT = ('Give me MUST 7 Section Headings of {} except signature section in a comma separated format. '
+                           'Your language must be British English.')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_ai_generation_config() -> dict:
+    """Return AI_GENERATION settings from config.yml with defaults applied."""
+    generation_config = config_data.get('AI_GENERATION') or {}
+    return {
+        'MAX_WORKERS': int(generation_config.get('MAX_WORKERS', DEFAULT_AI_GENERATION_MAX_WORKERS)),
+        'SECTION_TIMEOUT': float(generation_config.get('SECTION_TIMEOUT', DEFAULT_AI_GENERATION_SECTION_TIMEOUT)),
+        'MAX_JOBS_PER_ACCOUNT': int(generation_config.get('MAX_JOBS_PER_ACCOUNT',
+                                                          DEFAULT_AI_GENERATION_MAX_JOBS_PER_ACCOUNT)),
+    }
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return process wide thread pool used for section generation, bounded by AI_GENERATION.MAX_WORKERS."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_ai_generation_config()['MAX_WORKERS'],
+                                           thread_name_prefix='ai-section')
+        return _executor
+
+
+class GenerationContext:
+    """State of a single generation job. Every job owns its context, nothing is shared between jobs."""
+
+    def __init__(self, job_id: str, account_uuid: str, purpose: str, prompt: str, force_refresh: bool = False):
+        self.job_id = job_id
+        self.account_uuid = account_uuid
+        self.purpose = purpose
+        self.prompt = prompt
+        self.force_refresh = force_refresh
+        self.sections = []
+        self.content = {}
+        self.failed_sections = []
+        self.is_closed = False
+        self.lock = threading.Lock()
+
+    def set_sections(self, sections: list) -> None:
+        """Keep headings in the order returned by OpenAI, without blanks and duplicates."""
+        self.sections = list(dict.fromkeys(section for section in sections if section))
+
+    def add_content(self, section: str, section_details: str) -> bool:
+        """Record generated section, returns False if job already finished (section came in after the timeout)."""
+        with self.lock:
+            if self.is_closed:
+                return False
+            self.content[section] = section_details
+            return True
+
+    def close(self) -> None:
+        """Stop accepting sections."""
+        with self.lock:
+            self.is_closed = True
+
+    def add_failure(self, section: str) -> None:
+        """Record section which could not be generated."""
+        with self.lock:
+            self.failed_sections.append(section)
+
+
+class ContractAIWorker:
+    """
+        Generates AI contract template in RQ worker (AI_CONTRACT_GENERATION queue).
+        Job state is kept in redis so that web workers only enqueue and poll:
+            ai_generation:<job_id>          hash with status, account_uuid, contract_data and sections
+            ai_generation:<job_id>:content  hash of section heading -> generated html, filled as sections complete
+    """
+
+    @classmethod
+    def get_openai_client(cls) -> Any:
+        """Return OpenAI client used for generation."""
+        return openai_client.get_openai_client()
+
+    @classmethod
+    def acquire_account_slot(cls, account_uuid: str) -> bool:
+        """Reserve one of AI_GENERATION.MAX_JOBS_PER_ACCOUNT running generations for the account (shared by all workers)."""
+        account_key = AI_GENERATION_ACCOUNT_KEY.format(account_uuid)
+        pipeline = r.pipeline()
+        pipeline.incr(account_key)
+        pipeline.expire(account_key, AI_GENERATION_JOB_TIMEOUT)
+        running_jobs, _ = pipeline.execute()
+        if running_jobs > get_ai_generation_config()['MAX_JOBS_PER_ACCOUNT']:
+            r.decr(account_key)
+            return False
+        return True
+
+    @classmethod
+    def release_account_slot(cls, account_uuid: str) -> None:
+        """Release slot reserved by acquire_account_slot."""
+        r.decr(AI_GENERATION_ACCOUNT_KEY.format(account_uuid))
+
+    @classmethod
+    def create_job(cls, account_uuid: str, contract_data: dict, purpose: str, prompt: str,
+                   force_refresh: bool = False) -> Union[str, None]:
+        """
+            Store initial job state and enqueue generation. Generation runs inline while testing.
+            Returns None when the account already runs AI_GENERATION.MAX_JOBS_PER_ACCOUNT generations.
+        """
+        if not cls.acquire_account_slot(account_uuid=account_uuid):
+            return None
+
+        job_id = uuid.uuid4().hex
+        job_key = AI_GENERATION_JOB_KEY.format(job_id)
+        try:
+            pipeline = r.pipeline()
+            pipeline.hset(job_key, mapping={
+                'status': AIGenerationStatus.QUEUED.value,
+                'account_uuid': account_uuid,
+                'contract_data': json.dumps(contract_data),
+                'sections': json.dumps([]),
+            })
+            pipeline.expire(job_key, TimeInSeconds.SIXTY_MIN.value)
+            pipeline.execute()
+
+            if config_data.get('TESTING'):
+                cls.generate(job_id, account_uuid, purpose, prompt, force_refresh)
+            else:
+                ai_contract_q.enqueue(cls.generate, args=(job_id, account_uuid, purpose, prompt, force_refresh),
+                                      job_id=job_id, job_timeout=AI_GENERATION_JOB_TIMEOUT, result_ttl=0)
+        except Exception:
+            cls.release_account_slot(account_uuid=account_uuid)
+            raise
+        return job_id
+
+    @classmethod
+    def get_job(cls, job_id: str, account_uuid: str) -> Union[dict, None]:
+        """Return job state with sections generated so far, None if job does not exist or belongs to other account."""
+        pipeline = r.pipeline()
+        pipeline.hgetall(AI_GENERATION_JOB_KEY.format(job_id))
+        pipeline.hgetall(AI_GENERATION_CONTENT_KEY.format(job_id))
+        job, content = pipeline.execute()
+        if not job or job.get(b'account_uuid', b'').decode('utf-8') != account_uuid:
+            return None
+
+        sections = json.loads(job[b'sections'])
+        content = {key.decode('utf-8'): value.decode('utf-8') for key, value in content.items()}
+        return {
+            'status': job[b'status'].decode('utf-8'),
+            'contract_data': json.loads(job[b'contract_data']),
+            'sections': sections,
+            'content': {section: content[section] for section in sections if section in content},
+        }
+
+    @classmethod
+    def set_status(cls, job_id: str, status: str) -> None:
+        """Update job status."""
+        r.hset(AI_GENERATION_JOB_KEY.format(job_id), 'status', status)
+
+    @classmethod
+    def set_sections(cls, job_id: str, sections: list, content: Union[dict, None] = None) -> None:
+        """Replace section headings (and optionally content) of the job."""
+        content_key = AI_GENERATION_CONTENT_KEY.format(job_id)
+        pipeline = r.pipeline()
+        pipeline.hset(AI_GENERATION_JOB_KEY.format(job_id), 'sections', json.dumps(sections))
+        if content is not None:
+            pipeline.delete(content_key)
+            pipeline.hset(content_key, mapping=content)
+            pipeline.expire(content_key, TimeInSeconds.SIXTY_MIN.value)
+        pipeline.execute()
+
+    @classmethod
+    def set_section_content(cls, job_id: str, section: str, section_details: str) -> None:
+        """Store generated content of a single section as soon as it is available."""
+        content_key = AI_GENERATION_CONTENT_KEY.format(job_id)
+        pipeline = r.pipeline()
+        pipeline.hset(content_key, section, section_details)
+        pipeline.expire(content_key, TimeInSeconds.SIXTY_MIN.value)
+        pipeline.execute()
+
+    @classmethod
+    def get_completion(cls, client: Any, messages: list, force_refresh: bool = False, **kwargs) -> str:
+        """
+            Return GPT-4 completion for messages, served from the AI cache when possible.
+            force_refresh skips the cache lookup and replaces the cached completion.
+        """
+        model = config_data.get('GPT_MODEL_4')
+        use_cache = get_ai_cache_config()['ENABLED']
+        if use_cache and not force_refresh:
+            completion = ai_cache.get_completion(model=model, messages=messages)
+            if completion is not None:
+                return completion
+
+        response = client.chat.completions.create(messages=messages, model=model, **kwargs)
+        completion = response.choices[0].message.content.strip()
+        if use_cache:
+            ai_cache.set_completion(model=model, messages=messages, completion=completion)
+        return completion
+
+    @classmethod
+    def get_section_headings(cls, client: Any, purpose: str, force_refresh: bool = False) -> list:
+        """Get Contract section headings using Open AI API call"""
+        section_string = cls.get_completion(client=client, force_refresh=force_refresh, messages=[
+            {'role': 'system', 'content': 'You are a legal advisor.'},
+            {'role': 'user', 'content': SECTION_HEADINGS_PROMPT.format(purpose)}
+        ])
+        return [section.strip() for section in section_string.split(',')]
+
+    @classmethod
+    def get_section_content(cls, client: Any, prompt: str, section: str, timeout: float,
+                            force_refresh: bool = False) -> str:
+        """Get Contract section using Open AI API call"""
+        section_details = cls.get_completion(client=client, force_refresh=force_refresh, timeout=timeout, messages=[
+            {'role': 'system', 'content': 'You are a legal advisor.'},
+            {'role': 'user', 'content': prompt.format(section)}
+        ])
+        return section_details.replace('\n', '<br>')
+
+    @classmethod
+    def generate_section(cls, client: Any, context: GenerationContext, section: str, timeout: float) -> None:
+        """Generate one section on the shared executor and publish it to redis."""
+        try:
+            section_details = cls.get_section_content(client=client, prompt=context.prompt, section=section,
+                                                      timeout=timeout, force_refresh=context.force_refresh)
+            if context.add_content(section=section, section_details=section_details):
+                cls.set_section_content(job_id=context.job_id, section=section, section_details=section_details)
+        except Exception as e:
+            logger.error('Inside ContractAIWorker.generate_section() {} : {}'.format(section, e))
+            context.add_failure(section=section)
+
+    @classmethod
+    def generate(cls, job_id: str, account_uuid: str, purpose: str, prompt: str, force_refresh: bool = False) -> None:
+        """
+            RQ job: generate section headings, then all sections on the process wide bounded executor.
+            Every OpenAI call is limited to AI_GENERATION.SECTION_TIMEOUT seconds. Sections keep the heading order.
+            If any section fails or times out the job falls back to default sections.
+            Completions are served from the AI cache unless force_refresh is set.
+        """
+        context = GenerationContext(job_id=job_id, account_uuid=account_uuid, purpose=purpose, prompt=prompt,
+                                    force_refresh=force_refresh)
+        generation_config = get_ai_generation_config()
+        section_timeout = generation_config['SECTION_TIMEOUT']
+        try:
+            cls.set_status(job_id=job_id, status=AIGenerationStatus.IN_PROGRESS.value)
+            client = cls.get_openai_client()
+            try:
+                context.set_sections(cls.get_section_headings(client=client, purpose=purpose,
+                                                              force_refresh=force_refresh))
+                if not context.sections:
+                    raise ValueError('No section headings returned')
+            except Exception as e:
+                logger.error('Inside ContractAIWorker.generate() section headings : ' + str(e))
+                cls.set_sections(job_id=job_id, sections=DEFAULT_SECTIONS, content=DEFAULT_SECTION_DICT)
+                cls.set_status(job_id=job_id, status=AIGenerationStatus.COMPLETED.value)
+                return
+            cls.set_sections(job_id=job_id, sections=context.sections)
+
+            executor = get_executor()
+            futures = [executor.submit(cls.generate_section, client, context, section, section_timeout)
+                       for section in context.sections]
+            # sections may wait in the executor queue behind other jobs, allow one timeout per round of workers
+            rounds = math.ceil(len(futures) / generation_config['MAX_WORKERS'])
+            _, not_done = wait(futures, timeout=section_timeout * (rounds + 1))
+            context.close()
+            for future in not_done:
+                future.cancel()
+
+            if not_done or context.failed_sections:
+                cls.set_sections(job_id=job_id, sections=DEFAULT_SECTIONS, content=DEFAULT_SECTION_DICT)
+            cls.set_status(job_id=job_id, status=AIGenerationStatus.COMPLETED.value)
+        except Exception as e:
+            logger.error('Inside ContractAIWorker.generate() : ' + str(e))
+            logger.error(traceback.format_exc())
+            cls.set_status(job_id=job_id, status=AIGenerationStatus.FAILED.value)
+        finally:
+            cls.release_account_slot(account_uuid=account_uuid)
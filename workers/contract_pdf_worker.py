@@ -0,0 +1,152 @@
+"""Contains methods and logic to render contract pdf files in background."""
+import hashlib
+import os
+import traceback
+from typing import Union
+import uuid
+
+from app import app
+from app import config_data
+from app import contract_pdf_q
+from app import logger
+from app import r
+from app.helpers.constants import ContractPdfStatus
+from app.helpers.constants import TimeInSeconds
+from app.models.contract import Contract
+import pdfkit
+from workers.s3_worker import upload_file_and_get_object_details
+
+CONTRACT_PDF_JOB_KEY = 'contract_pdf:{}'
+CONTRACT_PDF_OBJECT_KEY = 'contract_pdf:object:{}:{}'
+CONTRACT_PDF_PENDING_KEY = 'contract_pdf:pending:{}:{}:{}'
+DEFAULT_CONTRACT_PDF_JOB_TIMEOUT = 300  # seconds
+DEFAULT_CONTRACT_PDF_CACHE_TTL = 2592000  # seconds (30 days)
+
+
+def get_contract_pdf_config() -> dict:
+    """Return CONTRACT_PDF settings from config.yml."""
+    pdf_config = config_data.get('CONTRACT_PDF') or {}
+    return {
+        'JOB_TIMEOUT': int(pdf_config.get('JOB_TIMEOUT', DEFAULT_CONTRACT_PDF_JOB_TIMEOUT)),
+        'CACHE_TTL': int(pdf_config.get('CACHE_TTL', DEFAULT_CONTRACT_PDF_CACHE_TTL)),
+    }
+
+
+class ContractPdfWorker:
+    """
+        Renders signed content of contracts with wkhtmltopdf in RQ worker (CONTRACT_PDF queue) and uploads the pdf to S3,
+        so that web workers never wait for the subprocess. Pdf files are keyed by sha256 of the signed content: redis key
+        contract_pdf:object:<contract_uuid>:<hash> holds the S3 path, so unchanged content is never rendered again.
+        Job state is kept in redis hash contract_pdf:<job_id> with status, account_uuid, contract_uuid, content_hash
+        and s3_path.
+    """
+
+    @classmethod
+    def get_content_hash(cls, signed_content: Union[str, None]) -> str:
+        """Return sha256 of signed content."""
+        return hashlib.sha256((signed_content or '').encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get_cached_pdf(cls, contract_uuid: str, content_hash: str) -> Union[str, None]:
+        """Return S3 path of pdf rendered from content with given hash, None if it was not rendered yet."""
+        try:
+            s3_path = r.get(CONTRACT_PDF_OBJECT_KEY.format(contract_uuid, content_hash))
+        except Exception as exception_error:
+            logger.error(f'Contract pdf cache read failed: {exception_error}')
+            return None
+        return s3_path.decode('utf-8') if s3_path is not None else None
+
+    @classmethod
+    def create_job(cls, account_uuid: str, contract_uuid: str, content_hash: str) -> str:
+        """
+            Store initial job state and enqueue rendering. A job already rendering the same content for the account is
+            returned instead of a new one. Rendering runs inline while testing.
+        """
+        pdf_config = get_contract_pdf_config()
+        job_id = uuid.uuid4().hex
+        pending_key = CONTRACT_PDF_PENDING_KEY.format(account_uuid, contract_uuid, content_hash)
+        if not r.set(pending_key, job_id, nx=True, ex=pdf_config['JOB_TIMEOUT']):
+            pending_job_id = r.get(pending_key)
+            if pending_job_id is not None and r.exists(CONTRACT_PDF_JOB_KEY.format(pending_job_id.decode('utf-8'))):
+                return pending_job_id.decode('utf-8')
+            r.set(pending_key, job_id, ex=pdf_config['JOB_TIMEOUT'])
+
+        job_key = CONTRACT_PDF_JOB_KEY.format(job_id)
+        pipeline = r.pipeline()
+        pipeline.hset(job_key, mapping={
+            'status': ContractPdfStatus.QUEUED.value,
+            'account_uuid': account_uuid,
+            'contract_uuid': contract_uuid,
+            'content_hash': content_hash,
+        })
+        pipeline.expire(job_key, TimeInSeconds.TWO_DAYS.value)
+        pipeline.execute()
+
+        if config_data.get('TESTING'):
+            cls.run(job_id)
+        else:
+            contract_pdf_q.enqueue(cls.run, args=(job_id,), job_id=job_id, job_timeout=pdf_config['JOB_TIMEOUT'],
+                                   result_ttl=0)
+        return job_id
+
+    @classmethod
+    def get_job(cls, job_id: str, account_uuid: str) -> Union[dict, None]:
+        """Return job state, None if job does not exist or belongs to other account."""
+        job = r.hgetall(CONTRACT_PDF_JOB_KEY.format(job_id))
+        if not job or job.get(b'account_uuid', b'').decode('utf-8') != account_uuid:
+            return None
+
+        job = {key.decode('utf-8'): value.decode('utf-8') for key, value in job.items()}
+        return {
+            'status': job['status'],
+            'contract_uuid': job['contract_uuid'],
+            's3_path': job.get('s3_path'),
+        }
+
+    @classmethod
+    def update_job(cls, job_id: str, **fields) -> None:
+        """Set given fields of job state."""
+        r.hset(CONTRACT_PDF_JOB_KEY.format(job_id), mapping=fields)
+
+    @classmethod
+    def run(cls, job_id: str) -> None:
+        """RQ job: render signed content of the contract to pdf and upload it to S3."""
+        if config_data.get('TESTING'):
+            return cls.render_pdf(job_id)
+        with app.app_context():
+            return cls.render_pdf(job_id)
+
+    @classmethod
+    def render_pdf(cls, job_id: str) -> None:
+        """Render pdf of the job unless content with the same hash was rendered meanwhile, then store its S3 path."""
+        job = {key.decode('utf-8'): value.decode('utf-8')
+               for key, value in r.hgetall(CONTRACT_PDF_JOB_KEY.format(job_id)).items()}
+        if not job:
+            logger.error('Contract pdf job {} not found'.format(job_id))
+            return
+
+        pdf_local_path = None
+        try:
+            cls.update_job(job_id, status=ContractPdfStatus.IN_PROGRESS.value)
+            contract_obj = Contract.get_by_uuid(job['contract_uuid'])
+            content_hash = cls.get_content_hash(contract_obj.signed_content)
+            s3_path = cls.get_cached_pdf(contract_uuid=contract_obj.uuid, content_hash=content_hash)
+            if s3_path is None:
+                file_name = 'contract_{}_{}.pdf'.format(contract_obj.uuid, content_hash[:16])
+                pdf_local_path = os.path.join(config_data['UPLOAD_FOLDER'], file_name)  # type: ignore  # noqa: FKA100
+                pdfkit.from_string(contract_obj.signed_content, pdf_local_path)  # type: ignore  # noqa: FKA100
+                s3_path = upload_file_and_get_object_details(
+                    file_path=pdf_local_path, file_name=file_name,
+                    s3_folder_path=f'media/{contract_obj.account_uuid}/contracts/'.lower())
+                r.set(CONTRACT_PDF_OBJECT_KEY.format(contract_obj.uuid, content_hash), s3_path,
+                      ex=get_contract_pdf_config()['CACHE_TTL'])
+            cls.update_job(job_id, status=ContractPdfStatus.COMPLETED.value, content_hash=content_hash,
+                           s3_path=s3_path)
+        except Exception as e:
+            logger.error('Inside ContractPdfWorker.render_pdf() {} : {}'.format(job_id, e))
+            logger.error(traceback.format_exc())
+            cls.update_job(job_id, status=ContractPdfStatus.FAILED.value)
+        finally:
+            r.delete(CONTRACT_PDF_PENDING_KEY.format(job['account_uuid'], job['contract_uuid'], job['content_hash']))
+            if pdf_local_path is not None and os.path.exists(pdf_local_path):
+                os.remove(pdf_local_path)
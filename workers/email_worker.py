@@ -1,12 +1,122 @@
 """Contains methods and logic to send emails."""
+from datetime import datetime
+import json
 import traceback
 
+from app import config_data
 from app import logger
+from app import r
+from app import send_mail_q
+from providers.mail import get_mail_batch_size
+from providers.mail import preload_mail_templates
 from providers.mail import send_mail
+from providers.mail import send_mail_batch
+from rq import Retry
+from rq import Worker
+
+EMAIL_DEAD_LETTER_KEY = 'mail:dead_letter'
+DEFAULT_EMAIL_QUEUE_RETRY_INTERVALS = [10, 60, 300]  # seconds, one entry per retry
+DEFAULT_EMAIL_DEAD_LETTER_MAX_SIZE = 10000
+
+
+def get_email_queue_config() -> dict:
+    """Return EMAIL_QUEUE settings from config.yml. Mails are sent inline while testing unless enabled explicitly."""
+    queue_config = config_data.get('EMAIL_QUEUE') or {}
+    return {
+        'ENABLED': queue_config.get('ENABLED', not config_data.get('TESTING')),
+        'RETRY_INTERVALS': queue_config.get('RETRY_INTERVALS', DEFAULT_EMAIL_QUEUE_RETRY_INTERVALS),
+        'DEAD_LETTER_MAX_SIZE': int(queue_config.get('DEAD_LETTER_MAX_SIZE', DEFAULT_EMAIL_DEAD_LETTER_MAX_SIZE)),
+    }
+
+
+def move_to_dead_letter(job, connection, exc_type, exc_value, exc_traceback):
+    """
+        rq on_failure callback, called after every failed attempt. Once no retries are left the mail payload is kept
+        in redis list mail:dead_letter so that it can be inspected and re-sent with EmailWorker.requeue_dead_letters.
+    """
+    if job.retries_left:
+        return
+    logger.error('Mail job {} failed permanently : {}'.format(job.id, exc_value))
+    entry = json.dumps({'job_id': job.id, 'data': job.args[0], 'error': str(exc_value),
+                        'failed_at': datetime.utcnow().isoformat()})
+    pipeline = connection.pipeline()
+    pipeline.lpush(EMAIL_DEAD_LETTER_KEY, entry)
+    pipeline.ltrim(EMAIL_DEAD_LETTER_KEY, 0, get_email_queue_config()['DEAD_LETTER_MAX_SIZE'] - 1)
+    pipeline.execute()
+
+
+class MailWorker(Worker):
+    """
+        rq worker class of the SEND_MAIL queue (rq worker --worker-class workers.email_worker.MailWorker SEND_MAIL).
+        Mail templates are compiled once when the worker starts, so every forked job renders without loading them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        logger.info('MailWorker loaded {} mail templates'.format(preload_mail_templates()))
 
 
 class EmailWorker:
     """This worker contains different methods for sending email."""
+    @classmethod
+    def dispatch(cls, data):
+        """
+            Enqueue mail on SEND_MAIL queue so that rendering and SMTP round trip happen outside the request.
+            Failed jobs are retried after EMAIL_QUEUE.RETRY_INTERVALS and then moved to the dead letter list.
+            Falls back to inline send when EMAIL_QUEUE is disabled (default while testing) or redis is unavailable.
+        """
+        queue_config = get_email_queue_config()
+        if not queue_config['ENABLED']:
+            return cls.send(data)
+        try:
+            retry_intervals = queue_config['RETRY_INTERVALS']
+            send_mail_q.enqueue(cls.deliver, data, retry=Retry(max=len(retry_intervals), interval=retry_intervals),
+                                on_failure=move_to_dead_letter)
+        except Exception as e:
+            logger.error('Inside EmailWorker.dispatch(), sending inline : ' + str(e))
+            cls.send(data)
+
+    @classmethod
+    def dispatch_many(cls, data_list):
+        """
+            Send many mails reusing SMTP connections: one SEND_MAIL job per MAIL.BATCH_SIZE mails.
+            Mails of a batch that fail are dispatched again one by one, with retries and dead letter handling.
+        """
+        if not data_list:
+            return
+        if not get_email_queue_config()['ENABLED']:
+            return cls.send_many(data_list)
+        batch_size = get_mail_batch_size()
+        for start in range(0, len(data_list), batch_size):
+            batch = data_list[start:start + batch_size]
+            try:
+                send_mail_q.enqueue(cls.deliver_many, batch)
+            except Exception as e:
+                logger.error('Inside EmailWorker.dispatch_many(), sending inline : ' + str(e))
+                cls.send_many(batch)
+
+    @classmethod
+    def deliver_many(cls, data_list):
+        """rq job: send batch of mails over one SMTP connection and dispatch failed mails individually."""
+        for data in send_mail_batch(data_list):
+            cls.dispatch(data)
+
+    @classmethod
+    def send_many(cls, data_list):
+        """Send batch of mails inline, failures are logged."""
+        try:
+            send_mail_batch(data_list)
+        except Exception as e:
+            logger.error(
+                'Inside EmailWorker.send_many() : ' + str(e))
+            logger.error(traceback.format_exc())
+
+    @classmethod
+    def deliver(cls, data):
+        """rq job: send mail and raise on failure so that the job is retried."""
+        send_mail(email_to=data.get('email_to'), subject=data.get('subject'), template=data.get('template'),
+                  email_type=data.get('email_type'), data=data.get('email_data', {}))
+
     @classmethod
     def send(cls, data):
         """This method is used for sending emails."""
@@ -24,3 +134,14 @@ class EmailWorker:
             logger.error(
                 'Inside EmailWorker.send() : ' + str(e))
             logger.error(traceback.format_exc())
+
+    @classmethod
+    def requeue_dead_letters(cls) -> int:
+        """Dispatch every mail from the dead letter list again, returns number of mails re-sent."""
+        count = 0
+        while True:
+            entry = r.rpop(EMAIL_DEAD_LETTER_KEY)
+            if entry is None:
+                return count
+            cls.dispatch(json.loads(entry)['data'])
+            count += 1
@@ -22,6 +22,12 @@ def upload_file_and_get_object_details(file_path, file_name, s3_folder_path):
     return f'{s3_folder_path}{file_name}'
 
 
+def download_file(path: str, file_path: str) -> str:
+    """Download S3 object at path to local file_path and return file_path."""
+    S3_RESOURCE.Bucket(config_data.get('S3_BUCKET')).download_file(path, file_path)  # type: ignore  # noqa: FKA100
+    return file_path
+
+
 def get_presigned_url(path: str) -> str:
     """Generate a presigned URL to share for S3 object.
 